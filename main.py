@@ -2,9 +2,26 @@
 
 from fasthtml.common import *
 from monsterui.all import *
-from src.database import get_session, Article, Classification
+from src.database import (
+    async_primary_status,
+    async_read_session,
+    async_replica_status,
+)
 from src.collectors.feed_sources import get_all_feeds
+from src.services.facets import FACETS, parse_month
+from src.services.fetch_runs import FEED_STAGES, RUN_STAGES
+from src.services.metrics import MetricsMiddleware, render as render_metrics
+from src.services.query_stats import QueryStatsMiddleware
+from src.services.pages import (
+    ARCHIVE_PAGE_SIZE,
+    DIGEST_PAGE_SIZE,
+    FETCH_RUNS_PAGE_SIZE,
+    archive_page,
+    digest_page,
+    fetch_runs_page,
+)
 from datetime import datetime
+from urllib.parse import urlencode
 import logging
 import os
 
@@ -12,6 +29,10 @@ logger = logging.getLogger(__name__)
 
 # Create FastHTML app with link to external CSS
 app, rt = fast_app(hdrs=(Link(rel="stylesheet", href="/static/styles.css"),))
+# Per-request query count and DB time (Server-Timing header in debug mode)
+app.add_middleware(QueryStatsMiddleware)
+# Request counts and latency per route for GET /metrics
+app.add_middleware(MetricsMiddleware)
 
 # Initialize scheduler (optional - can be disabled by setting DISABLE_SCHEDULER=true)
 if os.getenv("DISABLE_SCHEDULER", "false").lower() != "true":
@@ -52,7 +73,7 @@ def NavBar():
             # Nav links
             Div(
                 A("About", href="/about", cls="nav-link"),
-                # A("Archive", href="/archive", cls="nav-link"),
+                A("Archive", href="/archive", cls="nav-link"),
                 style="display: flex; gap: 0.5rem; align-items: center;",
             ),
             style="display: flex; justify-content: space-between; align-items: center; max-width: 1200px; margin: 0 auto; padding: 1.5rem 2rem;",
@@ -61,7 +82,7 @@ def NavBar():
     )
 
 
-def ArticleCard(article, classification=None):
+def ArticleCard(article, classification=None, also_covered_by=None, tags=None):
     """Component to display an article card with custom styling."""
     # Format published date
     date_str = (
@@ -73,9 +94,13 @@ def ArticleCard(article, classification=None):
     # Get relevancy score and category
     relevancy = classification.relevancy_score if classification else 0
     category = classification.category if classification else "Uncategorized"
-    tags = (
-        classification.tags.split(",") if classification and classification.tags else []
-    )
+    if tags is None:
+        # Articles stored before the article_tags table
+        tags = (
+            classification.tags.split(",")
+            if classification and classification.tags
+            else []
+        )
 
     return Div(
         # Header row with title and category badge
@@ -94,22 +119,35 @@ def ArticleCard(article, classification=None):
         # Summary text
         P(
             article.summary
-            or (
-                article.content[:200] + "..."
-                if article.content
-                else "No summary available"
-            ),
+            or (article.snippet + "..." if article.snippet else "No summary available"),
             style="color: var(--text-medium); line-height: 1.6; margin-bottom: 1rem;",
         ),
         # Tags row
         (
             Div(
-                *[Span(tag.strip(), cls="tag-badge") for tag in tags[:5]],
+                *[
+                    A(
+                        tag.strip(),
+                        href=digest_href(tag=tag.strip()),
+                        cls="tag-badge",
+                        style="text-decoration: none;",
+                    )
+                    for tag in tags[:5]
+                ],
                 style="margin-bottom: 1rem; display: flex; flex-wrap: wrap; gap: 0.5rem;",
             )
             if tags
             else None
         ),
+        # Near-duplicate copies of the story from other feeds
+        (
+            P(
+                f"Also covered by: {', '.join(also_covered_by)}",
+                style="margin: 0 0 1rem 0; font-size: 0.85rem; color: var(--text-light);",
+            )
+            if also_covered_by
+            else None
+        ),
         # Footer with relevancy and button
         Div(
             # (
@@ -124,31 +162,41 @@ def ArticleCard(article, classification=None):
     )
 
 
-@rt("/")
-def index(category: str = None, offset: int = 0):
-    """Home page - Daily digest of articles."""
-    session = get_session()
-
-    per_page = 10
+def digest_href(category=None, offset=0, sort=None, tag=None):
+    """Build a home page link that keeps the category and tag filters and sort order."""
+    params = []
+    if category and category != "All":
+        params.append(("category", category))
+    if tag:
+        params.append(("tag", tag))
+    if sort:
+        params.append(("sort", sort))
+    if offset:
+        params.append(("offset", offset))
+    return "/?" + urlencode(params) if params else "/"
 
-    # Get all articles with their classifications, ordered by latest first
-    query = session.query(Article).join(Classification)
 
-    # Apply category filter if specified
-    if category and category != "All":
-        query = query.filter(Classification.category == category)
-
-    # Get articles with offset and check if there are more
-    articles = (
-        query.order_by(Article.published_date.desc())
-        .offset(offset)
-        .limit(per_page)
-        .all()
-    )
+@rt("/")
+async def index(
+    category: str = None, offset: int = 0, sort: str = None, tag: str = None
+):
+    """Home page - Daily digest of articles."""
+    per_page = DIGEST_PAGE_SIZE
+
+    async with async_read_session() as session:
+        page = await session.run_sync(
+            digest_page,
+            category=category,
+            offset=offset,
+            sort=sort,
+            tag=tag,
+            per_page=per_page,
+        )
+    articles = page["articles"]
+    sort = page["sort"]
 
     # Check if there are more articles
-    total_count = query.count()
-    has_more = (offset + per_page) < total_count
+    has_more = (offset + per_page) < page["total"]
 
     # If no articles, show empty state
     if not articles:
@@ -168,13 +216,23 @@ def index(category: str = None, offset: int = 0):
             cls=SectionT.muted,
         )
     else:
+        also_covered_by = page["also_covered_by"]
+        tags = page["tags"]
+
         # Display article cards
         article_cards = []
         for article in articles:
             classification = (
                 article.classifications[0] if article.classifications else None
             )
-            article_cards.append(ArticleCard(article, classification))
+            sources = [
+                source
+                for source in also_covered_by.get(article.id, [])
+                if source != article.source
+            ]
+            article_cards.append(
+                ArticleCard(article, classification, sources, tags.get(article.id))
+            )
 
         # Category filter buttons
         all_categories = ["All", "AI for Medicine", "AI for Planet", "Green AI"]
@@ -184,7 +242,7 @@ def index(category: str = None, offset: int = 0):
             *[
                 A(
                     cat,
-                    href=f"/?category={cat}" if cat != "All" else "/",
+                    href=digest_href(cat, sort=sort, tag=tag),
                     cls=get_category_class(cat) if cat != "All" else "category-default",
                     style=f"padding: 0.5rem 1rem; text-decoration: none; border-radius: 0.5rem; font-size: 0.875rem; font-weight: 500; {'opacity: 1; box-shadow: 0 2px 4px rgba(0,0,0,0.1);' if cat == current_category else 'opacity: 0.6;'}",
                 )
@@ -193,18 +251,46 @@ def index(category: str = None, offset: int = 0):
             style="display: flex; gap: 0.5rem; flex-wrap: wrap; margin-bottom: 1.5rem;",
         )
 
+        # Latest / Top / For you toggle; For you is only offered once
+        # preferences exist
+        sort_options = [("Latest", None), ("Top", "top")]
+        if page["has_preferences"]:
+            sort_options.append(("For you", "for-you"))
+        sort_links = Div(
+            *[
+                A(
+                    label,
+                    href=digest_href(category, sort=value, tag=tag),
+                    cls="nav-link",
+                    style=f"{'font-weight: 600;' if sort == value else 'opacity: 0.6;'}",
+                )
+                for label, value in sort_options
+            ],
+            style="display: flex; gap: 0.5rem; margin-bottom: 1.5rem;",
+        )
+
         content = Div(
             # Header section
             Div(
                 H2("Daily Digest", style="margin: 0 0 0.5rem 0;"),
                 P(
-                    f"Latest {len(articles)} articles • {datetime.now().strftime('%B %d, %Y')}",
+                    f"{'Top' if sort else 'Latest'} {len(articles)} articles • {datetime.now().strftime('%B %d, %Y')}",
                     style="color: var(--text-light); font-size: 1rem; margin: 0;",
                 ),
+                (
+                    P(
+                        f"Tagged “{tag}” • ",
+                        A("show all", href=digest_href(category, sort=sort)),
+                        style="color: var(--text-light); font-size: 0.9rem; margin: 0.5rem 0 0 0;",
+                    )
+                    if tag
+                    else None
+                ),
                 style="margin-bottom: 1.5rem;",
             ),
             # Category filter
             filter_buttons,
+            sort_links,
             # Article cards
             Div(*article_cards),
             # Pagination buttons
@@ -214,10 +300,8 @@ def index(category: str = None, offset: int = 0):
                     (
                         A(
                             "← Previous Page",
-                            href=(
-                                f"/?category={category}&offset={max(0, offset - per_page)}"
-                                if category
-                                else f"/?offset={max(0, offset - per_page)}"
+                            href=digest_href(
+                                category, max(0, offset - per_page), sort, tag
                             ),
                             cls="btn-primary",
                             style="padding: 0.75rem 1.5rem; text-decoration: none; display: inline-block; text-align: center;",
@@ -229,11 +313,7 @@ def index(category: str = None, offset: int = 0):
                     (
                         A(
                             "Next Page →",
-                            href=(
-                                f"/?category={category}&offset={offset + per_page}"
-                                if category
-                                else f"/?offset={offset + per_page}"
-                            ),
+                            href=digest_href(category, offset + per_page, sort, tag),
                             cls="btn-primary",
                             style="padding: 0.75rem 1.5rem; text-decoration: none; display: inline-block; text-align: center;",
                         )
@@ -247,8 +327,6 @@ def index(category: str = None, offset: int = 0):
             ),
         )
 
-    session.close()
-
     # Custom Navigation bar
 
     return Title("GreenAI Digest - Daily News"), Div(
@@ -257,23 +335,409 @@ def index(category: str = None, offset: int = 0):
     )
 
 
+def archive_href(filters, offset=0, **changes):
+    """Build an archive link from the current filters, with some changed or removed."""
+    params = {**filters, **changes}
+    params = [(facet, params[facet]) for facet in FACETS if params.get(facet)]
+    if offset:
+        params.append(("offset", offset))
+    return "/archive?" + urlencode(params) if params else "/archive"
+
+
+def FacetList(facet, values, filters):
+    """Sidebar list of one facet's values with their article counts."""
+    selected = filters.get(facet)
+    return Div(
+        H4(
+            facet.capitalize(),
+            (
+                A(
+                    "clear",
+                    href=archive_href(filters, **{facet: None}),
+                    style="font-size: 0.8rem; font-weight: normal; margin-left: 0.5rem;",
+                )
+                if selected
+                else None
+            ),
+            style="margin: 0 0 0.5rem 0;",
+        ),
+        Ul(
+            *[
+                Li(
+                    A(
+                        value,
+                        href=archive_href(filters, **{facet: value}),
+                        style=f"text-decoration: none; color: var(--text-medium); {'font-weight: 600;' if value == selected else ''}",
+                    ),
+                    Span(
+                        f" {count}",
+                        style="color: var(--text-light); font-size: 0.85rem;",
+                    ),
+                )
+                for value, count in values
+            ],
+            style="list-style: none; margin: 0 0 1.5rem 0; padding: 0; line-height: 1.8;",
+        ),
+    )
+
+
 @rt("/archive")
-def archive():
-    """Archive page - Search and filter all articles."""
-    return Title("Archive"), Div(
-        NavBar(),
+async def archive(
+    source: str = None,
+    category: str = None,
+    tag: str = None,
+    month: str = None,
+    offset: int = 0,
+):
+    """Archive page - Filter all articles by source, category, tag and month."""
+    per_page = ARCHIVE_PAGE_SIZE
+    # Invalid months are dropped, "2026-1" becomes "2026-01"
+    month = parse_month(month)
+    filters = {"source": source, "category": category, "tag": tag, "month": month}
+    active = {facet: value for facet, value in filters.items() if value}
+
+    async with async_read_session() as session:
+        page = await session.run_sync(
+            archive_page, filters, offset=offset, per_page=per_page
+        )
+    facets, articles, tags = page["facets"], page["articles"], page["tags"]
+    total_count = page["total"]
+
+    article_cards = [
+        ArticleCard(
+            article,
+            article.classifications[0] if article.classifications else None,
+            tags=tags.get(article.id),
+        )
+        for article in articles
+    ]
+    has_more = (offset + per_page) < total_count
+
+    content = Div(
+        H2("Archive", style="margin: 0 0 0.5rem 0;"),
+        P(
+            f"{total_count} articles"
+            + (
+                " • " + ", ".join(f"{f}: {v}" for f, v in active.items())
+                if active
+                else ""
+            ),
+            (Span(" • ", A("clear all filters", href="/archive")) if active else None),
+            style="color: var(--text-light); margin-bottom: 2rem;",
+        ),
         Div(
-            H2("Archive", style="margin: 0 0 0.5rem 0;"),
+            # Facet sidebar
+            Div(
+                *[FacetList(facet, facets[facet], filters) for facet in FACETS],
+                style="flex: 0 0 240px;",
+            ),
+            # Results
+            Div(
+                (
+                    Div(*article_cards)
+                    if article_cards
+                    else P(
+                        "No articles match these filters.",
+                        style="color: var(--text-medium);",
+                    )
+                ),
+                (
+                    Div(
+                        (
+                            A(
+                                "← Previous Page",
+                                href=archive_href(filters, max(0, offset - per_page)),
+                                cls="btn-primary",
+                                style="padding: 0.75rem 1.5rem; text-decoration: none; display: inline-block; text-align: center;",
+                            )
+                            if offset > 0
+                            else None
+                        ),
+                        (
+                            A(
+                                "Next Page →",
+                                href=archive_href(filters, offset + per_page),
+                                cls="btn-primary",
+                                style="padding: 0.75rem 1.5rem; text-decoration: none; display: inline-block; text-align: center;",
+                            )
+                            if has_more
+                            else None
+                        ),
+                        style="display: flex; justify-content: center; gap: 1rem; margin-top: 2rem;",
+                    )
+                    if (offset > 0 or has_more)
+                    else None
+                ),
+                style="flex: 1; min-width: 0;",
+            ),
+            style="display: flex; gap: 2rem; align-items: start;",
+        ),
+    )
+
+    return Title("Archive - GreenAI Digest"), Div(
+        NavBar(),
+        Div(content, style="max-width: 1200px; margin: 0 auto; padding: 0 2rem;"),
+    )
+
+
+@rt("/health")
+async def health():
+    """Database health for load balancers and uptime checks."""
+    primary = await async_primary_status()
+    replica = await async_replica_status(force=True)
+    return JSONResponse(
+        {
+            "status": "ok" if primary else "error",
+            "primary": "ok" if primary else "unavailable",
+            "replica": {None: "not configured", True: "ok", False: "unavailable"}[
+                replica
+            ],
+            "reads": "replica" if replica else "primary",
+        },
+        status_code=200 if primary else 503,
+    )
+
+
+# Fetch-run stage colors on the admin page
+STAGE_COLORS = {
+    "network": "#3b82f6",
+    "parse": "#8b5cf6",
+    "strip_html": "#f59e0b",
+    "classification": "#10b981",
+    "store": "#ef4444",
+    "archive": "#6b7280",
+}
+CELL_STYLE = "padding: 0.5rem; border-bottom: 1px solid #e5e5e5; text-align: right; white-space: nowrap;"
+HEAD_STYLE = "padding: 0.5rem; border-bottom: 2px solid var(--green-primary); text-align: right; font-weight: 600; white-space: nowrap;"
+SLOW_STYLE = " color: #b91c1c; font-weight: 700;"
+
+
+def format_seconds(value):
+    return "–" if value is None else f"{value:.2f}s"
+
+
+def format_bytes(value):
+    return f"{(value or 0) / 1024:,.0f} KB"
+
+
+def TimingCell(wall, cpu=None, slow=False):
+    """Table cell with a wall time, CPU time on hover, red when it regressed."""
+    return Td(
+        format_seconds(wall) + (" ▲" if slow else ""),
+        title=f"CPU {format_seconds(cpu)}" if cpu is not None else None,
+        style=CELL_STYLE + (SLOW_STYLE if slow else ""),
+    )
+
+
+def StageBar(run):
+    """Stacked bar of a run's stage times, scaled to its wall time."""
+    total = run.wall_seconds or 0
+    segments = []
+    for stage in RUN_STAGES:
+        seconds = getattr(run, f"{stage}_seconds") or 0
+        if total and seconds:
+            segments.append(
+                Div(
+                    title=f"{stage}: {seconds:.2f}s",
+                    style=f"width: {min(100, seconds / total * 100):.1f}%; background: {STAGE_COLORS[stage]};",
+                )
+            )
+    return Div(
+        *segments,
+        style="display: flex; width: 160px; height: 0.75rem; background: #f3f4f6; border-radius: 0.25rem; overflow: hidden;",
+    )
+
+
+def Sparkline(values):
+    """Tiny bar chart of a feed's times across runs, oldest first."""
+    peak = max((value for value in values if value is not None), default=0)
+    return Div(
+        *[
+            Div(
+                title=format_seconds(value),
+                style=f"width: 4px; height: {max(1, (value or 0) / peak * 24) if peak else 1:.0f}px; background: {'#d1d5db' if value is None else 'var(--green-primary)'};",
+            )
+            for value in values
+        ],
+        style="display: flex; gap: 1px; align-items: flex-end; height: 24px;",
+    )
+
+
+@rt("/admin/fetch-runs")
+async def fetch_runs_admin(limit: int = FETCH_RUNS_PAGE_SIZE):
+    """Fetch-run history: per-stage timings across runs, regressions in red."""
+    async with async_read_session() as session:
+        page = await session.run_sync(fetch_runs_page, limit=max(1, min(limit, 500)))
+    runs, feeds = page["runs"], page["feeds"]
+
+    def Headers(*names):
+        return Thead(
+            Tr(
+                *[
+                    Th(
+                        name,
+                        style=HEAD_STYLE + (" text-align: left;" if i == 0 else ""),
+                    )
+                    for i, name in enumerate(names)
+                ]
+            )
+        )
+
+    table_style = "width: 100%; border-collapse: collapse; background: white; border-radius: 0.5rem; overflow: hidden; box-shadow: 0 1px 3px rgba(0,0,0,0.1); font-size: 0.875rem;"
+    run_rows = []
+    for row in runs:
+        run = row["run"]
+        run_rows.append(
+            Tr(
+                Td(
+                    run.started_at.strftime("%b %d, %Y %H:%M"),
+                    style=CELL_STYLE + " text-align: left;",
+                ),
+                Td(
+                    run.status,
+                    title=run.error,
+                    style=CELL_STYLE
+                    + (
+                        " color: var(--green-primary);"
+                        if run.status == "ok"
+                        else SLOW_STYLE
+                    ),
+                ),
+                TimingCell(run.wall_seconds, run.cpu_seconds, "wall" in row["slow"]),
+                *[
+                    TimingCell(
+                        getattr(run, f"{stage}_seconds"),
+                        getattr(run, f"{stage}_cpu_seconds"),
+                        stage in row["slow"],
+                    )
+                    for stage in RUN_STAGES
+                ],
+                Td(StageBar(run), style=CELL_STYLE),
+                Td(
+                    f"{run.feeds - run.failed_feeds}/{run.feeds}",
+                    style=CELL_STYLE + (SLOW_STYLE if run.failed_feeds else ""),
+                ),
+                Td(format_bytes(run.bytes), style=CELL_STYLE),
+                Td(run.entries, style=CELL_STYLE),
+                Td(run.new, style=CELL_STYLE),
+            )
+        )
+    feed_rows = []
+    for row in feeds:
+        feed = row["feed"]
+        feed_rows.append(
+            Tr(
+                Td(
+                    feed.feed,
+                    title=feed.error or feed.url,
+                    style=CELL_STYLE
+                    + " text-align: left;"
+                    + (SLOW_STYLE if feed.error else ""),
+                ),
+                TimingCell(feed.wall_seconds, slow=row["slow"]),
+                Td(format_seconds(row["median"]), style=CELL_STYLE),
+                *[
+                    TimingCell(
+                        getattr(feed, f"{stage}_seconds"),
+                        getattr(feed, f"{stage}_cpu_seconds"),
+                    )
+                    for stage in FEED_STAGES
+                ],
+                Td(format_bytes(feed.bytes), style=CELL_STYLE),
+                Td(feed.entries, style=CELL_STYLE),
+                Td(feed.new, style=CELL_STYLE),
+                Td(
+                    row["errors"],
+                    style=CELL_STYLE + (SLOW_STYLE if row["errors"] else ""),
+                ),
+                Td(Sparkline(row["history"]), style=CELL_STYLE),
+            )
+        )
+
+    legend = Div(
+        *[
+            Span(
+                Span(
+                    style=f"display: inline-block; width: 0.75rem; height: 0.75rem; background: {color}; border-radius: 0.125rem; margin-right: 0.25rem;"
+                ),
+                stage,
+                style="margin-right: 1rem;",
+            )
+            for stage, color in STAGE_COLORS.items()
+        ],
+        style="font-size: 0.875rem; color: var(--text-medium); margin-bottom: 1rem;",
+    )
+
+    if runs:
+        content = Div(
             P(
-                "Search and filter all articles",
-                style="color: var(--text-light); margin-bottom: 2rem;",
+                "Wall time per stage of each fetch run (hover for CPU time). "
+                "Times well above their median over the previous runs are marked ▲.",
+                style="color: var(--text-medium); margin-bottom: 1rem;",
             ),
-            P("Coming soon!", style="color: var(--text-medium);"),
+            legend,
+            Div(
+                Table(
+                    Headers(
+                        "Started (UTC)",
+                        "Status",
+                        "Total",
+                        *RUN_STAGES,
+                        "Breakdown",
+                        "Feeds OK",
+                        "Size",
+                        "Entries",
+                        "New",
+                    ),
+                    Tbody(*run_rows),
+                    style=table_style,
+                ),
+                style="overflow-x: auto; margin-bottom: 2rem;",
+            ),
+            H3("Feeds in the latest run", style="margin: 2rem 0 1rem 0;"),
+            Div(
+                Table(
+                    Headers(
+                        "Feed",
+                        "Time",
+                        "Median",
+                        *FEED_STAGES,
+                        "Size",
+                        "Entries",
+                        "New",
+                        "Errors",
+                        "Trend",
+                    ),
+                    Tbody(*feed_rows),
+                    style=table_style,
+                ),
+                style="overflow-x: auto; margin-bottom: 2rem;",
+            ),
+        )
+    else:
+        content = P(
+            "No fetch runs recorded yet. Runs are saved by scripts/fetch_articles_modular.py.",
+            style="color: var(--text-light);",
+        )
+
+    return Title("Fetch Runs - GreenAI Digest"), Div(
+        NavBar(),
+        Div(
+            H2("Fetch Runs", style="margin: 0 0 0.5rem 0;"),
+            content,
             style="max-width: 1200px; margin: 0 auto; padding: 0 2rem;",
         ),
     )
 
 
+@rt("/metrics")
+async def metrics():
+    """Prometheus scrape endpoint."""
+    return Response(
+        render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 @rt("/about")
 def about():
     """About page."""
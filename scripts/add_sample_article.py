@@ -6,6 +6,9 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.database import get_session, Article, Classification
+from src.services.facets import article_facets, bump_facets
+from src.services.hot_ranking import hot_score
+from src.services.tags import save_article_tags
 from datetime import datetime
 
 
@@ -22,6 +25,7 @@ def add_custom_article():
         summary="Read Google & WRI’s paper on AI-powered solutions for nature",
         authors="Kate Brandt, Ani Dasgupta",
     )
+    article.hot_score = hot_score(100, article.published_date)
 
     session.add(article)
     session.flush()  # This gets us the article.id
@@ -32,10 +36,16 @@ def add_custom_article():
         category="AI for Medicine",  # Pick one of your categories
         confidence=0.95,
         relevancy_score=100,  # Make it super relevant!
-        tags="tutorial,fun,learning",
     )
 
     session.add(classification)
+    save_article_tags(session, {article.id: ["tutorial", "fun", "learning"]})
+    bump_facets(
+        session,
+        article_facets(
+            article.source, article.published_date, category=classification.category
+        ),
+    )
     session.commit()
     session.close()
 
@@ -0,0 +1,83 @@
+"""Move old articles' content to the cold archive table, or bring it back.
+
+Fetch runs archive articles older than ARTICLE_HOT_DAYS automatically (see
+src/services/tiering.py). This script runs the same step by hand, e.g.
+with a different age, restores specific articles, or prints the full
+content of an article wherever it is stored:
+    python scripts/archive_articles.py                  # ARTICLE_HOT_DAYS
+    python scripts/archive_articles.py --days 180
+    python scripts/archive_articles.py --restore 12 57
+    python scripts/archive_articles.py --show 12
+"""
+
+import sys
+from pathlib import Path
+import logging
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config import settings
+from src.database import get_read_session
+from src.services.tiering import (
+    archive_old_articles,
+    archived_content,
+    restore_articles,
+)
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Archive the content of old articles, or restore archived ones"
+    )
+    parser.add_argument(
+        "--days",
+        type=int,
+        default=settings.article_hot_days,
+        help=f"Archive articles older than this (default: {settings.article_hot_days})",
+    )
+    parser.add_argument(
+        "--restore",
+        type=int,
+        nargs="+",
+        metavar="ID",
+        help="Move these article IDs back into the hot table instead",
+    )
+    parser.add_argument(
+        "--show",
+        type=int,
+        metavar="ID",
+        help="Print the full content of this article, reading the archive if needed",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1000,
+        help="Articles moved per batch (default: 1000)",
+    )
+
+    args = parser.parse_args()
+
+    try:
+        if args.show:
+            session = get_read_session()
+            try:
+                content = archived_content(session, args.show)
+            finally:
+                session.close()
+            print(content if content is not None else "(no content)")
+        elif args.restore:
+            count = restore_articles(args.restore)
+            print(f"\n✓ Restored {count} articles")
+        else:
+            count = archive_old_articles(args.days, batch_size=args.batch_size)
+            print(f"\n🧊 Archived {count} articles older than {args.days} days")
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""Benchmark the fast feed parser against feedparser on recorded feeds.
+
+Record the configured feeds once (needs network access):
+    python scripts/benchmark_feed_parser.py --record data/recorded_feeds
+
+Then benchmark offline, as often as needed:
+    python scripts/benchmark_feed_parser.py data/recorded_feeds
+
+For every feed the parsed articles from both paths are compared, so the
+benchmark doubles as a parity check.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import feedparser
+from src.collectors.fast_parser import FastParseError, parse_feed
+from src.collectors.feed_sources import get_all_feeds
+from src.collectors.rss_collector import RSSCollector
+
+
+def record_feeds(directory: Path):
+    """Download every configured feed into directory for offline benchmarking."""
+    directory.mkdir(parents=True, exist_ok=True)
+    collector = RSSCollector()
+
+    for index, (url, name, _) in enumerate(get_all_feeds()):
+        try:
+            body, _ = collector._download(url)
+        except Exception as e:
+            print(f"✗ {name}: {e}")
+            continue
+        path = directory / f"{index:02d}.xml"
+        path.write_bytes(body)
+        print(f"✓ {name}: {len(body):,} bytes → {path}")
+
+
+def collect_files(paths):
+    """Expand the given files/directories into a sorted list of feed files."""
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(sorted(p for p in path.iterdir() if p.is_file()))
+        else:
+            files.append(path)
+    return files
+
+
+def time_call(func, repeat):
+    """Return the best wall time of repeat calls to func."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark(files, repeat=5, limit=20):
+    """Time both parsers on each file and verify that they agree."""
+    collector = RSSCollector()
+    total_slow = total_fast = 0.0
+    mismatches = 0
+
+    print(f"{'Feed':<28} {'Size':>10} {'feedparser':>12} {'fast':>10} {'Speedup':>8}")
+    print("-" * 72)
+
+    for path in files:
+        body = path.read_bytes()
+        base_url = f"https://example.com/{path.name}"
+
+        try:
+            fast_entries = parse_feed(body, base_url=base_url, limit=limit)
+        except FastParseError as e:
+            print(f"{path.name:<28} {len(body):>10,}   falls back to feedparser ({e})")
+            continue
+
+        slow_entries = feedparser.parse(
+            body, response_headers={"content-location": base_url}
+        ).entries[:limit]
+
+        fast_articles = [collector._parse_entry(e, "bench") for e in fast_entries]
+        slow_articles = [collector._parse_entry(e, "bench") for e in slow_entries]
+        if fast_articles != slow_articles:
+            mismatches += 1
+            print(f"  ⚠ {path.name}: parsed articles differ from feedparser")
+
+        slow = time_call(
+            lambda: feedparser.parse(
+                body, response_headers={"content-location": base_url}
+            ),
+            repeat,
+        )
+        fast = time_call(
+            lambda: parse_feed(body, base_url=base_url, limit=limit), repeat
+        )
+        total_slow += slow
+        total_fast += fast
+        print(
+            f"{path.name:<28} {len(body):>10,} {slow * 1000:>10.2f}ms "
+            f"{fast * 1000:>8.2f}ms {slow / fast:>7.1f}x"
+        )
+
+    print("-" * 72)
+    if total_fast:
+        print(
+            f"{'Total':<28} {'':>10} {total_slow * 1000:>10.2f}ms "
+            f"{total_fast * 1000:>8.2f}ms {total_slow / total_fast:>7.1f}x"
+        )
+    print(f"Parity mismatches: {mismatches}")
+    return mismatches
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark the fast feed parser against feedparser"
+    )
+    parser.add_argument("paths", nargs="*", help="Recorded feed files or directories")
+    parser.add_argument(
+        "--record", metavar="DIR", help="Download the configured feeds into DIR"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Timing repetitions (default: 5)"
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=20,
+        help="Entries parsed per feed, like --max-per-feed (default: 20)",
+    )
+
+    args = parser.parse_args()
+
+    if args.record:
+        record_feeds(Path(args.record))
+        sys.exit(0)
+
+    if not args.paths:
+        parser.error("give at least one recorded feed file or directory")
+
+    sys.exit(1 if benchmark(collect_files(args.paths), args.repeat, args.limit) else 0)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Verify and benchmark the batched relevance classifier.
+
+Runs calculate_relevance one article at a time and calculate_relevance_batch
+on the same corpus, checks that every result is identical, and reports the
+throughput of both:
+    python scripts/benchmark_relevance.py                 # 50k synthetic articles
+    python scripts/benchmark_relevance.py --synthetic 500000
+    python scripts/benchmark_relevance.py --from-db       # stored articles
+    python scripts/benchmark_relevance.py --workers 0     # also time the process pool
+
+Exits non-zero if any result differs.
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.collectors.parallel_classify import classify_parallel
+from src.collectors.relevance_batch import calculate_relevance_batch
+from src.collectors.relevance_filter import (
+    CATEGORY_KEYWORDS,
+    GLOBAL_KEYWORDS,
+    calculate_relevance,
+)
+
+FILLER = (
+    "we propose a novel approach for the analysis of large scale data and "
+    "evaluate it on several benchmarks showing improvements over prior work "
+    "in terms of accuracy robustness and cost across many settings"
+).split()
+
+
+def synthetic_corpus(count: int, seed: int = 0):
+    """Generate (title, content) pairs with a realistic mix of keyword hits."""
+    rng = random.Random(seed)
+    keywords = [kw for kws in CATEGORY_KEYWORDS.values() for kw in kws]
+    global_keywords = [kw.strip() for kw in GLOBAL_KEYWORDS]
+
+    corpus = []
+    for _ in range(count):
+        words = rng.choices(FILLER, k=rng.randint(20, 120))
+        for _ in range(rng.randint(0, 8)):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(keywords))
+        if rng.random() < 0.7:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(global_keywords))
+        if rng.random() < 0.3:
+            words = [word.upper() if rng.random() < 0.1 else word for word in words]
+        title = " ".join(words[:10]).capitalize()
+        corpus.append((title, " ".join(words[10:])))
+    return corpus
+
+
+def database_corpus():
+    """Load (title, content) pairs for every stored article."""
+    from src.database import get_session, Article
+
+    session = get_session()
+    try:
+        return [
+            (title or "", content or "")
+            for title, content in session.query(Article.title, Article.content)
+        ]
+    finally:
+        session.close()
+
+
+def benchmark(corpus, batch_size, workers=None):
+    """Time the implementations on corpus and verify that they agree."""
+    start = time.perf_counter()
+    scalar = [calculate_relevance(title, content) for title, content in corpus]
+    scalar_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = calculate_relevance_batch(corpus, batch_size=batch_size)
+    batch_time = time.perf_counter() - start
+
+    mismatches = sum(1 for a, b in zip(scalar, batch) if a != b)
+    mismatches += abs(len(scalar) - len(batch))
+
+    if workers is not None:
+        start = time.perf_counter()
+        parallel = [result for result, _ in classify_parallel(corpus, workers)]
+        parallel_time = time.perf_counter() - start
+        mismatches += sum(1 for a, b in zip(scalar, parallel) if a != b)
+        mismatches += abs(len(scalar) - len(parallel))
+    relevant = sum(1 for result in scalar if result)
+
+    print(f"Articles: {len(corpus):,} ({relevant:,} relevant)")
+    print(
+        f"  scalar: {scalar_time:8.2f}s  {len(corpus) / scalar_time:>12,.0f} articles/s"
+    )
+    print(
+        f"  batch:  {batch_time:8.2f}s  {len(corpus) / batch_time:>12,.0f} articles/s"
+    )
+    print(f"  speedup: {scalar_time / batch_time:.1f}x")
+    if workers is not None:
+        print(
+            f"  pool:   {parallel_time:8.2f}s  {len(corpus) / parallel_time:>12,.0f} articles/s"
+            f"  ({scalar_time / parallel_time:.1f}x)"
+        )
+    print(f"Mismatches: {mismatches}")
+    return mismatches
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark batched relevance classification"
+    )
+    parser.add_argument(
+        "--synthetic",
+        type=int,
+        default=50_000,
+        help="Number of synthetic articles (default: 50000)",
+    )
+    parser.add_argument(
+        "--from-db", action="store_true", help="Use stored articles instead"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=10_000,
+        help="Articles per batch chunk (default: 10000)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Also time the process pool with N workers (0 for one per core)",
+    )
+
+    args = parser.parse_args()
+
+    corpus = database_corpus() if args.from_db else synthetic_corpus(args.synthetic)
+    if not corpus:
+        parser.error("no articles to benchmark")
+
+    sys.exit(1 if benchmark(corpus, args.batch_size, args.workers) else 0)
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""Verify and benchmark strip_html against the original implementation.
+
+The corpus is built from recorded feeds (see benchmark_feed_parser.py
+--record) and/or JSON-lines files with one raw summary string per line:
+    python scripts/benchmark_strip_html.py data/recorded_feeds
+    python scripts/benchmark_strip_html.py summaries.jsonl
+
+A set of built-in edge cases (entities, unterminated tags, comments,
+script/style, <img> quirks) is always included. Every input must produce
+byte-identical output, otherwise the script exits non-zero.
+"""
+
+import json
+import re
+import sys
+import time
+from html import unescape
+from html.parser import HTMLParser
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.collectors.rss_collector import RSSCollector, strip_html
+
+EDGE_CASES = [
+    "",
+    "plain text with   extra\n\twhitespace ",
+    "AI &amp; health",
+    "AT&T announces",
+    "Trailing entity &amp",
+    "double &amp;amp; escaped &amp;lt;b&amp;gt;",
+    "<p>Hello <b>world</b></p>",
+    '<a href="/x?a=1&amp;b=2" title="a > b">link</a> text',
+    "<img src='x.png' alt='a > b'> caption",
+    '<IMG SRC="x.png"/>after',
+    "a <<img src=x>p> b",
+    "&am<img>p; split entity",
+    "x < y and y > z",
+    "unterminated <b",
+    "ends with <",
+    "<!-- comment --> visible",
+    "<!-- unterminated comment",
+    "<script>var a = '&amp;';</script> text",
+    "<style>.x { color: red }</style> text",
+    "<?xml version='1.0'?> pi",
+    "<!DOCTYPE html> decl",
+    "<![CDATA[raw]]> cdata",
+    "<o:p>Word markup</o:p>",
+    "<p\x0bclass=x>vertical tab</p>",
+    "&nbsp;&#8217;&#x27;&#39 refs",
+    "</>empty end tag",
+]
+
+
+class ReferenceStripper(HTMLParser):
+    """The original HTMLStripper, kept verbatim as the parity reference."""
+
+    def __init__(self):
+        super().__init__()
+        self.reset()
+        self.strict = False
+        self.convert_charrefs = True
+        self.text = []
+
+    def handle_data(self, data):
+        self.text.append(data)
+
+    def get_data(self):
+        return "".join(self.text).strip()
+
+
+def reference_strip_html(html_content: str) -> str:
+    """The original strip_html, kept verbatim as the parity reference."""
+    if not html_content:
+        return ""
+
+    html_content = re.sub(r"<img[^>]*>", "", html_content, flags=re.IGNORECASE)
+
+    stripper = ReferenceStripper()
+    try:
+        stripper.feed(html_content)
+        text = stripper.get_data()
+    except Exception:
+        text = re.sub(r"<[^>]+>", "", html_content)
+
+    text = unescape(text)
+    text = re.sub(r"\s+", " ", text)
+    return text.strip()
+
+
+def load_corpus(paths):
+    """Collect raw summaries from recorded feeds and JSON-lines files."""
+    corpus = list(EDGE_CASES)
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(sorted(p for p in path.iterdir() if p.is_file()))
+        else:
+            files.append(path)
+
+    for path in files:
+        if path.suffix == ".jsonl":
+            with open(path) as f:
+                corpus.extend(json.loads(line) for line in f if line.strip())
+            continue
+        entries, _ = RSSCollector.parse_entries(path.read_bytes(), "", path.name)
+        for entry in entries:
+            if entry.get("summary"):
+                corpus.append(entry["summary"])
+            if entry.get("title"):
+                corpus.append(entry["title"])
+
+    return corpus
+
+
+def time_all(func, corpus, repeat):
+    """Return the best wall time of running func over the whole corpus."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in corpus:
+            func(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Verify and benchmark strip_html")
+    parser.add_argument(
+        "paths", nargs="*", help="Recorded feeds, directories or .jsonl summary files"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Timing repetitions (default: 5)"
+    )
+
+    args = parser.parse_args()
+    corpus = load_corpus(args.paths)
+
+    mismatches = 0
+    for text in corpus:
+        expected, actual = reference_strip_html(text), strip_html(text)
+        if expected != actual:
+            mismatches += 1
+            print(f"✗ {text[:60]!r}: expected {expected[:60]!r}, got {actual[:60]!r}")
+
+    plain = sum(1 for text in corpus if "<" not in text and "&" not in text)
+    print(f"Corpus: {len(corpus)} inputs ({plain} plain text), {mismatches} mismatches")
+
+    before = time_all(reference_strip_html, corpus, args.repeat)
+    after = time_all(strip_html, corpus, args.repeat)
+    per_call = 1_000_000 / len(corpus)
+    print(f"Original:  {before * per_call:8.2f} µs/call")
+    print(f"Current:   {after * per_call:8.2f} µs/call")
+    print(f"Speedup:   {before / after:8.1f}x")
+
+    sys.exit(1 if mismatches else 0)
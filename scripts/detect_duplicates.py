@@ -0,0 +1,55 @@
+"""Group near-duplicate stories among already stored articles.
+
+New articles are signed and grouped at ingest. Run this once after
+upgrading (python scripts/init_db.py first) to sign existing articles:
+    python scripts/detect_duplicates.py
+    python scripts/detect_duplicates.py --rebuild   # regroup everything
+
+See src/services/near_duplicates.py for how near-duplicates are found.
+"""
+
+import sys
+from pathlib import Path
+import logging
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.services.near_duplicates import detect_near_duplicates
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Find near-duplicate stories among stored articles"
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Recompute signatures and groups for every article",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1000,
+        help="Articles processed per batch (default: 1000)",
+    )
+
+    args = parser.parse_args()
+
+    try:
+        result = detect_near_duplicates(
+            batch_size=args.batch_size, rebuild=args.rebuild
+        )
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    print(f"\nNear-Duplicate Summary:")
+    print(f"  Articles signed: {result['articles']}")
+    print(f"  Near-duplicates: {result['near_duplicate']}")
@@ -10,14 +10,32 @@ This module can be run:
 import sys
 from pathlib import Path
 import logging
+import time
+from collections import Counter, defaultdict
+from contextlib import nullcontext
+from datetime import datetime
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.database import get_session, Article, Classification
+from src.config import settings
+from src.database import get_session, Article, Classification, FeedState
+from src.collectors.feed_archive import FeedArchive
 from src.collectors.rss_collector import RSSCollector
+from src.collectors.stage_timer import StageTimer
 from src.collectors.feed_sources import get_all_feeds
-from src.collectors.relevance_filter import calculate_relevance
+from src.collectors.parallel_classify import clean_and_classify_parallel
+from src.collectors.relevance_filter import rank_tags
+from src.collectors.url_normalizer import url_hash
+from src.services.classification_memo import ClassificationMemo
+from src.services.facets import article_facets, bump_facets
+from src.services.fetch_runs import RUN_STAGES, save_fetch_run, stage_totals
+from src.services.hot_ranking import hot_score, hot_scores_stale, update_hot_scores
+from src.services.metrics import record_fetch_run
+from src.services.near_duplicates import load_index, minhash, save_buckets
+from src.services.reclassification import index_article_keywords, save_keyword_set
+from src.services.tags import save_article_tags
+from src.services.tiering import archive_old_articles
 
 # Configure logging
 logging.basicConfig(
@@ -25,8 +43,311 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Kept for the lifetime of the process so scheduled runs share the LRU
+_classification_memo = None
 
-def fetch_and_store_articles(max_per_feed=20):
+# URL hashes per duplicate-check query, to stay under bound-parameter limits
+URL_LOOKUP_CHUNK_SIZE = 2000
+
+
+def load_high_water_marks():
+    """
+    Load the persisted per-feed high-water marks.
+
+    Returns:
+        Dict mapping feed URL to (last_entry_id, last_published)
+    """
+    session = get_session()
+    try:
+        return {
+            state.feed_url: (state.last_entry_id, state.last_published)
+            for state in session.query(FeedState).all()
+        }
+    finally:
+        session.close()
+
+
+def save_high_water_marks(session, marks):
+    """
+    Persist high-water marks reported by the collector.
+
+    Args:
+        session: Open database session (committed by the caller)
+        marks: Dict mapping feed URL to (entry_id, published_date)
+    """
+    if not marks:
+        return
+
+    states = {
+        state.feed_url: state
+        for state in session.query(FeedState).filter(
+            FeedState.feed_url.in_(list(marks))
+        )
+    }
+    for feed_url, (entry_id, published) in marks.items():
+        state = states.get(feed_url)
+        if state is None:
+            state = FeedState(feed_url=feed_url)
+            session.add(state)
+        state.last_entry_id = entry_id
+        state.last_published = published
+
+
+def get_feed_archive():
+    """Return the configured FeedArchive, or None if archiving is disabled."""
+    if not settings.feed_archive_enabled:
+        return None
+    return FeedArchive(settings.feed_archive_dir)
+
+
+def get_classification_memo():
+    """Return the process-wide ClassificationMemo, with counters reset for a new run."""
+    global _classification_memo
+    if _classification_memo is None:
+        _classification_memo = ClassificationMemo(settings.classification_memo_size)
+    _classification_memo.refresh_version()
+    _classification_memo.reset_stats()
+    return _classification_memo
+
+
+def get_always_include_sources():
+    """Return the names of sources whose articles bypass relevance filtering."""
+    return {
+        feed_data[1]
+        for feed_data in get_all_feeds()
+        if len(feed_data) > 2 and feed_data[2]
+    }
+
+
+def existing_url_hashes(session, hashes):
+    """
+    Return which of the given URL hashes are already stored.
+
+    Args:
+        session: Open database session
+        hashes: Article.url_hash values to probe
+
+    Returns:
+        Set of the hashes that exist in the articles table
+    """
+    hashes = list(set(hashes))
+    existing = set()
+    for start in range(0, len(hashes), URL_LOOKUP_CHUNK_SIZE):
+        existing.update(
+            h
+            for (h,) in session.query(Article.url_hash).filter(
+                Article.url_hash.in_(hashes[start : start + URL_LOOKUP_CHUNK_SIZE])
+            )
+        )
+    return existing
+
+
+def store_articles(
+    session,
+    articles,
+    always_include_sources,
+    memo=None,
+    workers=None,
+    stats=None,
+    timer=None,
+    keep_unclassified=True,
+):
+    """
+    Classify parsed articles and add the new, relevant ones to the session.
+
+    Args:
+        session: Open database session (committed by the caller)
+        articles: Article dicts as returned by RSSCollector
+        always_include_sources: Source names that bypass relevance filtering
+        memo: Optional ClassificationMemo; articles carrying a cached result
+            skip classification, fresh results are recorded in it
+        workers: Classification processes for large batches (default:
+            settings.classification_workers)
+        stats: Optional dict that receives "sources" (per source name, a
+            Counter of new/duplicate/filtered/near_duplicate)
+        timer: Optional StageTimer that receives the "classification" stage
+        keep_unclassified: Store articles from always_include_sources that
+            match no category (otherwise they are filtered like the rest)
+
+    Returns:
+        Dict with "new", "duplicate", "filtered" and "near_duplicate" counts
+        (near-duplicates are stored, and also counted as new)
+    """
+    new_count = 0
+    duplicate_count = 0
+    filtered_count = 0
+    near_duplicate_count = 0
+    by_source = defaultdict(Counter)
+
+    # Skip articles already in the database, probing the url_hash index
+    for article_data in articles:
+        if "url_hash" not in article_data:
+            article_data["url_hash"] = url_hash(article_data["url"])
+    stored_hashes = existing_url_hashes(session, (a["url_hash"] for a in articles))
+    fresh = []
+    for article_data in articles:
+        if article_data["url_hash"] in stored_hashes:
+            duplicate_count += 1
+            by_source[article_data["source"]]["duplicate"] += 1
+            continue
+        fresh.append(article_data)
+
+    # Classify all new articles without a memoized result in one batch,
+    # stripping HTML from content the collector left raw
+    if workers is None:
+        workers = settings.classification_workers
+    unclassified = [a for a in fresh if "memo" not in a]
+    with timer.stage("classification") if timer else nullcontext():
+        computed = iter(
+            clean_and_classify_parallel(
+                [
+                    (a["title"], a["content"], a.pop("raw_content", False))
+                    for a in unclassified
+                ],
+                workers,
+            )
+        )
+    outcomes = []
+    for article_data in fresh:
+        cached = article_data.get("memo")
+        if cached is not None:
+            outcomes.append((cached.classification, cached.keywords))
+            continue
+        cleaned, result, keywords = next(computed)
+        if cleaned is not None:
+            article_data["content"] = cleaned
+        outcomes.append((result, keywords))
+        if memo is not None and "content_hash" in article_data:
+            memo.put(
+                session,
+                article_data["content_hash"],
+                article_data["content"],
+                result,
+                keywords,
+            )
+    if memo is not None:
+        memo.flush(session)
+
+    if not keep_unclassified:
+        always_include_sources = set()
+
+    version = save_keyword_set(session) if fresh else None
+    keywords_by_article = {}
+    tags_by_article = {}
+    signatures_by_article = {}
+    facet_deltas = Counter()
+
+    # MinHash of everything that passes the filter, and the stored articles
+    # sharing an LSH bucket with any of them
+    signatures = [
+        (
+            minhash(f"{article_data['title']} {article_data['content']}")
+            if classification_data or article_data["source"] in always_include_sources
+            else None
+        )
+        for article_data, (classification_data, _) in zip(fresh, outcomes)
+    ]
+    similar = load_index(session, signatures)
+
+    for article_data, (classification_data, keywords), signature in zip(
+        fresh, outcomes, signatures
+    ):
+        # The same URL can appear in more than one feed
+        if article_data["url_hash"] in stored_hashes:
+            duplicate_count += 1
+            by_source[article_data["source"]]["duplicate"] += 1
+            continue
+
+        # Check if source should bypass filtering
+        source_always_included = article_data["source"] in always_include_sources
+
+        # Skip if not classified and not auto-included
+        if not classification_data and not source_always_included:
+            filtered_count += 1
+            by_source[article_data["source"]]["filtered"] += 1
+            continue
+
+        # Same story under another URL: store it, grouped under the first one
+        duplicate_of = similar.find(signature) if signature is not None else None
+
+        # Create article
+        article = Article(
+            title=article_data["title"],
+            url=article_data["url"],
+            url_hash=article_data["url_hash"],
+            source=article_data["source"],
+            published_date=article_data.get("published_date"),
+            content=article_data.get("content"),
+            summary=article_data.get("summary"),
+            authors=article_data.get("authors"),
+            content_hash=article_data.get("content_hash"),
+            minhash=signature,
+            duplicate_of=duplicate_of,
+            hot_score=hot_score(
+                (
+                    classification_data.get("relevancy_score", 0)
+                    if classification_data
+                    else None
+                ),
+                article_data.get("published_date"),
+            ),
+        )
+        session.add(article)
+        session.flush()
+        stored_hashes.add(article_data["url_hash"])
+        if signature is not None:
+            similar.add(article.id, duplicate_of or article.id, signature)
+        signatures_by_article[article.id] = signature
+        if duplicate_of:
+            near_duplicate_count += 1
+            by_source[article.source]["near_duplicate"] += 1
+
+        # Create classification if available
+        if classification_data:
+            classification = Classification(
+                article_id=article.id,
+                category=classification_data["category"],
+                confidence=classification_data.get("confidence", 0),
+                relevancy_score=classification_data.get("relevancy_score", 0),
+                keyword_version=version,
+            )
+            session.add(classification)
+
+        keywords_by_article[article.id] = keywords
+        facet_deltas.update(
+            article_facets(
+                article.source,
+                article.published_date,
+                article.fetched_date,
+                classification_data["category"] if classification_data else None,
+            )
+        )
+        tags_by_article[article.id] = (
+            classification_data["tags"] if classification_data else rank_tags(keywords)
+        )
+        new_count += 1
+        by_source[article.source]["new"] += 1
+
+    # Keyword → article index used by scripts/reclassify_articles.py
+    index_article_keywords(session, keywords_by_article)
+    save_article_tags(session, tags_by_article)
+    bump_facets(session, facet_deltas)
+    save_buckets(session, signatures_by_article)
+
+    if stats is not None:
+        stats["sources"] = by_source
+
+    return {
+        "new": new_count,
+        "duplicate": duplicate_count,
+        "filtered": filtered_count,
+        "near_duplicate": near_duplicate_count,
+    }
+
+
+def fetch_and_store_articles(
+    max_per_feed=20, use_high_water_marks=True, keep_unclassified=True
+):
     """
     Fetch articles from RSS feeds and store in database.
 
@@ -38,95 +359,140 @@ def fetch_and_store_articles(max_per_feed=20):
 
     Args:
         max_per_feed: Maximum articles per feed to fetch
+        use_high_water_marks: Skip entries already seen in previous runs.
+            Disable to reprocess every entry currently in the feeds.
+        keep_unclassified: Store articles from always-include sources that
+            match no category
     """
     logger.info("🔄 Starting article fetch...")
+    started_at = datetime.utcnow()
+    start, cpu_start = time.perf_counter(), time.thread_time()
+    timer = StageTimer()
+    collector = None
+    store_stats = {}
+
+    def record_run(error=None):
+        """Publish the run's metrics and save it to the fetch-run history."""
+        feed_stats = collector.feed_stats if collector else {}
+        sources = store_stats.get("sources", {})
+        elapsed = time.perf_counter() - start
+        record_fetch_run(
+            feed_stats,
+            sources,
+            elapsed,
+            timer.wall("classification"),
+            ok=error is None,
+        )
+        save_fetch_run(
+            started_at,
+            elapsed,
+            time.thread_time() - cpu_start,
+            timer.stages,
+            feed_stats,
+            sources,
+            error=error,
+            retention_days=settings.fetch_run_retention_days,
+        )
 
     try:
-        # Initialize collector
-        collector = RSSCollector()
+        # New articles are scored with the current constants, so bring the
+        # stored scores in line first (e.g. after a HOT_TIME_SCALE_DAYS change)
+        if hot_scores_stale():
+            logger.info("🔁 Hot ranking constants changed, recomputing all scores")
+            update_hot_scores(full=True)
+
+        # Initialize collector, archiving raw payloads for later reprocessing
+        archive = get_feed_archive()
+        memo = get_classification_memo()
+        collector = RSSCollector(
+            archive=archive, max_bytes=settings.feed_max_bytes, memo=memo
+        )
         feeds = get_all_feeds()
-        always_include_sources = set()
+        always_include_sources = get_always_include_sources()
 
-        # Add feeds and track always-include sources
         for feed_data in feeds:
-            url, source_name = feed_data[0], feed_data[1]
-            always_include = feed_data[2] if len(feed_data) > 2 else False
-            collector.add_feed(url, source_name)
-            if always_include:
-                always_include_sources.add(source_name)
+            collector.add_feed(feed_data[0], feed_data[1])
 
         logger.info(f"Configured {len(feeds)} RSS feeds")
 
-        # Fetch articles
-        articles = collector.fetch_articles(max_per_feed=max_per_feed)
-        logger.info(f"Fetched {len(articles)} articles")
-
-        # Store in database
-        session = get_session()
-        new_count = 0
-        duplicate_count = 0
-        filtered_count = 0
-
-        for article_data in articles:
-            # Check if already exists
-            existing = session.query(Article).filter_by(url=article_data["url"]).first()
-            if existing:
-                duplicate_count += 1
-                continue
-
-            # Check if source should bypass filtering
-            source_always_included = article_data["source"] in always_include_sources
-
-            # Classify article
-            classification_data = calculate_relevance(
-                article_data["title"], article_data["content"]
+        # Fetch articles, stopping at entries seen in previous runs
+        marks = load_high_water_marks() if use_high_water_marks else None
+        articles = collector.fetch_articles(
+            max_per_feed=max_per_feed, high_water_marks=marks
+        )
+        known_count = sum(
+            stats.get("known", 0) for stats in collector.feed_stats.values()
+        )
+        oversized = [
+            source
+            for source, stats in collector.feed_stats.items()
+            if stats.get("oversized")
+        ]
+        logger.info(
+            f"Fetched {len(articles)} articles ({known_count} already-seen entries skipped)"
+        )
+        if oversized:
+            logger.warning(
+                f"⚠️ Skipped {len(oversized)} oversized feeds: {', '.join(oversized)}"
             )
 
-            # Skip if not classified and not auto-included
-            if not classification_data and not source_always_included:
-                filtered_count += 1
-                continue
-
-            # Create article
-            article = Article(
-                title=article_data["title"],
-                url=article_data["url"],
-                source=article_data["source"],
-                published_date=article_data.get("published_date"),
-                content=article_data.get("content"),
-                summary=article_data.get("summary"),
-                authors=article_data.get("authors"),
-            )
-            session.add(article)
-            session.flush()
-
-            # Create classification if available
-            if classification_data:
-                classification = Classification(
-                    article_id=article.id,
-                    category=classification_data["category"],
-                    confidence=classification_data.get("confidence", 0),
-                    relevancy_score=classification_data.get("relevancy_score", 0),
-                    tags=", ".join(classification_data.get("tags", [])),
+        # Store in database
+        with timer.stage("store"):
+            session = get_session()
+            try:
+                counts = store_articles(
+                    session,
+                    articles,
+                    always_include_sources,
+                    memo,
+                    stats=store_stats,
+                    timer=timer,
+                    keep_unclassified=keep_unclassified,
                 )
-                session.add(classification)
 
-            new_count += 1
+                # Advance the marks in the same transaction as the articles they cover
+                save_high_water_marks(session, collector.high_water_marks)
 
-        session.commit()
-        session.close()
+                memo.prune(session, settings.classification_memo_retention_days)
+
+                session.commit()
+            except Exception:
+                session.rollback()
+                raise
+            finally:
+                # Return the connection before the run is recorded: the SQLite
+                # writer pool holds a single one
+                session.close()
+        # Classification ran inside the store block
+        timer.add("store", -timer.wall("classification"), -timer.cpu("classification"))
+
+        archived = 0
+        with timer.stage("archive"):
+            if archive is not None:
+                archive.prune(settings.feed_archive_retention_days)
 
+            if settings.article_hot_days:
+                archived = archive_old_articles(settings.article_hot_days)
+
+        record_run()
         logger.info(
-            f"✓ Fetch complete: {new_count} new, {duplicate_count} duplicates, {filtered_count} filtered"
+            f"✓ Fetch complete: {counts['new']} new ({counts['near_duplicate']} near-duplicates), "
+            f"{counts['duplicate']} duplicates, {counts['filtered']} filtered "
+            f"(memo: {memo.hits} hits, {memo.misses} misses)"
         )
         return {
-            "new": new_count,
-            "duplicate": duplicate_count,
-            "filtered": filtered_count,
+            **counts,
+            "known": known_count,
+            "oversized": oversized,
+            "memo_hits": memo.hits,
+            "memo_misses": memo.misses,
+            "archived": archived,
+            "timings": stage_totals(timer.stages, collector.feed_stats).stages,
         }
 
     except Exception as e:
         logger.error(f"✗ Error fetching articles: {str(e)}", exc_info=True)
+        record_run(error=str(e))
         raise
 
 
@@ -140,15 +506,35 @@ if __name__ == "__main__":
         default=20,
         help="Maximum articles to fetch per feed (default: 20)",
     )
+    parser.add_argument(
+        "--ignore-high-water-marks",
+        action="store_true",
+        help="Process every entry in the feeds, including ones seen in previous runs",
+    )
 
     args = parser.parse_args()
 
     try:
-        result = fetch_and_store_articles(max_per_feed=args.max_per_feed)
+        result = fetch_and_store_articles(
+            max_per_feed=args.max_per_feed,
+            use_high_water_marks=not args.ignore_high_water_marks,
+        )
         print(f"\nFetch Summary:")
         print(f"  New articles: {result['new']}")
+        print(f"  Near-duplicates (hidden): {result['near_duplicate']}")
         print(f"  Duplicates: {result['duplicate']}")
         print(f"  Filtered: {result['filtered']}")
+        print(f"  Already seen (skipped): {result['known']}")
+        print(
+            f"  Classification memo: {result['memo_hits']} hits, {result['memo_misses']} misses"
+        )
+        print(f"  Moved to cold archive: {result['archived']}")
+        print(f"  Stage timings (wall / CPU):")
+        for stage in RUN_STAGES:
+            wall, cpu = result["timings"].get(stage, (0.0, 0.0))
+            print(f"    {stage}: {wall:.2f}s / {cpu:.2f}s")
+        if result["oversized"]:
+            print(f"  Oversized feeds: {', '.join(result['oversized'])}")
         sys.exit(0)
     except Exception as e:
         print(f"Error: {e}")
@@ -7,6 +7,10 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.database import init_db, seed_categories, get_session, Article, Classification
+from src.collectors.url_normalizer import url_hash
+from src.services.facets import article_facets, bump_facets
+from src.services.hot_ranking import hot_scores_stale, update_hot_scores
+from src.services.tags import save_article_tags
 from datetime import datetime, timedelta
 import random
 
@@ -102,7 +106,11 @@ def seed_sample_articles():
     # Create articles and classifications
     for idx, article_data in enumerate(sample_articles):
         # Check if article already exists
-        existing = session.query(Article).filter_by(url=article_data["url"]).first()
+        existing = (
+            session.query(Article.id)
+            .filter_by(url_hash=url_hash(article_data["url"]))
+            .first()
+        )
         if existing:
             continue
 
@@ -125,9 +133,15 @@ def seed_sample_articles():
             category=article_data["category"],
             confidence=random.uniform(0.85, 0.98),
             relevancy_score=article_data["relevancy"],
-            tags=article_data["tags"],
         )
         session.add(classification)
+        save_article_tags(session, {article.id: article_data["tags"].split(",")})
+        bump_facets(
+            session,
+            article_facets(
+                article.source, article.published_date, category=classification.category
+            ),
+        )
 
     session.commit()
     session.close()
@@ -158,6 +172,12 @@ if __name__ == "__main__":
     else:
         print("Skipping sample articles (use --with-samples to include)")
 
+    # Recompute everything after a change of HOT_TIME_SCALE_DAYS (fetch runs
+    # check this too)
+    scored = update_hot_scores(full=hot_scores_stale())
+    if scored:
+        print(f"Computed the Top ranking key of {scored} articles")
+
     print("\n✓ Database setup complete!")
     if args.with_samples:
         print("Database initialized with sample data.")
@@ -0,0 +1,65 @@
+"""List, add and remove the UserPreference rows behind the "For you" ranking.
+
+    python scripts/manage_preferences.py list
+    python scripts/manage_preferences.py add "Energy" --keywords "energy efficiency, carbon footprint" --weight 2
+    python scripts/manage_preferences.py add "AI for Medicine"    # a category's keywords
+    python scripts/manage_preferences.py remove 3
+
+Preference keywords are matched against the relevance keywords in
+src/collectors/relevance_filter.py (see src/services/personalization.py).
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.database import get_session, KeywordVocabulary, UserPreference
+from src.services.personalization import preference_terms
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Manage personalization preferences")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="Show preferences and their matched keywords")
+    add = commands.add_parser("add", help="Add a preference")
+    add.add_argument("topic", help="Topic name, or a category name")
+    add.add_argument("--keywords", help="Comma-separated relevance keywords")
+    add.add_argument("--weight", type=float, default=1.0, help="Weight (default: 1.0)")
+    remove = commands.add_parser("remove", help="Remove a preference")
+    remove.add_argument("id", type=int, help="Preference ID")
+
+    args = parser.parse_args()
+
+    session = get_session()
+    try:
+        if args.command == "add":
+            preference = UserPreference(
+                topic=args.topic, weight=args.weight, keywords=args.keywords
+            )
+            session.add(preference)
+            session.commit()
+            print(f"✓ Added preference {preference.id}: {preference.topic}")
+        elif args.command == "remove":
+            deleted = session.query(UserPreference).filter_by(id=args.id).delete()
+            session.commit()
+            print(f"✓ Removed preference {args.id}" if deleted else "Not found")
+        else:
+            vocabulary = {
+                keyword.strip()
+                for (keyword,) in session.query(KeywordVocabulary.keyword)
+            }
+            for preference in session.query(UserPreference).order_by(UserPreference.id):
+                terms = preference_terms(preference)
+                matched = [term for term in terms if term in vocabulary]
+                print(
+                    f"{preference.id:>4}  {preference.topic}  (weight {preference.weight}): "
+                    f"{len(matched)}/{len(terms)} keywords matched"
+                )
+                unmatched = sorted(set(terms) - vocabulary)
+                if unmatched:
+                    print(f"      not relevance keywords: {', '.join(unmatched)}")
+    finally:
+        session.close()
@@ -0,0 +1,34 @@
+"""Recompute the archive facet counts from the stored articles.
+
+Fetches, tagging and reclassification keep the counts current. Run this
+once after upgrading (python scripts/init_db.py first), after bulk imports,
+or to repair counts:
+    python scripts/rebuild_facets.py
+
+See src/services/facets.py.
+"""
+
+import sys
+from pathlib import Path
+import logging
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.services.facets import rebuild_facets
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+
+if __name__ == "__main__":
+    try:
+        stats = rebuild_facets()
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    print(f"\nFacet Summary:")
+    for facet, values in stats.items():
+        print(f"  {facet}: {values} values")
@@ -0,0 +1,45 @@
+"""Recompute the tags of already stored articles.
+
+New articles are tagged at ingest, and reclassification retags the
+articles it rescores. Run this once after upgrading (python
+scripts/init_db.py first) to tag existing articles:
+    python scripts/rebuild_tags.py
+
+Tags are derived from the article_keywords index; articles the index
+doesn't cover yet are matched from their text. See src/services/tags.py.
+"""
+
+import sys
+from pathlib import Path
+import logging
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.services.tags import rebuild_tags
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Recompute stored article tags")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1000,
+        help="Articles processed per batch (default: 1000)",
+    )
+
+    args = parser.parse_args()
+
+    try:
+        count = rebuild_tags(batch_size=args.batch_size)
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    print(f"\n✓ Tagged {count} articles")
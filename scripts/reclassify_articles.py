@@ -0,0 +1,80 @@
+"""Reclassify stored articles after the relevance keywords change.
+
+Run after editing CATEGORY_KEYWORDS or GLOBAL_KEYWORDS in
+src/collectors/relevance_filter.py:
+    python scripts/reclassify_articles.py
+    python scripts/reclassify_articles.py --dry-run   # report, don't write
+    python scripts/reclassify_articles.py --full      # rescore everything
+    python scripts/reclassify_articles.py --full --workers 0 --batch-size 50000
+
+Only articles that can be affected by the added or removed keywords are
+rescored (see src/services/reclassification.py). The first run on a database
+without keyword snapshots rescores everything and builds the keyword index.
+With --workers, large batches are classified on a process pool
+(src/collectors/parallel_classify.py).
+"""
+
+import sys
+from pathlib import Path
+import logging
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config import settings
+from src.services.reclassification import reclassify_articles
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Reclassify stored articles after a keyword change"
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Rescore every article, not just the affected ones",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1000,
+        help="Articles rescored per batch (default: 1000)",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Report what would change without writing anything",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=settings.classification_workers,
+        help="Classification processes, 0 for one per core (default: CLASSIFICATION_WORKERS)",
+    )
+
+    args = parser.parse_args()
+
+    try:
+        result = reclassify_articles(
+            full=args.full,
+            batch_size=args.batch_size,
+            dry_run=args.dry_run,
+            workers=args.workers,
+        )
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    print(f"\nReclassify Summary{' (dry run)' if args.dry_run else ''}:")
+    print(f"  Keyword version: {result['version']}")
+    print(f"  Mode: {'full' if result['full'] else 'incremental'}")
+    print(f"  Articles rescored: {result['candidates']}")
+    print(f"  Classifications changed: {result['changed']}")
+    print(f"  Newly classified: {result['added']}")
+    print(f"  No longer relevant: {result['removed']}")
@@ -0,0 +1,174 @@
+"""Replay archived feed payloads through the parse → classify → store pipeline.
+
+After changing _parse_entry or the relevance filter, run this to pick up
+articles from feeds fetched in the past, without touching the network:
+    python scripts/reprocess_archive.py
+    python scripts/reprocess_archive.py --since-days 30 --source "UN SDGs"
+
+Articles already in the database are skipped as duplicates, exactly like a
+regular fetch. Entries are collected across payloads and HTML stripping and
+classification run on a process pool for large backfills:
+    python scripts/reprocess_archive.py --workers 0     # one process per core
+"""
+
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+import logging
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config import settings
+from src.database import get_session
+from src.collectors.feed_archive import FeedArchive
+from src.collectors.rss_collector import RSSCollector
+from scripts.fetch_articles_modular import (
+    get_always_include_sources,
+    get_classification_memo,
+    store_articles,
+)
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+def reprocess_archive(
+    since_days=None, source=None, max_per_feed=None, workers=None, batch_size=20000
+):
+    """
+    Reprocess every distinct archived payload.
+
+    Args:
+        since_days: Only replay fetches from the last N days (None for all)
+        source: Only replay this source name (None for all)
+        max_per_feed: Maximum entries parsed per payload (None for all)
+        workers: Classification processes (None for settings.classification_workers,
+            0 for one per core)
+        batch_size: Entries collected before they are classified and committed
+
+    Returns:
+        Dict with "payloads", "articles", "new", "duplicate", "filtered",
+        "near_duplicate", "memo_hits" and "memo_misses" counts
+    """
+    archive = FeedArchive(settings.feed_archive_dir)
+    memo = get_classification_memo()
+    # HTML is stripped in the classification stage, and only for new articles
+    collector = RSSCollector(memo=memo, clean_html=False)
+    always_include_sources = get_always_include_sources()
+    since = datetime.utcnow() - timedelta(days=since_days) if since_days else None
+
+    totals = {
+        "payloads": 0,
+        "articles": 0,
+        "new": 0,
+        "duplicate": 0,
+        "filtered": 0,
+        "near_duplicate": 0,
+    }
+    seen_hashes = set()
+    start = time.perf_counter()
+
+    session = get_session()
+    pending = []
+
+    def flush():
+        counts = store_articles(session, pending, always_include_sources, memo, workers)
+        session.commit()
+        totals["articles"] += len(pending)
+        for key, value in counts.items():
+            totals[key] += value
+        pending.clear()
+
+    try:
+        for record in archive.records(since=since, source=source):
+            # Unchanged feeds are archived once but indexed on every fetch
+            if record["hash"] in seen_hashes:
+                continue
+            seen_hashes.add(record["hash"])
+
+            try:
+                body = archive.load(record["hash"])
+                articles = collector.process_feed_body(
+                    body,
+                    record["url"],
+                    record["source"],
+                    max_per_feed,
+                    headers={"content-type": record.get("content_type") or ""},
+                )
+            except Exception as e:
+                logger.error(f"Error reprocessing {record['hash'][:12]}: {str(e)}")
+                continue
+
+            totals["payloads"] += 1
+            pending.extend(articles)
+            if len(pending) >= batch_size:
+                flush()
+
+        if pending:
+            flush()
+    finally:
+        session.close()
+
+    totals["memo_hits"] = memo.hits
+    totals["memo_misses"] = memo.misses
+    elapsed = time.perf_counter() - start
+    logger.info(
+        f"✓ Reprocessed {totals['payloads']} payloads ({totals['articles']} articles) "
+        f"in {elapsed:.1f}s: {totals['new']} new, {totals['duplicate']} duplicates, "
+        f"{totals['filtered']} filtered (memo: {memo.hits} hits, {memo.misses} misses)"
+    )
+    return totals
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Reprocess archived feed payloads without refetching"
+    )
+    parser.add_argument(
+        "--since-days",
+        type=int,
+        help="Only replay fetches from the last N days (default: whole archive)",
+    )
+    parser.add_argument("--source", help="Only replay this source name")
+    parser.add_argument(
+        "--max-per-feed",
+        type=int,
+        help="Maximum entries parsed per payload (default: all)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Classification processes, 0 for one per core (default: CLASSIFICATION_WORKERS)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=20000,
+        help="Entries classified and committed per batch (default: 20000)",
+    )
+
+    args = parser.parse_args()
+
+    result = reprocess_archive(
+        since_days=args.since_days,
+        source=args.source,
+        max_per_feed=args.max_per_feed,
+        workers=args.workers,
+        batch_size=args.batch_size,
+    )
+    print(f"\nReprocess Summary:")
+    print(f"  Payloads: {result['payloads']}")
+    print(f"  New articles: {result['new']}")
+    print(f"  Near-duplicates (hidden): {result['near_duplicate']}")
+    print(f"  Duplicates: {result['duplicate']}")
+    print(f"  Filtered: {result['filtered']}")
+    print(
+        f"  Classification memo: {result['memo_hits']} hits, {result['memo_misses']} misses"
+    )
@@ -0,0 +1,58 @@
+"""Export the database to a compressed snapshot, or restore one.
+
+    python scripts/snapshot.py export data/snapshot.jsonl.gz
+    python scripts/snapshot.py export core.jsonl.gz --tables articles classifications categories user_preferences
+    DATABASE_URL=sqlite:///data/dev.db python scripts/snapshot.py import data/snapshot.jsonl.gz
+
+Both commands use DATABASE_URL. Imports need empty tables unless
+--replace is given, which also clears the tables referencing the snapshot's
+(e.g. classifications when replacing articles). See src/services/snapshot.py for the file format.
+"""
+
+import sys
+from pathlib import Path
+import logging
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.services.bulk_io import DEFAULT_CHUNK_SIZE
+from src.services.snapshot import export_snapshot, import_snapshot
+
+if __name__ == "__main__":
+    import argparse
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    parser = argparse.ArgumentParser(description="Export or import database snapshots")
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f"Rows per batch (default: {DEFAULT_CHUNK_SIZE})",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    export = commands.add_parser("export", help="Write a snapshot")
+    export.add_argument("path", help="Snapshot file, e.g. snapshot.jsonl.gz")
+    export.add_argument("--tables", nargs="+", help="Only these tables (default: all)")
+    restore = commands.add_parser("import", help="Restore a snapshot")
+    restore.add_argument("path", help="Snapshot file")
+    restore.add_argument(
+        "--replace",
+        action="store_true",
+        help="Delete existing rows of the snapshot's tables, and of the tables "
+        "referencing them, first",
+    )
+
+    args = parser.parse_args()
+
+    try:
+        if args.command == "export":
+            counts = export_snapshot(args.path, args.tables, args.chunk_size)
+        else:
+            counts = import_snapshot(args.path, args.chunk_size, args.replace)
+    except Exception as e:
+        print(f"❌ Snapshot {args.command} failed: {e}")
+        sys.exit(1)
+
+    print(f"\n✓ {sum(counts.values()):,} rows in {len(counts)} tables")
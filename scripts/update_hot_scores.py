@@ -0,0 +1,49 @@
+"""Compute the Top ranking key (Article.hot_score) in bulk.
+
+Fetching and reclassification keep scores current, and init_db.py fills
+in missing ones. Scores do not decay in storage (see
+src/services/hot_ranking.py), so a full recompute is only needed after
+changing HOT_EPOCH or HOT_TIME_SCALE_DAYS:
+    python scripts/update_hot_scores.py          # articles without a score
+    python scripts/update_hot_scores.py --full   # every article
+"""
+
+import sys
+from pathlib import Path
+import logging
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.services.hot_ranking import update_hot_scores
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compute Top ranking scores")
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Recompute every article instead of only those without a score",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=5000,
+        help="Articles updated per batch (default: 5000)",
+    )
+
+    args = parser.parse_args()
+
+    try:
+        count = update_hot_scores(batch_size=args.batch_size, full=args.full)
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    print(f"\n✓ Updated {count} articles")
@@ -0,0 +1,291 @@
+"""Fast-path parser for well-formed RSS 2.0, Atom 1.0 and RDF (RSS 1.0) feeds.
+
+feedparser does encoding sniffing, HTML sanitization, relative URI resolution
+and date normalization for dozens of formats. For the well-formed feeds we
+actually collect from, all we need are the handful of fields that
+RSSCollector._parse_entry reads, so this module extracts exactly those with
+xml.etree's iterparse and stops as soon as enough entries have been read.
+
+Anything outside the fast path (malformed XML, unknown root elements, inline
+XHTML, unparseable dates, markup feedparser would sanitize away) raises
+FastParseError so the caller can fall back to feedparser.
+"""
+
+import re
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from io import BytesIO
+from typing import List, Optional
+from urllib.parse import urljoin
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+RSS10 = "{http://purl.org/rss/1.0/}"
+RDF = "{http://www.w3.org/1999/02/22-rdf-syntax-ns#}"
+DC = "{http://purl.org/dc/elements/1.1/}"
+CONTENT = "{http://purl.org/rss/1.0/modules/content/}"
+FEEDBURNER = "{http://rssnamespace.org/feedburner/ext/1.0}"
+XML_BASE = "{http://www.w3.org/XML/1998/namespace}base"
+
+ENTRY_TAGS = {"item", RSS10 + "item", ATOM + "entry"}
+HTML_TYPES = {"html", "text/html", "text", "text/plain"}
+
+# Elements whose content feedparser's sanitizer drops entirely; their text
+# would otherwise survive strip_html, so leave these feeds to feedparser.
+_UNSAFE_MARKUP_RE = re.compile(r"<\s*(script|style|applet)\b", re.IGNORECASE)
+
+# Same e-mail pattern feedparser uses to split "bob@example.com (Bob)" authors
+_EMAIL_RE = re.compile(
+    r"(([a-zA-Z0-9\_\-\.\+]+)@((\[[0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3}\.)|"
+    r"(([a-zA-Z0-9\-]+\.)+))([a-zA-Z]{2,4}|[0-9]{1,3})(\]?))(\?subject=\S+)?"
+)
+
+
+class FastParseError(Exception):
+    """Raised when a feed falls outside the fast path and needs feedparser."""
+
+
+class FeedEntry(dict):
+    """Minimal stand-in for feedparser's FeedParserDict: keys double as attributes."""
+
+    __slots__ = ()
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+
+def parse_feed(
+    data: bytes, base_url: str = "", limit: Optional[int] = None
+) -> List[FeedEntry]:
+    """
+    Parse a feed document into feedparser-compatible entries.
+
+    Args:
+        data: Raw feed body
+        base_url: URL the feed was fetched from, used to resolve relative links
+        limit: Stop after this many entries (None for all)
+
+    Returns:
+        List of FeedEntry objects with the keys _parse_entry reads: title,
+        link, id, published_parsed/updated_parsed, summary, content, authors
+        and author
+
+    Raises:
+        FastParseError: If the feed must be handled by feedparser instead
+    """
+    entries = []
+    base = base_url
+    root_seen = False
+
+    try:
+        for event, elem in ET.iterparse(BytesIO(data), events=("start", "end")):
+            if event == "start":
+                if not root_seen:
+                    root_seen = True
+                    if elem.tag not in ("rss", ATOM + "feed", RDF + "RDF"):
+                        raise FastParseError(f"Unsupported root element {elem.tag}")
+                    if XML_BASE in elem.attrib:
+                        base = urljoin(base, elem.attrib[XML_BASE])
+                continue
+
+            if elem.tag not in ENTRY_TAGS:
+                continue
+
+            if elem.tag == ATOM + "entry":
+                entries.append(_parse_atom_entry(elem, base))
+            else:
+                entries.append(_parse_rss_entry(elem, base))
+            elem.clear()
+
+            if limit is not None and len(entries) >= limit:
+                break
+    except ET.ParseError as e:
+        raise FastParseError(f"Malformed XML: {e}") from e
+
+    return entries
+
+
+def _parse_rss_entry(item, base: str) -> FeedEntry:
+    """Extract fields from an RSS 2.0 <item> or RSS 1.0 (RDF) <item>."""
+    entry = FeedEntry()
+    authors = []
+    summary = None
+    content = None
+    permalink = None
+
+    about = item.get(RDF + "about")
+    if about:
+        entry["id"] = about.strip()
+
+    for child in item:
+        tag = child.tag
+        if tag.startswith(RSS10):
+            tag = tag[len(RSS10) :]
+
+        if tag == "title":
+            entry["title"] = _text(child)
+        elif tag == "link":
+            entry.setdefault("link", _resolve(base, _text(child)))
+        elif tag == "guid":
+            value = _text(child)
+            entry["id"] = value
+            if child.get("isPermaLink", "true") == "true":
+                permalink = value
+        elif tag == "description":
+            summary = _text(child)
+        elif tag == CONTENT + "encoded":
+            content = _text(child)
+        elif tag == FEEDBURNER + "origLink":
+            entry["feedburner_origlink"] = _text(child)
+        elif tag == "pubDate":
+            entry["published_parsed"] = _parse_date(_text(child))
+        elif tag == DC + "date":
+            entry["updated_parsed"] = _parse_date(_text(child))
+        elif tag == "author":
+            authors.append(_parse_author(_text(child)))
+        elif tag == DC + "creator":
+            authors.append(({"name": _text(child)}, _text(child)))
+
+    if "link" not in entry and permalink:
+        entry["link"] = permalink
+
+    _set_body(entry, summary, content)
+    _set_authors(entry, authors)
+    return entry
+
+
+def _parse_atom_entry(elem, base: str) -> FeedEntry:
+    """Extract fields from an Atom 1.0 <entry>."""
+    entry = FeedEntry()
+    authors = []
+    summary = None
+    content = None
+
+    if XML_BASE in elem.attrib:
+        base = urljoin(base, elem.attrib[XML_BASE])
+
+    for child in elem:
+        tag = child.tag
+
+        if tag == ATOM + "title":
+            entry["title"] = _typed_text(child)
+        elif tag == ATOM + "link":
+            rel = child.get("rel", "alternate")
+            link_type = child.get("type", "text/html")
+            href = child.get("href")
+            if (
+                href
+                and rel == "alternate"
+                and link_type
+                in (
+                    "text/html",
+                    "application/xhtml+xml",
+                )
+            ):
+                entry["link"] = _resolve(base, href.strip())
+        elif tag == ATOM + "id":
+            entry["id"] = _text(child)
+        elif tag == FEEDBURNER + "origLink":
+            entry["feedburner_origlink"] = _text(child)
+        elif tag == ATOM + "published":
+            entry["published_parsed"] = _parse_date(_text(child))
+        elif tag == ATOM + "updated":
+            entry["updated_parsed"] = _parse_date(_text(child))
+        elif tag == ATOM + "author":
+            name = child.find(ATOM + "name")
+            if name is not None and _text(name):
+                authors.append(({"name": _text(name)}, _text(name)))
+        elif tag == ATOM + "summary":
+            summary = _typed_text(child)
+        elif tag == ATOM + "content":
+            if child.get("src") is None and child.get("type", "text") in HTML_TYPES:
+                content = _typed_text(child)
+
+    _set_body(entry, summary, content)
+    _set_authors(entry, authors)
+    return entry
+
+
+def _text(elem) -> str:
+    """Return an element's text content, rejecting inline child markup."""
+    if len(elem):
+        raise FastParseError(f"Unexpected markup inside <{elem.tag}>")
+    return (elem.text or "").strip()
+
+
+def _typed_text(elem) -> str:
+    """Return the text of an Atom text construct (text or html, not xhtml)."""
+    if elem.get("type", "text") == "xhtml":
+        raise FastParseError("Inline XHTML content")
+    return _text(elem)
+
+
+def _resolve(base: str, url: str) -> str:
+    """Resolve a possibly-relative link against the feed URL."""
+    if not base or not url or "://" in url:
+        return url
+    return urljoin(base, url)
+
+
+def _set_body(entry: FeedEntry, summary: Optional[str], content: Optional[str]):
+    """Mirror feedparser: summary falls back to the first content element."""
+    for value in (summary, content):
+        if value and _UNSAFE_MARKUP_RE.search(value):
+            raise FastParseError("Markup that feedparser would sanitize")
+
+    if content is not None:
+        entry["content"] = [{"value": content}]
+    if summary is not None:
+        entry["summary"] = summary
+    elif content is not None:
+        entry["summary"] = content
+
+
+def _set_authors(entry: FeedEntry, authors: list):
+    """Store author details and the last raw author string, like feedparser."""
+    if not authors:
+        return
+    details = [detail for detail, _ in authors if detail]
+    if details:
+        entry["authors"] = details
+    entry["author"] = authors[-1][1]
+
+
+def _parse_author(value: str):
+    """Split an RSS author such as 'bob@example.com (Bob)' into its parts."""
+    detail = {}
+    name = value
+    match = _EMAIL_RE.search(value)
+    if match:
+        email = match.group(0)
+        name = value.replace(email, "").replace("()", "").replace("<>", "").strip()
+        if name.startswith("("):
+            name = name[1:]
+        if name.endswith(")"):
+            name = name[:-1]
+        name = name.strip()
+        detail["email"] = email
+    if name:
+        detail["name"] = name
+    return detail, value
+
+
+def _parse_date(value: str):
+    """Parse an RFC 822 or ISO 8601 date into a UTC struct_time."""
+    if not value:
+        return None
+
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(value)
+        except (TypeError, ValueError, IndexError):
+            raise FastParseError(f"Unrecognized date format: {value!r}")
+
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc)
+    return parsed.utctimetuple()
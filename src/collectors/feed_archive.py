@@ -0,0 +1,161 @@
+"""Content-addressed archive of raw feed payloads.
+
+Every fetched feed body is stored gzip-compressed under its SHA-256 hash, so a
+feed that hasn't changed since the last run costs one index line instead of
+another copy. The index is an append-only JSON-lines file with one record per
+fetch, which lets scripts/reprocess_archive.py replay history through the
+parse → classify → store pipeline without touching the network.
+
+Layout:
+    <directory>/index.jsonl              one record per fetch
+    <directory>/objects/ab/abcdef….gz    compressed payloads
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class FeedArchive:
+    """Stores raw feed bodies on local disk, deduplicated by content hash."""
+
+    def __init__(self, directory: str):
+        """
+        Initialize the archive.
+
+        Args:
+            directory: Root directory of the archive (created on first write)
+        """
+        self.directory = Path(directory)
+        self.index_path = self.directory / "index.jsonl"
+        self._lock = threading.Lock()
+
+    def _object_path(self, content_hash: str) -> Path:
+        return self.directory / "objects" / content_hash[:2] / f"{content_hash}.gz"
+
+    def store(
+        self,
+        feed_url: str,
+        source_name: str,
+        body: bytes,
+        content_type: Optional[str] = None,
+    ) -> str:
+        """
+        Archive a fetched feed body.
+
+        Args:
+            feed_url: URL the body was fetched from
+            source_name: Name of the source
+            body: Raw feed body
+            content_type: Response Content-Type, kept for encoding detection
+
+        Returns:
+            SHA-256 hex digest of the body
+        """
+        content_hash = hashlib.sha256(body).hexdigest()
+        path = self._object_path(content_hash)
+
+        with self._lock:
+            if not path.exists():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                # Write to a temp file first so a crash never leaves a truncated object
+                fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+                with os.fdopen(fd, "wb") as f:
+                    f.write(gzip.compress(body, compresslevel=9))
+                os.replace(tmp_path, path)
+
+            record = {
+                "fetched": datetime.utcnow().isoformat(timespec="seconds"),
+                "url": feed_url,
+                "source": source_name,
+                "hash": content_hash,
+                "size": len(body),
+                "content_type": content_type,
+            }
+            with open(self.index_path, "a") as f:
+                f.write(json.dumps(record) + "\n")
+
+        return content_hash
+
+    def load(self, content_hash: str) -> bytes:
+        """Return the raw body stored under content_hash."""
+        with gzip.open(self._object_path(content_hash), "rb") as f:
+            return f.read()
+
+    def records(
+        self, since: Optional[datetime] = None, source: Optional[str] = None
+    ) -> Iterator[Dict]:
+        """
+        Iterate over index records, oldest first.
+
+        Args:
+            since: Only records fetched at or after this time
+            source: Only records for this source name
+        """
+        if not self.index_path.exists():
+            return
+
+        with open(self.index_path) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if since and datetime.fromisoformat(record["fetched"]) < since:
+                    continue
+                if source and record["source"] != source:
+                    continue
+                yield record
+
+    def prune(self, retention_days: int) -> Dict[str, int]:
+        """
+        Drop index records older than retention_days and delete payloads
+        no remaining record refers to.
+
+        Args:
+            retention_days: Number of days of fetch history to keep
+
+        Returns:
+            Dict with counts of removed "records" and "objects"
+        """
+        cutoff = datetime.utcnow() - timedelta(days=retention_days)
+
+        with self._lock:
+            if not self.index_path.exists():
+                return {"records": 0, "objects": 0}
+
+            kept, removed = [], 0
+            for record in self.records():
+                if datetime.fromisoformat(record["fetched"]) < cutoff:
+                    removed += 1
+                else:
+                    kept.append(record)
+
+            if not removed:
+                return {"records": 0, "objects": 0}
+
+            tmp_path = self.index_path.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                for record in kept:
+                    f.write(json.dumps(record) + "\n")
+            os.replace(tmp_path, self.index_path)
+
+            referenced = {record["hash"] for record in kept}
+            deleted = 0
+            for path in (self.directory / "objects").glob("*/*.gz"):
+                if path.name[: -len(".gz")] not in referenced:
+                    path.unlink()
+                    deleted += 1
+
+        logger.info(
+            f"Pruned feed archive: {removed} records, {deleted} payloads older than {retention_days} days"
+        )
+        return {"records": removed, "objects": deleted}
@@ -0,0 +1,168 @@
+"""Process-pool classification stage for large backfills.
+
+strip_html and the relevance filter are pure-Python CPU work, so one process
+uses one core however many articles are queued. This module splits a batch
+into chunks and runs them on a ProcessPoolExecutor:
+
+- workers receive (title, content, is_raw) tuples and return compact
+  (cleaned content, scores, keywords) tuples instead of per-article dicts;
+  content is only cleaned, and sent back, for entries flagged as raw;
+- batches smaller than MIN_PARALLEL_ARTICLES, or a single worker, run in
+  process, so regular fetches never pay for starting a pool.
+
+The pool is created on first use and reused for the rest of the process,
+so workers see the keyword lists as they were when it started.
+"""
+
+import atexit
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from src.collectors.relevance_batch import classify_and_match
+from src.collectors.rss_collector import strip_html
+
+logger = logging.getLogger(__name__)
+
+# Articles sent to a worker per task
+DEFAULT_CHUNK_SIZE = 2000
+
+# Below this the pool's pickling and startup cost outweighs the gain
+MIN_PARALLEL_ARTICLES = 4000
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+
+
+def resolve_workers(workers: Optional[int]) -> int:
+    """Turn a worker setting into a process count (0 or None means all cores)."""
+    if not workers:
+        return os.cpu_count() or 1
+    return max(1, workers)
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """Return the shared pool, recreating it if the worker count changed."""
+    global _pool, _pool_workers
+    if _pool is None or _pool_workers != workers:
+        shutdown_pool()
+        _pool = ProcessPoolExecutor(max_workers=workers)
+        _pool_workers = workers
+        logger.info(f"Started classification pool with {workers} workers")
+    return _pool
+
+
+def shutdown_pool():
+    """Stop the shared pool, if one was started."""
+    global _pool, _pool_workers
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
+        _pool_workers = 0
+
+
+atexit.register(shutdown_pool)
+
+
+def _process_chunk(chunk: List[Tuple[str, str, bool]]) -> List[tuple]:
+    """
+    Worker: strip HTML where flagged, then classify.
+
+    Returns one (cleaned content or None, scores or None, keywords) tuple per
+    (title, content, is_raw) input; content is only sent back when it changed.
+    """
+    cleaned = [strip_html(content) if raw else None for _, content, raw in chunk]
+    outcomes = classify_and_match(
+        [
+            (title, content if text is None else text)
+            for (title, content, _), text in zip(chunk, cleaned)
+        ]
+    )
+    return [
+        (
+            text,
+            (
+                (
+                    result["category"],
+                    result["confidence"],
+                    result["relevancy_score"],
+                    tuple(result["tags"]),
+                )
+                if result
+                else None
+            ),
+            tuple(keywords),
+        )
+        for text, (result, keywords) in zip(cleaned, outcomes)
+    ]
+
+
+def _expand(scores: Optional[tuple], keywords: tuple):
+    """Turn a compact worker result back into classify_and_match's format."""
+    result = None
+    if scores is not None:
+        category, confidence, relevancy_score, tags = scores
+        result = {
+            "category": category,
+            "confidence": confidence,
+            "relevancy_score": relevancy_score,
+            "tags": list(tags),
+        }
+    return result, list(keywords)
+
+
+def clean_and_classify_parallel(
+    articles: Sequence[Tuple[str, str, bool]],
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> List[Tuple[Optional[str], Optional[Dict], List[str]]]:
+    """
+    Strip HTML from raw entry content where needed and classify, across processes.
+
+    Args:
+        articles: Sequence of (title, content, is_raw) tuples; content with
+            is_raw set is passed through strip_html before classification
+        workers: Number of processes (None or 0 for one per core)
+        chunk_size: Articles sent to a worker per task
+
+    Returns:
+        List with one (cleaned content, result, matched keywords) tuple per
+        article, in input order. Cleaned content is None unless is_raw was set.
+    """
+    workers = resolve_workers(workers)
+    if workers == 1 or len(articles) < MIN_PARALLEL_ARTICLES:
+        compact = _process_chunk(list(articles))
+    else:
+        chunks = [
+            list(articles[i : i + chunk_size])
+            for i in range(0, len(articles), chunk_size)
+        ]
+        compact = []
+        for chunk_results in _get_pool(workers).map(_process_chunk, chunks):
+            compact.extend(chunk_results)
+
+    return [(text, *_expand(scores, keywords)) for text, scores, keywords in compact]
+
+
+def classify_parallel(
+    articles: Sequence[Tuple[str, str]],
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> List[Tuple[Optional[Dict], List[str]]]:
+    """
+    Classify many articles across processes.
+
+    Args:
+        articles: Sequence of (title, content) pairs
+        workers: Number of processes (None or 0 for one per core)
+        chunk_size: Articles sent to a worker per task
+
+    Returns:
+        Same as relevance_batch.classify_and_match: one (result, matched
+        keywords) tuple per article, in input order
+    """
+    outcomes = clean_and_classify_parallel(
+        [(title, content, False) for title, content in articles], workers, chunk_size
+    )
+    return [(result, keywords) for _, result, keywords in outcomes]
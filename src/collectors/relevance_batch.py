@@ -0,0 +1,297 @@
+"""Batched, vectorized version of relevance_filter.calculate_relevance.
+
+Reclassifying the whole archive one article at a time scans every article
+once per keyword. This module instead works on a chunk of articles at once:
+
+1. Each text is lower-cased and padded exactly like calculate_relevance,
+   UTF-8 encoded and joined with NUL separators into one uint8 array. No
+   keyword contains a NUL byte, so no match can span two articles.
+2. A code for the leading bytes (up to three) is computed at every position
+   and looked up in a table of keyword prefixes. Only positions that start
+   like some keyword survive, and each keyword's remaining bytes are
+   compared at those positions with array operations.
+3. The matches form a sparse article × keyword hit matrix (COO row/column
+   arrays), from which per-category match counts, percentages, the best
+   category, the threshold mask and confidence/relevancy are computed.
+   Tags come from the same hits (relevance_filter.rank_tags).
+
+UTF-8 matching is exact: a valid UTF-8 pattern can only match at character
+boundaries, so the results are identical to calling calculate_relevance on
+each pair.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.collectors import relevance_filter
+
+# Articles per chunk; bounds the size of the byte and code arrays
+DEFAULT_BATCH_SIZE = 10_000
+
+# Never part of a keyword, so no match can span two articles
+_SEPARATOR = b"\x00"
+
+# Number of leading bytes used for the prefix table (256**3 entries)
+_MAX_PREFIX_WIDTH = 3
+
+
+class _KeywordIndex:
+    """Byte patterns and prefix lookup table for a set of keywords."""
+
+    def __init__(self, keywords: List[str]):
+        self.patterns = [keyword.encode("utf-8") for keyword in keywords]
+        self.width = min(_MAX_PREFIX_WIDTH, *(len(p) for p in self.patterns))
+        self.prefixes = np.array(
+            [int.from_bytes(p[: self.width], "big") for p in self.patterns],
+            dtype=np.int64,
+        )
+        self.table = np.zeros(1 << (8 * self.width), dtype=bool)
+        self.table[self.prefixes] = True
+
+    def hits(self, texts: List[str]):
+        """
+        Find which keywords occur in which texts.
+
+        Args:
+            texts: Prepared (lower-cased, padded) texts
+
+        Returns:
+            Tuple of (row, column) int arrays, one entry per (text, keyword) hit
+        """
+        encoded = [text.encode("utf-8", "surrogatepass") for text in texts]
+        data = np.frombuffer(_SEPARATOR.join(encoded), dtype=np.uint8)
+        # Offset just past each text's separator, for mapping hits back to rows
+        ends = np.cumsum([len(e) + 1 for e in encoded])
+
+        count = len(data) - self.width + 1
+        if count <= 0:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty
+
+        # Code of the leading bytes at every position
+        codes = data[:count].astype(np.int32)
+        for offset in range(1, self.width):
+            codes = (codes << 8) | data[offset : offset + count]
+
+        # Keep positions that start like some keyword, grouped by prefix
+        candidates = np.flatnonzero(self.table[codes])
+        candidate_codes = codes[candidates]
+        order = np.argsort(candidate_codes, kind="stable")
+        candidates = candidates[order]
+        candidate_codes = candidate_codes[order]
+        starts = np.searchsorted(candidate_codes, self.prefixes)
+        stops = np.searchsorted(candidate_codes, self.prefixes, side="right")
+
+        found_rows, found_cols = [], []
+        for column, pattern in enumerate(self.patterns):
+            positions = candidates[starts[column] : stops[column]]
+            positions = positions[positions + len(pattern) <= len(data)]
+            for offset in range(self.width, len(pattern)):
+                if not len(positions):
+                    break
+                positions = positions[data[positions + offset] == pattern[offset]]
+            if not len(positions):
+                continue
+
+            rows = np.unique(np.searchsorted(ends, positions, side="right"))
+            found_rows.append(rows)
+            found_cols.append(np.full(len(rows), column, dtype=np.int64))
+
+        if not found_rows:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty
+        return np.concatenate(found_rows), np.concatenate(found_cols)
+
+
+def _keyword_weights(category_keywords: Dict[str, List[str]], keywords: List[str]):
+    """
+    Build the keyword × category weight matrix.
+
+    A keyword listed twice in a category (e.g. "energy consumption" in
+    Green AI) counts twice there, just as in the scalar loop.
+
+    Returns:
+        Tuple of (weight matrix, keywords per category)
+    """
+    position = {keyword: i for i, keyword in enumerate(keywords)}
+    weights = np.zeros((len(keywords), len(category_keywords)), dtype=np.int64)
+    for column, category_list in enumerate(category_keywords.values()):
+        for keyword in category_list:
+            weights[position[keyword], column] += 1
+
+    lengths = np.array([len(kws) for kws in category_keywords.values()], dtype=np.int64)
+    return weights, lengths
+
+
+def _classify_chunk(
+    texts: List[str],
+    categories: List[str],
+    index: _KeywordIndex,
+    is_global: np.ndarray,
+    weights: np.ndarray,
+    lengths: np.ndarray,
+    keywords: List[str],
+    with_keywords: bool = False,
+) -> List[Tuple[Optional[Dict], Optional[List[str]]]]:
+    """
+    Classify one chunk of prepared texts.
+
+    If with_keywords is set, also list the keywords each text contains;
+    otherwise the second element of each tuple is None.
+    """
+    n = len(texts)
+    results: List[Optional[Dict]] = [None] * n
+
+    # Sparse article × keyword hit matrix
+    rows, cols = index.hits(texts)
+
+    matched: List[List[str]] = [[] for _ in range(n)]
+    for row, col in zip(rows.tolist(), cols.tolist()):
+        matched[row].append(keywords[col])
+    reported = matched if with_keywords else [None] * n
+
+    # First check: at least one AI-related keyword
+    has_ai = np.bincount(rows[is_global[cols]], minlength=n) > 0
+    if not has_ai.any():
+        return list(zip(results, reported))
+
+    # Sparse hits × weights → per-category match counts
+    matches = np.zeros((n, len(categories)), dtype=np.int64)
+    np.add.at(matches, rows, weights[cols])
+
+    # Same float operations, in the same order, as the scalar function
+    scores = (matches / lengths) * 100
+    best = scores.argmax(axis=1)  # first maximum, like max() over the dict
+    best_scores = scores[np.arange(n), best]
+    accepted = has_ai & (best_scores >= 5.0)
+    confidence = np.minimum(best_scores / 20, 1.0)
+    relevancy = np.minimum(best_scores * 2, 100)
+
+    for i in np.flatnonzero(accepted):
+        results[i] = {
+            "category": categories[best[i]],
+            "confidence": float(confidence[i]),
+            "relevancy_score": float(relevancy[i]),
+            "tags": relevance_filter.rank_tags(matched[i], categories[best[i]]),
+        }
+    return list(zip(results, reported))
+
+
+def _classify(articles, batch_size: int, with_keywords: bool):
+    """Shared driver for classify_and_match and calculate_relevance_batch."""
+    category_keywords = relevance_filter.CATEGORY_KEYWORDS
+    global_keywords = relevance_filter.GLOBAL_KEYWORDS
+    categories = list(category_keywords)
+
+    keywords = list(
+        dict.fromkeys(
+            list(global_keywords)
+            + [kw for kws in category_keywords.values() for kw in kws]
+        )
+    )
+    index = _KeywordIndex(keywords)
+    is_global = np.array([kw in global_keywords for kw in keywords], dtype=bool)
+    weights, lengths = _keyword_weights(category_keywords, keywords)
+
+    def classify(chunk):
+        return _classify_chunk(
+            chunk,
+            categories,
+            index,
+            is_global,
+            weights,
+            lengths,
+            keywords,
+            with_keywords,
+        )
+
+    results = []
+    chunk: List[str] = []
+
+    for title, content in articles:
+        chunk.append(" " + (title + " " + content).lower() + " ")
+        if len(chunk) >= batch_size:
+            results.extend(classify(chunk))
+            chunk = []
+
+    if chunk:
+        results.extend(classify(chunk))
+    return results
+
+
+def classify_and_match(
+    articles: Iterable[Tuple[str, str]], batch_size: int = DEFAULT_BATCH_SIZE
+) -> List[Tuple[Optional[Dict], List[str]]]:
+    """
+    Classify many articles at once and report which keywords each contains.
+
+    Args:
+        articles: Iterable of (title, content) pairs
+        batch_size: Number of articles searched per chunk
+
+    Returns:
+        List with one (calculate_relevance result, matched keywords) tuple per
+        article, in input order. Matched keywords cover GLOBAL_KEYWORDS and
+        every category.
+    """
+    return _classify(articles, batch_size, with_keywords=True)
+
+
+def calculate_relevance_batch(
+    articles: Iterable[Tuple[str, str]], batch_size: int = DEFAULT_BATCH_SIZE
+) -> List[Optional[Dict]]:
+    """
+    Classify many articles at once.
+
+    Args:
+        articles: Iterable of (title, content) pairs
+        batch_size: Number of articles searched per chunk
+
+    Returns:
+        List with one calculate_relevance result (dict or None) per article,
+        in input order
+    """
+    return [result for result, _ in _classify(articles, batch_size, False)]
+
+
+def contains_any(
+    articles: Iterable[Tuple[str, str]],
+    keywords: List[str],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> List[bool]:
+    """
+    Check which articles contain at least one of the given keywords.
+
+    Matching follows calculate_relevance (lower-cased, space-padded text).
+
+    Args:
+        articles: Iterable of (title, content) pairs
+        keywords: Keywords to look for
+        batch_size: Number of articles searched per chunk
+
+    Returns:
+        List with one bool per article, in input order
+    """
+    if not keywords:
+        return [False for _ in articles]
+
+    index = _KeywordIndex(list(keywords))
+    results: List[bool] = []
+    chunk: List[str] = []
+
+    def scan(chunk):
+        rows, _ = index.hits(chunk)
+        found = np.zeros(len(chunk), dtype=bool)
+        found[rows] = True
+        return found.tolist()
+
+    for title, content in articles:
+        chunk.append(" " + (title + " " + content).lower() + " ")
+        if len(chunk) >= batch_size:
+            results.extend(scan(chunk))
+            chunk = []
+
+    if chunk:
+        results.extend(scan(chunk))
+    return results
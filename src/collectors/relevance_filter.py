@@ -1,6 +1,8 @@
 """Simple keyword-based relevance filtering for articles."""
 
-from typing import Dict, Optional
+import hashlib
+import json
+from typing import Dict, Iterable, List, Optional
 
 # Keywords for each category
 CATEGORY_KEYWORDS = {
@@ -124,6 +126,86 @@ GLOBAL_KEYWORDS = [
 ]
 
 
+# Key used for GLOBAL_KEYWORDS in get_keyword_sets()
+GLOBAL_KEYWORD_GROUP = "__global__"
+
+# Most tags reported per article
+MAX_TAGS = 8
+
+
+def get_keyword_sets() -> Dict[str, List[str]]:
+    """
+    Return every keyword list that influences calculate_relevance.
+
+    Returns:
+        Dict mapping GLOBAL_KEYWORD_GROUP to GLOBAL_KEYWORDS and each category
+        to its keywords, in category order
+    """
+    keyword_sets = {GLOBAL_KEYWORD_GROUP: list(GLOBAL_KEYWORDS)}
+    keyword_sets.update(
+        (category, list(keywords)) for category, keywords in CATEGORY_KEYWORDS.items()
+    )
+    return keyword_sets
+
+
+def keyword_version(keyword_sets: Optional[Dict[str, List[str]]] = None) -> str:
+    """
+    Hash the keyword sets, so stored classifications can tell which sets they came from.
+
+    Category order and keyword order/duplicates are part of the hash since
+    they affect scores and tie-breaking.
+
+    Args:
+        keyword_sets: Keyword sets to hash (default: the current ones)
+
+    Returns:
+        16-character hex digest
+    """
+    if keyword_sets is None:
+        keyword_sets = get_keyword_sets()
+    payload = json.dumps(list(keyword_sets.items()), ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def rank_tags(
+    keywords: Iterable[str], category: Optional[str] = None, limit: int = MAX_TAGS
+) -> List[str]:
+    """
+    Turn the keywords found in an article into ranked tags.
+
+    Only category keywords become tags; the global AI keywords are in every
+    relevant article. Keywords of the article's category come first, then
+    those of the other categories by their share of matched keywords, each
+    in keyword-list order.
+
+    Args:
+        keywords: Keywords found in the article (as matched, unstripped)
+        category: Category the article was classified into, if any
+        limit: Maximum number of tags
+
+    Returns:
+        Stripped, de-duplicated tags, best first
+    """
+    found = set(keywords)
+    shares = {
+        name: sum(1 for keyword in category_keywords if keyword in found)
+        / len(category_keywords)
+        for name, category_keywords in CATEGORY_KEYWORDS.items()
+    }
+    # Stable sort: equal shares keep the category order
+    order = sorted(
+        CATEGORY_KEYWORDS, key=lambda name: (name != category, -shares[name])
+    )
+
+    tags = []
+    for name in order:
+        for keyword in CATEGORY_KEYWORDS[name]:
+            tag = keyword.strip()
+            if keyword in found and tag not in tags:
+                tags.append(tag)
+    return tags[:limit]
+
+
 def calculate_relevance(title: str, content: str) -> Optional[Dict]:
     """
     Calculate relevance of an article based on keywords.
@@ -137,7 +219,8 @@ def calculate_relevance(title: str, content: str) -> Optional[Dict]:
         {
             "category": str,
             "confidence": float,
-            "relevancy_score": float
+            "relevancy_score": float,
+            "tags": List[str]  # see rank_tags
         }
     """
     # Combine title and content, lowercase for matching
@@ -151,11 +234,13 @@ def calculate_relevance(title: str, content: str) -> Optional[Dict]:
 
     # Calculate scores for each category
     category_scores = {}
+    matched = set()
     for category, keywords in CATEGORY_KEYWORDS.items():
         # Count how many keywords match
-        matches = sum(1 for keyword in keywords if keyword in text)
+        found = [keyword for keyword in keywords if keyword in text]
+        matched.update(found)
         # Calculate score as percentage of keywords found
-        score = (matches / len(keywords)) * 100
+        score = (len(found) / len(keywords)) * 100
         category_scores[category] = score
 
     # Find best matching category
@@ -172,6 +257,7 @@ def calculate_relevance(title: str, content: str) -> Optional[Dict]:
         "category": best_category,
         "confidence": min(best_score / 20, 1.0),  # Normalize to 0-1
         "relevancy_score": min(best_score * 2, 100),  # Scale to 0-100
+        "tags": rank_tags(matched, best_category),
     }
 
 
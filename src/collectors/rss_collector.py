@@ -1,24 +1,87 @@
 """RSS feed collector for fetching articles from RSS feeds."""
 
 import feedparser
+from contextlib import nullcontext
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import logging
 import re
+import threading
+import time
+import urllib.request
 from html.parser import HTMLParser
 from html import unescape
 
+from src.collectors.fast_parser import FastParseError, parse_feed
+from src.collectors.stage_timer import StageTimer
+from src.collectors.url_normalizer import clean_url, url_hash
+
 logger = logging.getLogger(__name__)
 
+# Realistic User-Agent to avoid 403 errors from some publishers
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36"
+FETCH_TIMEOUT = 30  # seconds
+DEFAULT_MAX_FEED_BYTES = 5 * 1024 * 1024  # abort downloads larger than this
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+
+class FeedTooLargeError(Exception):
+    """Raised when a feed body exceeds the collector's max_bytes cap."""
+
+    def __init__(self, feed_url: str, size: int, max_bytes: int):
+        super().__init__(
+            f"Feed {feed_url} exceeds {max_bytes:,} bytes (got at least {size:,})"
+        )
+        self.size = size
+        self.max_bytes = max_bytes
+
+
+# Precompiled patterns for strip_html
+_IMG_TAG_RE = re.compile(r"<img[^>]*>", re.IGNORECASE)
+_ANY_TAG_RE = re.compile(r"<[^>]+>")
+_CHARREF_END_RE = re.compile(r"[\s;]")
+
+# Markup tokens for the single-pass tokenizer: <img> tags (dropped as if
+# removed beforehand), end tags, and start tags with plain names and
+# well-formed attributes. Simple tags are tokenized exactly as HTMLParser
+# would, without producing any text. Any other '<' is matched bare.
+_MARKUP_RE = re.compile(
+    r"""
+    <
+    (?:
+        (?P<img>(?i:img)[^>]*>)
+        |
+        (?P<tag>
+            /[a-zA-Z][^>]*>                                # end tag
+            |
+            (?P<name>[a-zA-Z][-.:_a-zA-Z0-9]*)             # start tag name
+            (?:[ \t\n\r\f]+[a-zA-Z_:][-.:_a-zA-Z0-9]*      # attribute name
+               (?:[ \t\n\r\f]*=[ \t\n\r\f]*
+                  (?:"[^"]*"|'[^']*'|[^\s"'=<>`]+))?      # optional value
+            )*
+            [ \t\n\r\f]*/?>
+        )
+    )?
+    """,
+    re.VERBOSE,
+)
+
+# Elements whose content HTMLParser treats as raw text
+_CDATA_ELEMENTS = ("script", "style")
+
+_local = threading.local()
+
 
 class HTMLStripper(HTMLParser):
     """Strip HTML tags from text."""
 
     def __init__(self):
         super().__init__()
-        self.reset()
         self.strict = False
         self.convert_charrefs = True
+
+    def reset(self):
+        super().reset()
         self.text = []
 
     def handle_data(self, data):
@@ -28,10 +91,79 @@ class HTMLStripper(HTMLParser):
         return "".join(self.text).strip()
 
 
+def _get_stripper() -> HTMLStripper:
+    """Return this thread's reusable HTMLStripper, reset for a new document."""
+    stripper = getattr(_local, "stripper", None)
+    if stripper is None:
+        stripper = _local.stripper = HTMLStripper()
+    else:
+        stripper.reset()
+    return stripper
+
+
+def _tokenize_text(html_content: str) -> Optional[List[str]]:
+    """
+    Extract text chunks in a single scan, mirroring HTMLParser.feed().
+
+    <img> tags are dropped as if removed beforehand, and text chunks are
+    unescaped one at a time exactly like HTMLParser's convert_charrefs mode,
+    including its quirks (a trailing '<' or unterminated tag ends the text,
+    as does a trailing unterminated character reference).
+
+    Returns:
+        List of text chunks, or None if the input contains markup outside
+        the simple subset (comments, declarations, script/style, unusual
+        tags) and must go through HTMLParser instead
+    """
+    pieces = []
+    pending = ""  # raw text of the current chunk; <img> removal doesn't split it
+    i = 0
+
+    for match in _MARKUP_RE.finditer(html_content):
+        pending += html_content[i : match.start()]
+        i = match.end()
+
+        kind = match.lastgroup
+        if kind == "img":
+            continue
+
+        if pending:
+            pieces.append(unescape(pending))
+            pending = ""
+
+        if kind is not None:
+            tag = match.group()
+            name = match.group("name")
+            if (name and name.lower() in _CDATA_ELEMENTS) or "<" in tag[1:]:
+                return None
+            continue
+
+        # A '<' that doesn't start a simple tag
+        following = html_content[i : i + 1]
+        if not following:
+            return pieces  # a lone '<' at the end is never emitted
+        if following in "/!?" or (following.isascii() and following.isalpha()):
+            return None
+        if _IMG_TAG_RE.match(html_content, i):
+            return None
+        pieces.append("<")
+
+    pending += html_content[i:]
+    # HTMLParser holds back a final chunk that may end in a cut-off charref
+    amppos = pending.rfind("&", max(0, len(pending) - 34))
+    if amppos < 0 or _CHARREF_END_RE.search(pending, amppos):
+        pieces.append(unescape(pending))
+    return pieces
+
+
 def strip_html(html_content: str) -> str:
     """
     Remove HTML tags and decode HTML entities from content.
 
+    Plain text returns after a single whitespace pass. Typical feed markup
+    is handled by a single-pass tokenizer; anything unusual goes through a
+    reused HTMLParser. All paths produce identical output.
+
     Args:
         html_content: HTML string to clean
 
@@ -41,33 +173,65 @@ def strip_html(html_content: str) -> str:
     if not html_content:
         return ""
 
-    # Remove img tags and their attributes
-    html_content = re.sub(r"<img[^>]*>", "", html_content, flags=re.IGNORECASE)
-
-    # Strip remaining HTML tags
-    stripper = HTMLStripper()
-    try:
-        stripper.feed(html_content)
-        text = stripper.get_data()
-    except Exception:
-        # Fallback: simple regex-based removal
-        text = re.sub(r"<[^>]+>", "", html_content)
+    # Fast path: nothing to strip or decode, only whitespace to collapse
+    if "<" not in html_content and "&" not in html_content:
+        return " ".join(html_content.split())
+
+    pieces = _tokenize_text(html_content)
+    if pieces is not None:
+        text = "".join(pieces).strip()
+    else:
+        # Remove img tags and their attributes
+        html_content = _IMG_TAG_RE.sub("", html_content)
+
+        # Strip remaining HTML tags
+        stripper = _get_stripper()
+        try:
+            stripper.feed(html_content)
+            text = stripper.get_data()
+        except Exception:
+            # Fallback: simple regex-based removal
+            text = _ANY_TAG_RE.sub("", html_content)
 
     # Decode HTML entities (e.g., &amp; -> &)
     text = unescape(text)
 
     # Clean up extra whitespace
-    text = re.sub(r"\s+", " ", text)
-
-    return text.strip()
+    return " ".join(text.split())
 
 
 class RSSCollector:
     """Collects articles from RSS feeds."""
 
-    def __init__(self):
-        """Initialize the RSS collector."""
+    def __init__(
+        self,
+        archive=None,
+        max_bytes: int = DEFAULT_MAX_FEED_BYTES,
+        memo=None,
+        clean_html: bool = True,
+    ):
+        """
+        Initialize the RSS collector.
+
+        Args:
+            archive: Optional FeedArchive that keeps every fetched feed body
+            max_bytes: Largest feed body to download; bigger feeds are aborted
+                mid-stream and reported in feed_stats
+            memo: Optional ClassificationMemo; entries whose text was seen
+                before reuse the cached cleaned content and classification
+            clean_html: Strip HTML while parsing. When False, content is left
+                raw and flagged with "raw_content" so that a later stage (see
+                parallel_classify) can clean it, e.g. only for new articles
+        """
         self.feeds = []
+        self.archive = archive
+        self.memo = memo
+        self.clean_html = clean_html
+        self.max_bytes = max_bytes
+        # Newest entry seen per feed URL during the last fetch: (entry_id, published_date)
+        self.high_water_marks: Dict[str, Tuple[Optional[str], Optional[datetime]]] = {}
+        # Per-feed counters from the last fetch, keyed by source name
+        self.feed_stats: Dict[str, Dict] = {}
 
     def add_feed(self, url: str, source_name: str) -> None:
         """
@@ -80,12 +244,22 @@ class RSSCollector:
         self.feeds.append({"url": url, "source_name": source_name})
         logger.info(f"Added RSS feed: {source_name} ({url})")
 
-    def fetch_articles(self, max_per_feed: int = 10) -> List[Dict]:
+    def fetch_articles(
+        self,
+        max_per_feed: int = 10,
+        high_water_marks: Optional[
+            Dict[str, Tuple[Optional[str], Optional[datetime]]]
+        ] = None,
+    ) -> List[Dict]:
         """
         Fetch articles from all configured RSS feeds.
 
         Args:
             max_per_feed: Maximum number of articles to fetch per feed
+            high_water_marks: Optional mapping of feed URL to the
+                (entry_id, published_date) of the newest entry processed in a
+                previous run. Entries at or past the mark are skipped before
+                any HTML stripping happens.
 
         Returns:
             List of article dictionaries with keys:
@@ -97,26 +271,57 @@ class RSSCollector:
                 - authors: Comma-separated author names
         """
         all_articles = []
+        high_water_marks = high_water_marks or {}
+        self.high_water_marks = {}
+        self.feed_stats = {}
 
         for feed_config in self.feeds:
+            start = time.perf_counter()
             try:
                 articles = self._fetch_feed(
-                    feed_config["url"], feed_config["source_name"], max_per_feed
+                    feed_config["url"],
+                    feed_config["source_name"],
+                    max_per_feed,
+                    high_water_mark=high_water_marks.get(feed_config["url"]),
+                )
+                self.feed_stats[feed_config["source_name"]]["seconds"] = (
+                    time.perf_counter() - start
                 )
                 all_articles.extend(articles)
                 logger.info(
                     f"Fetched {len(articles)} articles from {feed_config['source_name']}"
                 )
+            except FeedTooLargeError as e:
+                logger.warning(
+                    f"Skipping oversized feed {feed_config['source_name']}: {str(e)}"
+                )
+                self.feed_stats[feed_config["source_name"]] = {
+                    "url": feed_config["url"],
+                    "error": str(e),
+                    "oversized": True,
+                    "bytes": e.size,
+                    "seconds": time.perf_counter() - start,
+                }
+                continue
             except Exception as e:
                 logger.error(
                     f"Error fetching feed {feed_config['source_name']}: {str(e)}"
                 )
+                self.feed_stats[feed_config["source_name"]] = {
+                    "url": feed_config["url"],
+                    "error": str(e),
+                    "seconds": time.perf_counter() - start,
+                }
                 continue
 
         return all_articles
 
     def _fetch_feed(
-        self, feed_url: str, source_name: str, max_articles: int
+        self,
+        feed_url: str,
+        source_name: str,
+        max_articles: int,
+        high_water_mark: Optional[Tuple[Optional[str], Optional[datetime]]] = None,
     ) -> List[Dict]:
         """
         Fetch and parse a single RSS feed.
@@ -125,101 +330,317 @@ class RSSCollector:
             feed_url: RSS feed URL
             source_name: Name of the source
             max_articles: Maximum number of articles to fetch
+            high_water_mark: (entry_id, published_date) of the newest entry
+                processed in a previous run, if any
 
         Returns:
             List of parsed articles
         """
-        # Parse the feed with a realistic User-Agent to avoid 403 errors
-        feed = feedparser.parse(
+        timer = StageTimer()
+        with timer.stage("network"):
+            body, headers = self._download(feed_url)
+
+        if self.archive is not None:
+            try:
+                self.archive.store(
+                    feed_url, source_name, body, headers.get("content-type")
+                )
+            except Exception as e:
+                logger.warning(f"Could not archive feed {source_name}: {e}")
+
+        return self.process_feed_body(
+            body,
             feed_url,
-            agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
+            source_name,
+            max_articles,
+            high_water_mark=high_water_mark,
+            headers=headers,
+            timer=timer,
         )
 
+    def process_feed_body(
+        self,
+        body: bytes,
+        feed_url: str,
+        source_name: str,
+        max_articles: Optional[int] = None,
+        high_water_mark: Optional[Tuple[Optional[str], Optional[datetime]]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timer: Optional[StageTimer] = None,
+    ) -> List[Dict]:
+        """
+        Parse an already-downloaded feed body into articles.
+
+        Used for live fetches and for replaying archived payloads. Feeds list
+        their newest entries first, so processing stops at the first entry
+        that matches the high-water mark's ID or is older than its date.
+
+        Args:
+            body: Raw feed body
+            feed_url: URL the body was fetched from
+            source_name: Name of the source
+            max_articles: Maximum number of articles to parse (None for all)
+            high_water_mark: (entry_id, published_date) of the newest entry
+                processed in a previous run, if any
+            headers: Response headers, if known
+            timer: This feed's StageTimer (a new one if not given); receives
+                the "parse" and "strip_html" stages, and ends up in
+                feed_stats as "timings"
+
+        Returns:
+            List of parsed articles
+        """
+        timer = timer or StageTimer()
+        articles = []
+        mark_id, mark_date = high_water_mark or (None, None)
+        newest_id, newest_date = None, None
+        processed = 0
+
+        with timer.stage("parse"):
+            entries, parser = self.parse_entries(
+                body, feed_url, source_name, headers=headers, limit=max_articles
+            )
+
+            # Entries not handled by a previous run
+            pending = []
+            for entry in entries:
+                entry_id = self._entry_id(entry)
+                entry_date = self._entry_date(entry)
+
+                # Stop once we reach entries already handled by a previous run
+                if mark_id and entry_id == mark_id:
+                    break
+                if mark_date and entry_date and entry_date < mark_date:
+                    break
+
+                if newest_id is None:
+                    newest_id = entry_id
+                if entry_date and (newest_date is None or entry_date > newest_date):
+                    newest_date = entry_date
+                processed += 1
+                pending.append(entry)
+
+            # One memo query for the whole feed instead of one per entry
+            if self.memo is not None:
+                self.memo.prefetch(self._memo_keys(pending))
+
+            for entry in pending:
+                try:
+                    article = self._parse_entry(entry, source_name, timer)
+                    if article:
+                        articles.append(article)
+                except Exception as e:
+                    logger.error(f"Error parsing entry: {str(e)}")
+                    continue
+        # strip_html ran inside the parse block and is reported on its own
+        timer.add("parse", -timer.wall("strip_html"), -timer.cpu("strip_html"))
+
+        # Only advance the mark when something new was seen
+        if newest_id or newest_date:
+            self.high_water_marks[feed_url] = (
+                newest_id or mark_id,
+                max(filter(None, (newest_date, mark_date)), default=None),
+            )
+
+        self.feed_stats[source_name] = {
+            "url": feed_url,
+            "parser": parser,
+            "bytes": len(body),
+            "entries": len(entries),
+            "processed": processed,
+            "known": len(entries) - processed,
+            "timings": timer.stages,
+        }
+
+        return articles
+
+    def _download(self, feed_url: str) -> Tuple[bytes, Dict[str, str]]:
+        """
+        Download a feed body in chunks, aborting once it exceeds max_bytes.
+
+        The scheduler runs inside the web process, so a runaway "full content"
+        feed must not be buffered in memory before we notice its size.
+
+        Args:
+            feed_url: RSS feed URL
+
+        Returns:
+            Tuple of (raw body, lower-cased response headers)
+
+        Raises:
+            FeedTooLargeError: If the body is larger than max_bytes
+        """
+        request = urllib.request.Request(feed_url, headers={"User-Agent": USER_AGENT})
+        with urllib.request.urlopen(request, timeout=FETCH_TIMEOUT) as response:
+            headers = {key.lower(): value for key, value in response.headers.items()}
+
+            # Reject up front when the server announces the size
+            declared = headers.get("content-length", "")
+            if declared.isdigit() and int(declared) > self.max_bytes:
+                raise FeedTooLargeError(feed_url, int(declared), self.max_bytes)
+
+            chunks = []
+            size = 0
+            while True:
+                chunk = response.read(DOWNLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > self.max_bytes:
+                    raise FeedTooLargeError(feed_url, size, self.max_bytes)
+                chunks.append(chunk)
+
+            return b"".join(chunks), headers
+
+    @staticmethod
+    def parse_entries(
+        body: bytes,
+        feed_url: str,
+        source_name: str,
+        headers: Optional[Dict[str, str]] = None,
+        limit: Optional[int] = None,
+    ) -> Tuple[List, str]:
+        """
+        Parse a raw feed body into entries.
+
+        Well-formed RSS 2.0/Atom/RDF goes through the fast iterparse path;
+        anything else falls back to feedparser.
+
+        Args:
+            body: Raw feed body
+            feed_url: URL the body was fetched from (base for relative links)
+            source_name: Name of the source, for logging
+            headers: Response headers (used by feedparser for encoding detection)
+            limit: Maximum number of entries to return
+
+        Returns:
+            Tuple of (entries, name of the parser that handled the feed)
+        """
+        try:
+            return parse_feed(body, base_url=feed_url, limit=limit), "fast"
+        except FastParseError as e:
+            logger.debug(f"Falling back to feedparser for {source_name}: {e}")
+
+        response_headers = dict(headers or {})
+        response_headers.setdefault("content-location", feed_url)
+        feed = feedparser.parse(body, response_headers=response_headers)
+
         # Check for errors
         if hasattr(feed, "bozo") and feed.bozo:
             logger.warning(
                 f"Feed {source_name} has parsing issues: {feed.get('bozo_exception', 'Unknown error')}"
             )
 
-        articles = []
+        entries = feed.entries if limit is None else feed.entries[:limit]
+        return entries, "feedparser"
+
+    @staticmethod
+    def _entry_id(entry) -> Optional[str]:
+        """Return a stable identifier for a feed entry (GUID, falling back to link)."""
+        entry_id = entry.get("id") or entry.get("link")
+        return entry_id.strip() if entry_id else None
+
+    @staticmethod
+    def _entry_date(entry) -> Optional[datetime]:
+        """Return the entry's published (or updated) date, if it has one."""
+        for key in ("published_parsed", "updated_parsed"):
+            parsed = entry.get(key)
+            if parsed:
+                try:
+                    return datetime(*parsed[:6])
+                except Exception:
+                    continue
+        return None
+
+    @staticmethod
+    def _entry_text(entry) -> Tuple[str, str]:
+        """Return an entry's title and raw (pre strip_html) content."""
+        title = entry.get("title", "").strip()
+        content = ""
+        if hasattr(entry, "summary"):
+            content = entry.summary
+        elif hasattr(entry, "description"):
+            content = entry.description
+        elif hasattr(entry, "content") and len(entry.content) > 0:
+            content = entry.content[0].get("value", "")
+        return title, content
 
-        # Process entries
-        for entry in feed.entries[:max_articles]:
+    def _memo_keys(self, entries) -> List[str]:
+        """Return the memo keys of entries that _parse_entry will look up."""
+        keys = []
+        for entry in entries:
             try:
-                article = self._parse_entry(entry, source_name)
-                if article:
-                    articles.append(article)
-            except Exception as e:
-                logger.error(f"Error parsing entry: {str(e)}")
+                title, content = self._entry_text(entry)
+            except Exception:
                 continue
+            if title:
+                keys.append(self.memo.key(title, content))
+        return keys
 
-        return articles
-
-    def _parse_entry(self, entry, source_name: str) -> Optional[Dict]:
+    def _parse_entry(
+        self, entry, source_name: str, timer: Optional[StageTimer] = None
+    ) -> Optional[Dict]:
         """
         Parse a single feed entry into an article dictionary.
 
         Args:
             entry: feedparser entry object
             source_name: Name of the source
+            timer: Optional StageTimer charged with the strip_html time
 
         Returns:
             Article dictionary or None if parsing fails
         """
-        # Extract title (required)
-        title = entry.get("title", "").strip()
+        # Extract title (required) and content/summary
+        title, content = self._entry_text(entry)
         if not title:
             return None
 
-        # Extract URL (required)
-        url = entry.get("link", "").strip()
+        # Extract URL (required); FeedBurner links are redirects to origLink
+        url = clean_url(entry.get("feedburner_origlink") or entry.get("link", ""))
         if not url:
             return None
 
-        # Extract publication date
-        published_date = None
-        if hasattr(entry, "published_parsed") and entry.published_parsed:
-            try:
-                published_date = datetime(*entry.published_parsed[:6])
-            except Exception:
-                pass
-
-        # If no published date, try updated date
-        if (
-            not published_date
-            and hasattr(entry, "updated_parsed")
-            and entry.updated_parsed
-        ):
-            try:
-                published_date = datetime(*entry.updated_parsed[:6])
-            except Exception:
-                pass
-
-        # Extract content/summary
-        content = ""
-        if hasattr(entry, "summary"):
-            content = entry.summary
-        elif hasattr(entry, "description"):
-            content = entry.description
-        elif hasattr(entry, "content") and len(entry.content) > 0:
-            content = entry.content[0].get("value", "")
+        # Extract publication date (falls back to the updated date)
+        published_date = self._entry_date(entry)
+
+        # Clean HTML from content, unless this exact entry text was seen before
+        content_hash = None
+        cached = None
+        if self.memo is not None:
+            content_hash = self.memo.key(title, content)
+            cached = self.memo.get(content_hash)
+        raw_content = False
+        if cached is not None:
+            content = cached.content
+        elif self.clean_html:
+            with timer.stage("strip_html") if timer else nullcontext():
+                content = strip_html(content)
+        else:
+            raw_content = True
 
-        # Clean HTML from content
-        content = strip_html(content)
         authors = ""
         if hasattr(entry, "authors"):
             authors = ", ".join([author.get("name", "") for author in entry.authors])
         elif hasattr(entry, "author"):
             authors = entry.author
 
-        return {
+        article = {
             "title": title,
             "url": url,
+            "url_hash": url_hash(url),
             "source": source_name,
             "published_date": published_date,
             "content": content,
             "authors": authors or "Unknown",
         }
+        if content_hash is not None:
+            article["content_hash"] = content_hash
+        if cached is not None:
+            article["memo"] = cached
+        if raw_content:
+            article["raw_content"] = True
+        return article
 
 
 # Example usage
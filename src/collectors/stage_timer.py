@@ -0,0 +1,50 @@
+"""Wall-clock and CPU time per pipeline stage.
+
+CPU time is the calling thread's (time.thread_time), so a fetch run started
+by the scheduler inside the web process isn't charged for request handlers
+running at the same time. Work handed to the classification process pool
+only shows up as wall time.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+
+class StageTimer:
+    """Accumulates [wall seconds, CPU seconds] per stage name."""
+
+    def __init__(self):
+        self.stages: Dict[str, List[float]] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Time the block and add it to a stage.
+
+        Usage:
+            with timer.stage("network"):
+                body = download(url)
+        """
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - wall, time.thread_time() - cpu)
+
+    def add(self, name: str, wall: float, cpu: float):
+        """Add measured time to a stage."""
+        totals = self.stages.setdefault(name, [0.0, 0.0])
+        totals[0] += wall
+        totals[1] += cpu
+
+    def merge(self, stages: Dict[str, List[float]]):
+        """Add the stages of another timer, e.g. one per feed into a run total."""
+        for name, (wall, cpu) in stages.items():
+            self.add(name, wall, cpu)
+
+    def wall(self, name: str) -> float:
+        return self.stages.get(name, (0.0, 0.0))[0]
+
+    def cpu(self, name: str) -> float:
+        return self.stages.get(name, (0.0, 0.0))[1]
@@ -0,0 +1,104 @@
+"""Canonical article URLs and the fixed-width hash used for deduplication.
+
+Feeds link to the same article in many spellings: tracking parameters
+(?utm_source=rss), http vs https, a leading www., trailing slashes, #fragments
+and differently ordered query strings. clean_url removes what never belongs
+in a stored link; url_key additionally folds the spellings that point to the
+same page; url_hash is the 32-character hex digest of url_key stored in
+Article.url_hash, whose unique index backs every duplicate check.
+"""
+
+import hashlib
+from typing import List
+from urllib.parse import urlsplit, urlunsplit
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {
+    "fbclid",
+    "gclid",
+    "dclid",
+    "msclkid",
+    "yclid",
+    "igshid",
+    "mc_cid",
+    "mc_eid",
+    "_hsenc",
+    "_hsmi",
+    "mkt_tok",
+}
+TRACKING_PREFIXES = ("utm_",)
+
+DEFAULT_PORTS = {"http": "80", "https": "443"}
+
+
+def _query_params(query: str) -> List[str]:
+    """Split a query string into its raw name=value items, minus tracking ones."""
+    params = []
+    for param in query.split("&"):
+        name = param.split("=", 1)[0].lower()
+        if (
+            param
+            and name not in TRACKING_PARAMS
+            and not name.startswith(TRACKING_PREFIXES)
+        ):
+            params.append(param)
+    return params
+
+
+def clean_url(url: str) -> str:
+    """
+    Remove tracking parameters and the fragment from a URL.
+
+    The result is what gets stored and linked to, so scheme, host and path
+    are kept as the publisher wrote them.
+
+    Args:
+        url: Raw URL from a feed entry
+
+    Returns:
+        Cleaned URL (unchanged if it is not an absolute http(s) URL)
+    """
+    url = url.strip()
+    parts = urlsplit(url)
+    if parts.scheme.lower() not in DEFAULT_PORTS or not parts.netloc:
+        return url
+
+    query = "&".join(_query_params(parts.query))
+    return urlunsplit(
+        (parts.scheme.lower(), parts.netloc.lower(), parts.path, query, "")
+    )
+
+
+def url_key(url: str) -> str:
+    """
+    Canonical form of a URL, equal for spellings of the same page.
+
+    On top of clean_url: https and http are treated alike, a leading www.,
+    default ports and trailing slashes are dropped, and query parameters are
+    sorted. A URL with an invalid port (e.g. http://x.com:abc/) is only
+    cleaned.
+    """
+    cleaned = clean_url(url)
+    parts = urlsplit(cleaned)
+    if not parts.netloc:
+        return cleaned
+
+    try:
+        port = parts.port
+    except ValueError:
+        return cleaned
+
+    host = parts.hostname or ""
+    if host.startswith("www."):
+        host = host[4:]
+    if port and str(port) != DEFAULT_PORTS.get(parts.scheme):
+        host = f"{host}:{port}"
+
+    path = parts.path.rstrip("/") or "/"
+    query = "&".join(sorted(_query_params(parts.query)))
+    return urlunsplit(("https", host, path, query, ""))
+
+
+def url_hash(url: str) -> str:
+    """Return the 32-character hex digest of a URL's canonical form."""
+    return hashlib.blake2b(url_key(url).encode("utf-8"), digest_size=16).hexdigest()
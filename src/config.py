@@ -12,6 +12,23 @@ class Settings(BaseSettings):
     # Default to SQLite for local dev, override with DATABASE_URL env var for production
     database_url: str = os.getenv("DATABASE_URL", "sqlite:///data/greenai.db")
 
+    # Optional read replica (or stand-in copy) serving page requests; the
+    # primary takes over reads while it fails its health check
+    database_read_url: Optional[str] = os.getenv("DATABASE_READ_URL")
+    replica_check_seconds: int = 30
+    replica_connect_timeout: int = 5
+
+    # SQL logging: echo every statement, and log statements slower than
+    # this many milliseconds (0 = off) with their parameters redacted
+    sql_echo: bool = False
+    slow_query_ms: float = 250
+
+    # SQLite connection profile (ignored for PostgreSQL)
+    sqlite_wal: bool = True
+    sqlite_mmap_size: int = 256 * 1024 * 1024
+    sqlite_cache_size_kb: int = 64 * 1024
+    sqlite_busy_timeout_ms: int = 5000
+
     # Application
     secret_key: str = "dev-secret-key-change-in-production"
     debug: bool = True
@@ -21,6 +38,41 @@ class Settings(BaseSettings):
     collection_hour: int = 6
     timezone: str = "UTC"
 
+    # Feed downloads larger than this are aborted and reported as oversized
+    feed_max_bytes: int = 5 * 1024 * 1024
+
+    # Raw feed archive (for reprocessing without refetching)
+    feed_archive_enabled: bool = True
+    feed_archive_dir: str = "data/feed_archive"
+    feed_archive_retention_days: int = 90
+
+    # Memo of cleaned content and classification, keyed by entry text
+    classification_memo_size: int = 10000
+    classification_memo_retention_days: int = 180
+
+    # Processes used to classify large batches (0 = one per core); batches
+    # below parallel_classify.MIN_PARALLEL_ARTICLES always run in process
+    classification_workers: int = 1
+
+    # Articles older than this many days are moved to the cold article_archive
+    # table by each fetch run, leaving slim stubs (0 = keep everything hot)
+    article_hot_days: int = 365
+
+    # For You ranks only this many articles, the best by hot_score (the
+    # Top sort key), so its cost doesn't grow with the whole corpus
+    for_you_candidates: int = 2000
+
+    # Top sort: days of recency worth one order of magnitude of relevancy.
+    # Relevancy adds at most log10(101) ~ 2 to hot_score, so it can lift an
+    # article over ones up to ~2 * this many days newer. Larger values let
+    # strong stories stay on top longer, smaller ones make Top closer to
+    # Newest. Stored scores use the value at write time; the next fetch run
+    # (or init_db.py) recomputes them all when it changes
+    hot_time_scale_days: float = 7.0
+
+    # Fetch-run history with per-stage timings (/admin/fetch-runs)
+    fetch_run_retention_days: int = 180
+
     # Data Sources (optional API keys)
     arxiv_api_key: Optional[str] = None
     serp_api_key: Optional[str] = None
@@ -1,7 +1,18 @@
 """Database models and setup."""
 
+import logging
+import time
+import zlib
+from contextlib import asynccontextmanager
+from typing import Optional
+
 from sqlalchemy import (
     create_engine,
+    event,
+    inspect,
+    text,
+    BigInteger,
+    Boolean,
     Column,
     Integer,
     String,
@@ -9,14 +20,71 @@ from sqlalchemy import (
     DateTime,
     Float,
     ForeignKey,
+    Index,
+    LargeBinary,
+    TypeDecorator,
+    select,
+    update,
 )
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.orm import sessionmaker, relationship, deferred
 from datetime import datetime
 from src.config import settings
+from src.collectors.url_normalizer import url_hash
+from src.services import metrics, query_stats
+
+logger = logging.getLogger(__name__)
+
+# Statement timing and the slow-query log for every engine
+query_stats.install()
 
 Base = declarative_base()
 
+# Characters of content kept in Article.snippet for article cards
+SNIPPET_LENGTH = 200
+
+
+class CompressedText(TypeDecorator):
+    """
+    Text stored zlib-compressed in a binary column.
+
+    Values are compressed on write and decompressed on read, so the
+    attribute behaves like a Text column. Values written before a column
+    became compressed still read back: SQLite keeps them as TEXT, and
+    PostgreSQL converts them to plain UTF-8 bytes (see
+    upgrade_compressed_columns).
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return zlib.compress(value.encode("utf-8"))
+
+    def process_result_value(self, value, dialect):
+        if value is None or isinstance(value, str):
+            return value
+        try:
+            return zlib.decompress(value).decode("utf-8")
+        except zlib.error:
+            return bytes(value).decode("utf-8")
+
+
+def _default_url_hash(context):
+    """Column default: hash of the canonical form of the row's URL."""
+    return url_hash(context.get_current_parameters()["url"])
+
+
+def _default_snippet(context):
+    """Column default: start of the row's content, shown on article cards."""
+    content = context.get_current_parameters().get("content")
+    return content[:SNIPPET_LENGTH] if content else None
+
 
 class Article(Base):
     """Article model for storing news articles and research papers."""
@@ -25,13 +93,52 @@ class Article(Base):
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     title = Column(String, nullable=False)
-    url = Column(String, unique=True, nullable=False)
+    url = Column(String, nullable=False)
+    # Hash of the canonical URL (url_normalizer.url_hash); all duplicate
+    # checks probe this fixed-width unique index instead of url
+    url_hash = Column(String(32), unique=True, index=True, default=_default_url_hash)
     source = Column(String, nullable=False)
     published_date = Column(DateTime)
     fetched_date = Column(DateTime, default=datetime.utcnow)
-    content = Column(Text)
+    # Full text is only needed for classification and duplicate detection:
+    # compressed, and not loaded with the rest of the row (see snippet)
+    content = deferred(Column(CompressedText))
+    snippet = Column(String(SNIPPET_LENGTH), default=_default_snippet)
     summary = Column(Text)
     authors = Column(String)
+    # Hash of keyword version + title + raw feed content, see ClassificationMemo
+    content_hash = Column(String(32), index=True)
+    # Bitset of the relevance keywords found in the article, bit positions
+    # from keyword_vocabulary (see src/services/personalization.py)
+    keyword_vector = Column(LargeBinary)
+    # MinHash signature of title + content (src/services/near_duplicates.py)
+    minhash = Column(LargeBinary)
+    # First article of the near-duplicate group; NULL for the first one itself
+    duplicate_of = Column(Integer, ForeignKey("articles.id"), index=True)
+    # Relevancy/recency ranking key for the Top sort (src/services/hot_ranking.py)
+    hot_score = Column(Float)
+    # Set once content and minhash moved to article_archive (src/services/tiering.py)
+    archived_date = Column(DateTime)
+
+    # Top sort: shown articles (duplicate_of IS NULL) in hot_score DESC
+    # NULLS LAST order. SQLite sorts NULLs last in descending order anyway
+    # and doesn't accept NULLS LAST in an index; PostgreSQL sorts them first
+    # unless the index says otherwise. Partial: archived stubs are not
+    # ranked, so the index only grows with the hot tier.
+    __table_args__ = (
+        Index(
+            "ix_articles_hot_top",
+            "duplicate_of",
+            "hot_score",
+            sqlite_where=archived_date.is_(None),
+        ).ddl_if(dialect="sqlite"),
+        Index(
+            "ix_articles_hot_top_desc",
+            "duplicate_of",
+            hot_score.desc().nullslast(),
+            postgresql_where=archived_date.is_(None),
+        ).ddl_if(dialect="postgresql"),
+    )
 
     # Relationship
     classifications = relationship(
@@ -48,12 +155,15 @@ class Classification(Base):
     __tablename__ = "classifications"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    article_id = Column(Integer, ForeignKey("articles.id"), nullable=False)
+    article_id = Column(Integer, ForeignKey("articles.id"), nullable=False, index=True)
     category = Column(String, nullable=False)
     confidence = Column(Float)
     relevancy_score = Column(Float)
-    tags = Column(String)  # Comma-separated tags
-    classified_date = Column(DateTime, default=datetime.utcnow)
+    tags = Column(String)  # Legacy comma-separated tags; see ArticleTag
+    # Indexed: max() is the cheap change marker of the For You ranking cache
+    classified_date = Column(DateTime, default=datetime.utcnow, index=True)
+    # relevance_filter.keyword_version() of the keyword sets that produced it
+    keyword_version = Column(String(16), index=True)
 
     # Relationship
     article = relationship("Article", back_populates="classifications")
@@ -90,40 +200,804 @@ class UserPreference(Base):
         return f"<UserPreference(topic='{self.topic}', weight={self.weight})>"
 
 
+class FeedState(Base):
+    """Per-feed high-water mark of the newest entry already processed."""
+
+    __tablename__ = "feed_states"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    feed_url = Column(String, unique=True, nullable=False)
+    last_entry_id = Column(String)  # GUID, or link when the feed has no GUIDs
+    last_published = Column(DateTime)
+    updated_date = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<FeedState(feed_url='{self.feed_url}', last_published={self.last_published})>"
+
+
+class KeywordSet(Base):
+    """Snapshot of the relevance keyword sets for one keyword_version."""
+
+    __tablename__ = "keyword_sets"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    version = Column(String(16), unique=True, nullable=False)
+    keywords = Column(Text, nullable=False)  # JSON: group name -> keyword list
+    created_date = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<KeywordSet(version='{self.version}')>"
+
+
+class ArticleKeyword(Base):
+    """Inverted index entry: a relevance keyword found in an article."""
+
+    __tablename__ = "article_keywords"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    article_id = Column(
+        Integer,
+        ForeignKey("articles.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    keyword = Column(String, nullable=False, index=True)
+
+    def __repr__(self):
+        return (
+            f"<ArticleKeyword(article_id={self.article_id}, keyword='{self.keyword}')>"
+        )
+
+
+class Tag(Base):
+    """Normalized tag name, shared by all articles carrying it."""
+
+    __tablename__ = "tags"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String, unique=True, nullable=False)
+
+    def __repr__(self):
+        return f"<Tag(name='{self.name}')>"
+
+
+class ArticleTag(Base):
+    """A tag of an article, with its rank (0 = best) among the article's tags."""
+
+    __tablename__ = "article_tags"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    article_id = Column(
+        Integer,
+        ForeignKey("articles.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    tag_id = Column(Integer, ForeignKey("tags.id"), nullable=False, index=True)
+    rank = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<ArticleTag(article_id={self.article_id}, tag_id={self.tag_id}, rank={self.rank})>"
+
+
+class FacetCount(Base):
+    """Number of archived articles with a facet value, e.g. ("source", "Nature")."""
+
+    __tablename__ = "facet_counts"
+    __table_args__ = (
+        Index("ix_facet_counts_facet_value", "facet", "value", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    facet = Column(String(16), nullable=False)  # source, category, tag or month
+    value = Column(String, nullable=False)
+    count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<FacetCount(facet='{self.facet}', value='{self.value}', count={self.count})>"
+
+
+class ArchivedArticle(Base):
+    """Cold copy of the bulky fields of an article moved out of the hot table."""
+
+    __tablename__ = "article_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    article_id = Column(
+        Integer,
+        ForeignKey("articles.id", ondelete="CASCADE"),
+        nullable=False,
+        unique=True,
+        index=True,
+    )
+    content = Column(CompressedText)
+    minhash = Column(LargeBinary)
+    archived_date = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<ArchivedArticle(article_id={self.article_id})>"
+
+
+class MemoizedClassification(Base):
+    """Persistent memo of the cleaned content and classification of a feed entry."""
+
+    __tablename__ = "classification_memo"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    content_hash = Column(String(32), unique=True, nullable=False)
+    content = Column(CompressedText)  # Entry content after strip_html
+    category = Column(String)  # NULL when the entry was filtered out
+    confidence = Column(Float)
+    relevancy_score = Column(Float)
+    keywords = Column(Text)  # JSON list of matched relevance keywords
+    created_date = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<MemoizedClassification(content_hash='{self.content_hash}', category='{self.category}')>"
+
+
+class KeywordVocabulary(Base):
+    """Stable bit position of a relevance keyword in Article.keyword_vector."""
+
+    __tablename__ = "keyword_vocabulary"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    keyword = Column(String, unique=True, nullable=False)
+    bit = Column(Integer, unique=True, nullable=False)
+
+    def __repr__(self):
+        return f"<KeywordVocabulary(keyword='{self.keyword}', bit={self.bit})>"
+
+
+class ArticleBucket(Base):
+    """LSH bucket of one band of an article's MinHash signature."""
+
+    __tablename__ = "article_buckets"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    article_id = Column(
+        Integer,
+        ForeignKey("articles.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    bucket = Column(BigInteger, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<ArticleBucket(article_id={self.article_id}, bucket={self.bucket})>"
+
+
+class FetchRun(Base):
+    """One run of the fetch pipeline, with wall and CPU time per stage."""
+
+    __tablename__ = "fetch_runs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    started_at = Column(DateTime, nullable=False, index=True)
+    finished_at = Column(DateTime)
+    status = Column(String(16), nullable=False)  # ok or error
+    error = Column(Text)
+    feeds = Column(Integer, default=0)
+    failed_feeds = Column(Integer, default=0)
+    bytes = Column(BigInteger, default=0)
+    entries = Column(Integer, default=0)  # parsed, after the high-water marks
+    known = Column(Integer, default=0)
+    new = Column(Integer, default=0)
+    duplicate = Column(Integer, default=0)
+    filtered = Column(Integer, default=0)
+    near_duplicate = Column(Integer, default=0)
+    wall_seconds = Column(Float)
+    cpu_seconds = Column(Float)
+    # Stages (src/services/fetch_runs.py): network and parse/strip_html are
+    # summed over feeds; store is duplicate checks, inserts and the commit;
+    # archive is feed archive pruning and article tiering
+    network_seconds = Column(Float)
+    network_cpu_seconds = Column(Float)
+    parse_seconds = Column(Float)
+    parse_cpu_seconds = Column(Float)
+    strip_html_seconds = Column(Float)
+    strip_html_cpu_seconds = Column(Float)
+    classification_seconds = Column(Float)
+    classification_cpu_seconds = Column(Float)
+    store_seconds = Column(Float)
+    store_cpu_seconds = Column(Float)
+    archive_seconds = Column(Float)
+    archive_cpu_seconds = Column(Float)
+
+    feed_results = relationship(
+        "FetchRunFeed", back_populates="run", cascade="all, delete-orphan"
+    )
+
+    def __repr__(self):
+        return f"<FetchRun(id={self.id}, started_at={self.started_at}, status='{self.status}')>"
+
+
+class FetchRunFeed(Base):
+    """Per-feed numbers of one fetch run."""
+
+    __tablename__ = "fetch_run_feeds"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    run_id = Column(
+        Integer,
+        ForeignKey("fetch_runs.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    feed = Column(String, nullable=False, index=True)  # source name
+    url = Column(String)
+    parser = Column(String(16))  # fast or feedparser
+    error = Column(Text)
+    oversized = Column(Boolean, default=False)
+    bytes = Column(BigInteger, default=0)
+    entries = Column(Integer, default=0)
+    known = Column(Integer, default=0)
+    new = Column(Integer, default=0)
+    duplicate = Column(Integer, default=0)
+    filtered = Column(Integer, default=0)
+    near_duplicate = Column(Integer, default=0)
+    wall_seconds = Column(Float)  # download, archiving and parsing
+    network_seconds = Column(Float)
+    network_cpu_seconds = Column(Float)
+    parse_seconds = Column(Float)
+    parse_cpu_seconds = Column(Float)
+    strip_html_seconds = Column(Float)
+    strip_html_cpu_seconds = Column(Float)
+
+    run = relationship("FetchRun", back_populates="feed_results")
+
+    def __repr__(self):
+        return f"<FetchRunFeed(run_id={self.run_id}, feed='{self.feed}')>"
+
+
 # Database setup
+_engines = {}
+_session_factories = {}
+
+
+def _is_memory_sqlite(db_url: str) -> bool:
+    return db_url in ("sqlite://", "sqlite:///:memory:")
+
+
+def _sqlite_pragmas(readonly: bool = False):
+    """PRAGMA statements run on every new SQLite connection."""
+    pragmas = [f"busy_timeout = {settings.sqlite_busy_timeout_ms}"]
+    if settings.sqlite_wal:
+        # Readers see the last commit instead of waiting for the writer
+        pragmas += ["journal_mode = WAL", "synchronous = NORMAL"]
+    pragmas += [
+        f"cache_size = -{settings.sqlite_cache_size_kb}",
+        f"mmap_size = {settings.sqlite_mmap_size}",
+        "temp_store = MEMORY",
+    ]
+    if readonly:
+        pragmas.append("query_only = ON")
+    return pragmas
+
+
+def _create_sqlite_engine(db_url: str, readonly: bool = False):
+    """
+    Create a SQLite engine applying the pragma profile on connect.
+
+    The writer engine holds a single connection: SQLite allows one writer
+    at a time anyway, and handing out one connection queues writers in the
+    pool instead of failing them with "database is locked".
+    """
+    options = {}
+    if not readonly and not _is_memory_sqlite(db_url):
+        options = {"pool_size": 1, "max_overflow": 0}
+    engine = create_engine(
+        db_url,
+        connect_args={"check_same_thread": False},
+        pool_pre_ping=True,
+        echo=settings.sql_echo,
+        **options,
+    )
+    _apply_sqlite_pragmas(engine, readonly)
+    return engine
+
+
+def _apply_sqlite_pragmas(engine, readonly: bool = False):
+    """Run the pragma profile on each new connection of a (sync) engine."""
+    pragmas = _sqlite_pragmas(readonly)
+
+    @event.listens_for(engine, "connect")
+    def apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(f"PRAGMA {pragma}")
+        finally:
+            cursor.close()
+
+
+def _create_postgres_engine(db_url: str, **options):
+    """Create a PostgreSQL engine with the production pool settings."""
+    return create_engine(
+        db_url,
+        pool_size=10,  # Connection pool size
+        max_overflow=20,  # Max connections beyond pool_size
+        pool_pre_ping=True,  # Verify connections before using
+        pool_recycle=3600,  # Recycle connections after 1 hour
+        echo=settings.sql_echo,  # SQL_ECHO=true logs every statement
+        **options,
+    )
+
+
 def get_engine():
-    """Create and return database engine with appropriate settings for SQLite or PostgreSQL."""
+    """
+    Return the (cached) read-write engine of the configured database.
+
+    SQLite connections get the pragma profile from settings (WAL, mmap,
+    cache size, busy timeout); see get_read_engine for request reads.
+    """
     db_url = settings.database_url
+    if db_url not in _engines:
+        # SQLite-specific configuration
+        if db_url.startswith("sqlite"):
+            _engines[db_url] = _create_sqlite_engine(db_url)
 
-    # SQLite-specific configuration
-    if db_url.startswith("sqlite"):
-        return create_engine(
-            db_url, connect_args={"check_same_thread": False}, pool_pre_ping=True
-        )
+        # PostgreSQL-specific configuration
+        else:
+            _engines[db_url] = _create_postgres_engine(db_url)
+    return _engines[db_url]
+
+
+# Replica health, re-checked at most every settings.replica_check_seconds
+_replica_state = {"healthy": True, "checked": None}
 
-    # PostgreSQL-specific configuration
-    else:
-        return create_engine(
-            db_url,
-            pool_size=10,  # Connection pool size
-            max_overflow=20,  # Max connections beyond pool_size
-            pool_pre_ping=True,  # Verify connections before using
-            pool_recycle=3600,  # Recycle connections after 1 hour
-            echo=False,  # Set to True for SQL query logging
+
+def _mark_replica(healthy: bool):
+    """Record the replica's health, logging changes."""
+    if healthy != _replica_state["healthy"]:
+        if healthy:
+            logger.info("✓ Read replica is back, routing reads to it")
+        else:
+            logger.warning("⚠️ Read replica unavailable, reading from the primary")
+    _replica_state["healthy"] = healthy
+    _replica_state["checked"] = time.monotonic()
+
+
+def ping(engine) -> bool:
+    """Whether a database answers a trivial query."""
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        return True
+    except SQLAlchemyError:
+        return False
+
+
+def _get_replica_engine():
+    """Return the (cached) engine of DATABASE_READ_URL."""
+    db_url = settings.database_read_url
+    key = ("read", db_url)
+    if key not in _engines:
+        if db_url.startswith("sqlite"):
+            engine = _create_sqlite_engine(db_url, readonly=True)
+        else:
+            engine = _create_postgres_engine(
+                db_url,
+                connect_args={"connect_timeout": settings.replica_connect_timeout},
+            )
+
+        _watch_replica(engine)
+        _engines[key] = engine
+    return _engines[key]
+
+
+def _watch_replica(engine):
+    """Take the replica out of rotation as soon as a connection to it drops."""
+
+    @event.listens_for(engine, "handle_error")
+    def on_error(context):
+        if context.is_disconnect:
+            _mark_replica(False)
+
+
+def _replica_check_due(force: bool = False) -> bool:
+    checked = _replica_state["checked"]
+    return (
+        force
+        or checked is None
+        or time.monotonic() - checked >= settings.replica_check_seconds
+    )
+
+
+def replica_status(force: bool = False) -> Optional[bool]:
+    """
+    Health of the read replica.
+
+    Args:
+        force: Ping it now instead of using a recent result
+
+    Returns:
+        True/False, or None when no DATABASE_READ_URL is configured
+    """
+    if not settings.database_read_url:
+        return None
+    if _replica_check_due(force):
+        _mark_replica(ping(_get_replica_engine()))
+    return _replica_state["healthy"]
+
+
+def get_read_engine():
+    """
+    Return the (cached) engine for read-only work such as page requests.
+
+    With DATABASE_READ_URL set this is the replica (or any stand-in copy
+    of the database), as long as its periodic health check passes; reads
+    fall back to the primary while it is down. Otherwise, on SQLite it is
+    a separate pool of query_only connections, so with WAL readers never
+    queue behind the writer connection (e.g. a running fetch job), and
+    elsewhere the read-write engine.
+    """
+    if settings.database_read_url:
+        if replica_status():
+            return _get_replica_engine()
+        return get_engine()
+
+    db_url = settings.database_url
+    if not db_url.startswith("sqlite") or _is_memory_sqlite(db_url):
+        return get_engine()
+    key = ("read", db_url)
+    if key not in _engines:
+        _engines[key] = _create_sqlite_engine(db_url, readonly=True)
+    return _engines[key]
+
+
+def _session_factory(engine):
+    if engine not in _session_factories:
+        _session_factories[engine] = sessionmaker(
+            autocommit=False, autoflush=False, bind=engine
         )
+    return _session_factories[engine]
 
 
 def get_session():
     """Create and return database session."""
-    engine = get_engine()
+    return _session_factory(get_engine())()
+
+
+def get_read_session():
+    """Create and return a session for reads only (see get_read_engine)."""
+    return _session_factory(get_read_engine())()
+
+
+# Async access for route handlers: same databases and routing as the sync
+# engines above, through aiosqlite/asyncpg. Queries are shared with the
+# sync path by running them on AsyncSession.run_sync (src/services/pages.py).
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+
+def async_url(db_url: str):
+    """Database URL with the async driver of its backend."""
+    url = make_url(db_url)
+    drivername = ASYNC_DRIVERS.get(url.get_backend_name())
+    if drivername is None or url.get_driver_name() in ("aiosqlite", "asyncpg"):
+        return url
+    return url.set(drivername=drivername)
+
+
+def _get_async_engine(db_url: str, replica: bool = False):
+    """Return the (cached) async engine of a database, for reads."""
+    key = ("async", db_url)
+    if key not in _engines:
+        if db_url.startswith("sqlite"):
+            engine = create_async_engine(
+                async_url(db_url),
+                connect_args={"check_same_thread": False},
+                pool_pre_ping=True,
+                echo=settings.sql_echo,
+            )
+            _apply_sqlite_pragmas(
+                engine.sync_engine, readonly=not _is_memory_sqlite(db_url)
+            )
+        else:
+            engine = create_async_engine(
+                async_url(db_url),
+                pool_size=10,
+                max_overflow=20,
+                pool_pre_ping=True,
+                pool_recycle=3600,
+                echo=settings.sql_echo,
+                **(
+                    {"connect_args": {"timeout": settings.replica_connect_timeout}}
+                    if replica
+                    else {}
+                ),
+            )
+        if replica:
+            _watch_replica(engine.sync_engine)
+        _engines[key] = engine
+    return _engines[key]
+
+
+async def async_ping(engine) -> bool:
+    """Whether a database answers a trivial query, without blocking the loop."""
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        return True
+    except (SQLAlchemyError, OSError):
+        return False
+
+
+async def async_primary_status() -> bool:
+    """Whether the primary database answers, pinged through the async engine."""
+    return await async_ping(_get_async_engine(settings.database_url))
+
+
+async def async_replica_status(force: bool = False) -> Optional[bool]:
+    """replica_status for async callers (pings through the async engine)."""
+    if not settings.database_read_url:
+        return None
+    if _replica_check_due(force):
+        _mark_replica(
+            await async_ping(_get_async_engine(settings.database_read_url, True))
+        )
+    return _replica_state["healthy"]
+
+
+async def get_async_read_engine():
+    """Async counterpart of get_read_engine: the replica while healthy, else the primary."""
+    if await async_replica_status():
+        return _get_async_engine(settings.database_read_url, replica=True)
+    return _get_async_engine(settings.database_url)
+
+
+@asynccontextmanager
+async def async_read_session():
+    """
+    Open an AsyncSession for reads (see get_async_read_engine).
+
+    Usage:
+        async with async_read_session() as session:
+            page = await session.run_sync(digest_page, category=category)
+    """
+    engine = await get_async_read_engine()
+    if engine not in _session_factories:
+        _session_factories[engine] = async_sessionmaker(
+            engine, autoflush=False, expire_on_commit=False
+        )
+    async with _session_factories[engine]() as session:
+        yield session
+
+
+def _engine_label(key) -> str:
+    """Metrics label of an _engines key: primary, read, replica or async-*."""
+    if isinstance(key, str):
+        return "primary"
+    kind, db_url = key
+    role = "primary" if db_url == settings.database_url else "replica"
+    if kind == "read":
+        return "read" if role == "primary" else "replica"
+    return f"{kind}-{role}"
+
+
+@metrics.on_collect
+def _update_pool_metrics():
+    for key, engine in list(_engines.items()):
+        pool = getattr(engine, "sync_engine", engine).pool
+        # SQLite :memory: and NullPool-style pools don't report sizes
+        if not hasattr(pool, "checkedout"):
+            continue
+        label = _engine_label(key)
+        metrics.DB_POOL.set(pool.size(), engine=label, state="size")
+        metrics.DB_POOL.set(pool.checkedin(), engine=label, state="checked_in")
+        metrics.DB_POOL.set(pool.checkedout(), engine=label, state="checked_out")
+        metrics.DB_POOL.set(max(pool.overflow(), 0), engine=label, state="overflow")
+
+
+def add_missing_columns(engine):
+    """
+    Add model columns that are missing from existing tables.
+
+    create_all only creates missing tables, so databases created before a
+    column was added to a model need an ALTER TABLE. New columns are added
+    as nullable without a default.
+
+    Args:
+        engine: Engine of the database to upgrade
+
+    Returns:
+        List of "table.column" names that were added
+    """
+    added = []
+
+    # Inspect through the same connection: the SQLite writer pool has one
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        existing_tables = set(inspector.get_table_names())
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(
+                    text(
+                        f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"
+                    )
+                )
+                added.append(f"{table.name}.{column.name}")
+
+    # Replaced by the partial ix_articles_hot_top(_desc)
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX IF EXISTS ix_articles_top"))
+        conn.execute(text("DROP INDEX IF EXISTS ix_articles_top_desc"))
+
+    # Indexes on new columns (create_all skips tables that already exist)
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+    return added
+
+
+def backfill_url_hashes(engine, batch_size: int = 1000):
+    """
+    Fill Article.url_hash for rows stored before the column existed.
+
+    Rows whose canonical URL was already taken are the same article under
+    another URL spelling: they keep a NULL url_hash and are grouped under
+    the first one through duplicate_of, so the digest shows them once.
+
+    Args:
+        engine: Engine of the database to upgrade
+        batch_size: Rows updated per transaction
+
+    Returns:
+        Tuple of (rows hashed, rows marked as duplicates)
+    """
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    session = SessionLocal()
+    hashed = duplicates = 0
+    try:
+        rows = session.query(Article.id, Article.url).filter(
+            Article.url_hash.is_(None), Article.duplicate_of.is_(None)
+        )
+        pending = rows.order_by(Article.id).all()
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start : start + batch_size]
+            hashes = {article_id: url_hash(url) for article_id, url in batch}
+            taken = dict(
+                session.query(Article.url_hash, Article.id).filter(
+                    Article.url_hash.in_(set(hashes.values()))
+                )
+            )
+            for article_id, value in hashes.items():
+                if value in taken:
+                    session.query(Article).filter_by(id=article_id).update(
+                        {"duplicate_of": taken[value]}
+                    )
+                    duplicates += 1
+                else:
+                    session.query(Article).filter_by(id=article_id).update(
+                        {"url_hash": value}
+                    )
+                    taken[value] = article_id
+                    hashed += 1
+            session.commit()
+    finally:
+        session.close()
+    return hashed, duplicates
+
+
+def upgrade_compressed_columns(engine):
+    """
+    Turn PostgreSQL text columns that became CompressedText into bytea.
+
+    Existing values are converted to plain UTF-8 bytes, which
+    CompressedText reads back as is; backfill_snippets compresses the
+    article content. SQLite stores bytes in TEXT columns, so it needs no
+    change.
+
+    Args:
+        engine: Engine of the database to upgrade
+
+    Returns:
+        List of "table.column" names that were converted
+    """
+    if engine.dialect.name != "postgresql":
+        return []
+    converted = []
+
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        existing_tables = set(inspector.get_table_names())
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            types = {
+                column["name"]: column["type"]
+                for column in inspector.get_columns(table.name)
+            }
+            for column in table.columns:
+                if not isinstance(column.type, CompressedText):
+                    continue
+                if column.name not in types or isinstance(
+                    types[column.name], LargeBinary
+                ):
+                    continue
+                conn.execute(
+                    text(
+                        f"ALTER TABLE {table.name} ALTER COLUMN {column.name} "
+                        f"TYPE bytea USING convert_to({column.name}, 'UTF8')"
+                    )
+                )
+                converted.append(f"{table.name}.{column.name}")
+
+    return converted
+
+
+def backfill_snippets(engine, batch_size: int = 1000):
+    """
+    Fill Article.snippet for rows stored before the column existed.
+
+    The content of those rows is written back too, which stores it
+    compressed. The database file only shrinks after a VACUUM.
+
+    Args:
+        engine: Engine of the database to upgrade
+        batch_size: Rows updated per transaction
+
+    Returns:
+        Number of rows updated
+    """
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    return SessionLocal()
+    session = SessionLocal()
+    count = 0
+    try:
+        pending = list(
+            session.execute(
+                select(Article.id)
+                .where(Article.snippet.is_(None), Article.content.isnot(None))
+                .order_by(Article.id)
+            ).scalars()
+        )
+        for start in range(0, len(pending), batch_size):
+            rows = session.execute(
+                select(Article.id, Article.content).where(
+                    Article.id.in_(pending[start : start + batch_size])
+                )
+            ).all()
+            session.execute(
+                update(Article),
+                [
+                    {
+                        "id": article_id,
+                        "content": content,
+                        "snippet": content[:SNIPPET_LENGTH],
+                    }
+                    for article_id, content in rows
+                ],
+            )
+            session.commit()
+            count += len(rows)
+    finally:
+        session.close()
+    return count
 
 
 def init_db():
     """Initialize database tables."""
     engine = get_engine()
     Base.metadata.create_all(bind=engine)
+    for column in add_missing_columns(engine):
+        print(f"Added missing column {column}")
+    for column in upgrade_compressed_columns(engine):
+        print(f"Converted {column} to compressed storage")
+    hashed, duplicates = backfill_url_hashes(engine)
+    if hashed or duplicates:
+        print(
+            f"Hashed {hashed} article URLs ({duplicates} duplicate URL spellings grouped)"
+        )
+    snippets = backfill_snippets(engine)
+    if snippets:
+        print(f"Compressed the content of {snippets} articles")
     print("Database initialized successfully!")
 
 
@@ -0,0 +1,235 @@
+"""Streaming bulk copy helpers shared by the migration and snapshot scripts.
+
+Rows are read in keyset order (WHERE id > last ORDER BY id LIMIT n), so
+memory use is bounded by one chunk and a copy can resume after the last ID
+it committed. PostgreSQL targets reached through psycopg2 are loaded with
+COPY; other drivers and databases get multi-row INSERTs. IDs are preserved
+either way, so foreign keys need no remapping, and PostgreSQL sequences are
+moved past the copied IDs afterwards.
+"""
+
+import io
+import logging
+import time
+from datetime import date, datetime
+from typing import Dict, Iterator, List, Optional
+
+from sqlalchemy import Table, TypeDecorator, func, inspect, insert, select, text
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 5000
+
+# NULL marker in COPY ... (FORMAT csv); quoted values never match it
+_COPY_NULL = r"\N"
+
+
+def is_postgres(bind) -> bool:
+    """Whether an engine or connection talks to PostgreSQL."""
+    return bind.dialect.name == "postgresql"
+
+
+def supports_copy(bind) -> bool:
+    """Whether bulk_insert can use COPY (psycopg2's copy_expert) on a bind."""
+    return is_postgres(bind) and bind.dialect.driver == "psycopg2"
+
+
+def existing_columns(bind, table: Table) -> List[str]:
+    """
+    Return the model columns of a table that exist in a database.
+
+    Databases created by older versions lack newer columns; those are left
+    out of the copy and end up NULL in the target.
+
+    Args:
+        bind: Engine or connection of the database to inspect
+        table: Model table
+
+    Returns:
+        Column names in model order (empty if the table does not exist)
+    """
+    inspector = inspect(bind)
+    if not inspector.has_table(table.name):
+        return []
+    present = {column["name"] for column in inspector.get_columns(table.name)}
+    return [column.name for column in table.columns if column.name in present]
+
+
+def max_id(conn, table: Table) -> int:
+    """Largest ID in a table (0 when empty)."""
+    return conn.execute(select(func.coalesce(func.max(table.c.id), 0))).scalar()
+
+
+def stream_rows(
+    conn,
+    table: Table,
+    columns: List[str],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    after_id: int = 0,
+) -> Iterator[List[Dict]]:
+    """
+    Read a table in ID order, one chunk at a time.
+
+    Args:
+        conn: Source connection
+        table: Model table
+        columns: Columns to read (see existing_columns); must include id
+        chunk_size: Rows per chunk
+        after_id: Only read rows with a larger ID (for resuming)
+
+    Yields:
+        Lists of row dicts, in ascending ID order
+    """
+    selected = [table.c[name] for name in columns]
+    while True:
+        rows = conn.execute(
+            select(*selected)
+            .where(table.c.id > after_id)
+            .order_by(table.c.id)
+            .limit(chunk_size)
+        ).all()
+        if not rows:
+            return
+        yield [dict(row._mapping) for row in rows]
+        after_id = rows[-1].id
+
+
+def _copy_value(value) -> str:
+    """Format one value for COPY ... (FORMAT csv, NULL '\\N')."""
+    if value is None:
+        return _COPY_NULL
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        value = "\\x" + bytes(value).hex()
+    elif isinstance(value, (datetime, date)):
+        value = value.isoformat()
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def copy_buffer(rows: List[Dict], columns: List[str]) -> io.StringIO:
+    """Render rows as a CSV buffer for PostgreSQL COPY."""
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write(",".join(_copy_value(row[name]) for name in columns))
+        buffer.write("\n")
+    buffer.seek(0)
+    return buffer
+
+
+def bulk_insert(conn, table: Table, rows: List[Dict]):
+    """
+    Insert rows, IDs included, as fast as the target allows.
+
+    Uses COPY on psycopg2 connections and multi-row INSERTs everywhere else,
+    e.g. postgresql+psycopg URLs or SQLite.
+
+    Args:
+        conn: Target connection (the caller commits)
+        table: Model table
+        rows: Row dicts with the same keys
+    """
+    if not rows:
+        return
+    columns = list(rows[0])
+    if supports_copy(conn):
+        # COPY bypasses SQLAlchemy, so apply custom column types by hand
+        # (e.g. CompressedText compresses here)
+        decorated = [
+            (name, table.c[name].type)
+            for name in columns
+            if isinstance(table.c[name].type, TypeDecorator)
+        ]
+        if decorated:
+            rows = [
+                {
+                    **row,
+                    **{
+                        name: column_type.process_bind_param(row[name], conn.dialect)
+                        for name, column_type in decorated
+                    },
+                }
+                for row in rows
+            ]
+        column_list = ", ".join(f'"{name}"' for name in columns)
+        cursor = conn.connection.cursor()
+        try:
+            cursor.copy_expert(
+                f'COPY "{table.name}" ({column_list}) FROM STDIN '
+                f"WITH (FORMAT csv, NULL '{_COPY_NULL}')",
+                copy_buffer(rows, columns),
+            )
+        finally:
+            cursor.close()
+    else:
+        conn.execute(insert(table), rows)
+
+
+def reset_sequence(conn, table: Table):
+    """Move a PostgreSQL ID sequence past the copied IDs (no-op elsewhere)."""
+    if not is_postgres(conn):
+        return
+    conn.execute(
+        text(
+            f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+            f'COALESCE((SELECT MAX(id) FROM "{table.name}"), 0) + 1, false)'
+        )
+    )
+
+
+def drop_indexes(engine, tables: List[Table]):
+    """Drop the secondary indexes of tables before a bulk load."""
+    for table in tables:
+        for index in table.indexes:
+            index.drop(bind=engine, checkfirst=True)
+
+
+def create_indexes(engine, tables: List[Table]):
+    """(Re)create the secondary indexes of tables after a bulk load."""
+    for table in tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+
+class Throughput:
+    """Rows/sec bookkeeping for progress lines."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.rows = 0
+
+    def add(self, count: int):
+        self.rows += count
+
+    @property
+    def elapsed(self) -> float:
+        return max(time.perf_counter() - self.start, 1e-9)
+
+    @property
+    def rate(self) -> float:
+        return self.rows / self.elapsed
+
+    def __str__(self):
+        return f"{self.rows:,} rows in {self.elapsed:.1f}s ({self.rate:,.0f} rows/s)"
+
+
+def table_order(metadata, names: Optional[List[str]] = None) -> List[Table]:
+    """
+    Tables in foreign-key dependency order, optionally limited to some names.
+
+    Args:
+        metadata: MetaData holding the models
+        names: Table names to keep (default: all)
+
+    Returns:
+        List of tables, parents before children
+    """
+    tables = list(metadata.sorted_tables)
+    if names is not None:
+        unknown = set(names) - {table.name for table in tables}
+        if unknown:
+            raise ValueError(f"Unknown tables: {', '.join(sorted(unknown))}")
+        tables = [table for table in tables if table.name in names]
+    return tables
@@ -0,0 +1,266 @@
+"""Memoization of entry cleaning and classification across fetch runs.
+
+The same entry text is seen again when items are re-syndicated, when feeds
+bump their updated dates, or when an entry is reparsed after a URL change.
+Entries are keyed by a hash of the keyword version, title and raw (pre
+strip_html) content. A hit returns the cleaned content, the classification
+and the matched keywords, so neither strip_html nor calculate_relevance
+runs again.
+
+Lookups go to an in-process LRU first (it survives between scheduled runs
+in the web process) and then to the classification_memo table, read with
+one query per feed through prefetch. Changing
+the keyword sets changes every key, so stale results are never returned.
+"""
+
+import hashlib
+import json
+import logging
+from collections import OrderedDict, namedtuple
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import sessionmaker
+
+from src.collectors.relevance_filter import keyword_version, rank_tags
+from src.database import get_read_engine, MemoizedClassification
+from src.services.metrics import record_cache
+
+logger = logging.getLogger(__name__)
+
+# Cached result for one entry; classification is None for filtered entries
+MemoEntry = namedtuple("MemoEntry", ["content", "classification", "keywords"])
+
+# Keys per IN (...) query, well below SQLite's bound-parameter limit
+PREFETCH_CHUNK_SIZE = 500
+
+
+class ClassificationMemo:
+    """Two-level (LRU + database) memo of entry content and classification."""
+
+    def __init__(self, maxsize: int = 10000):
+        """
+        Initialize the memo.
+
+        Args:
+            maxsize: Number of entries kept in the in-process LRU
+        """
+        self.maxsize = maxsize
+        self._lru: "OrderedDict[str, MemoEntry]" = OrderedDict()
+        self.version = keyword_version()
+        self.hits = 0
+        self.misses = 0
+        self._session_factory = None
+        # Result of the last prefetch: entries found, and every key looked up
+        self._prefetched: Dict[str, MemoEntry] = {}
+        self._prefetched_keys: set = set()
+
+    def key(self, title: str, raw_content: str) -> str:
+        """Return the memo key for an entry's title and raw feed content."""
+        data = f"{self.version}\x00{title}\x00{raw_content}".encode(
+            "utf-8", "surrogatepass"
+        )
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+    def refresh_version(self):
+        """Pick up a keyword change; cached entries of the old version become unreachable."""
+        version = keyword_version()
+        if version != self.version:
+            self.version = version
+            self._lru.clear()
+
+    def reset_stats(self):
+        """Reset the hit/miss counters, e.g. at the start of a fetch run."""
+        self.hits = 0
+        self.misses = 0
+
+    def prefetch(self, keys: Iterable[str]):
+        """
+        Read the persisted entries of a batch of keys, e.g. one feed's entries.
+
+        Later get() calls for these keys don't query the database; the
+        previous batch is forgotten.
+
+        Args:
+            keys: Memo keys from key()
+        """
+        missing = [key for key in dict.fromkeys(keys) if key not in self._lru]
+        self._prefetched = self._load_many(missing)
+        self._prefetched_keys = set(missing)
+
+    def get(self, key: str) -> Optional[MemoEntry]:
+        """
+        Look up an entry, counting a hit or a miss.
+
+        Args:
+            key: Memo key from key()
+
+        Returns:
+            MemoEntry, or None on a miss
+        """
+        entry = self._lru.get(key)
+        if entry is not None:
+            self._lru.move_to_end(key)
+            self.hits += 1
+            record_cache("classification_memo", True)
+            return entry
+
+        if key in self._prefetched_keys:
+            entry = self._prefetched.pop(key, None)
+        else:
+            entry = self._load_many([key]).get(key)
+        if entry is None:
+            self.misses += 1
+            record_cache("classification_memo", False)
+            return None
+
+        self._remember(key, entry)
+        self.hits += 1
+        record_cache("classification_memo", True)
+        return entry
+
+    def put(
+        self,
+        session,
+        key: str,
+        content: str,
+        classification: Optional[Dict],
+        keywords: List[str],
+    ):
+        """
+        Record a freshly computed result.
+
+        The entry is kept in the LRU at once; the database row is written
+        by the next flush() of the session.
+
+        Args:
+            session: Open database session (flushed and committed by the caller)
+            key: Memo key from key()
+            content: Cleaned entry content
+            classification: calculate_relevance result, or None if filtered
+            keywords: Relevance keywords found in the entry
+        """
+        entry = MemoEntry(content, classification, list(keywords))
+        self._remember(key, entry)
+
+        # The same entry can appear in several feeds of one run
+        pending = session.info.setdefault("classification_memo_pending", {})
+        pending.setdefault(key, entry)
+
+    def flush(self, session) -> int:
+        """
+        Add the rows of the entries recorded with put() to the session.
+
+        Keys another run already persisted are skipped, checked with one
+        IN (...) query per PREFETCH_CHUNK_SIZE keys.
+
+        Args:
+            session: Session passed to put() (committed by the caller)
+
+        Returns:
+            Number of rows added
+        """
+        pending = session.info.pop("classification_memo_pending", {})
+        keys = list(pending)
+        stored = set()
+        for start in range(0, len(keys), PREFETCH_CHUNK_SIZE):
+            stored.update(
+                session.execute(
+                    select(MemoizedClassification.content_hash).where(
+                        MemoizedClassification.content_hash.in_(
+                            keys[start : start + PREFETCH_CHUNK_SIZE]
+                        )
+                    )
+                ).scalars()
+            )
+
+        added = 0
+        for key, entry in pending.items():
+            if key in stored:
+                continue
+            classification = entry.classification
+            session.add(
+                MemoizedClassification(
+                    content_hash=key,
+                    content=entry.content,
+                    category=classification["category"] if classification else None,
+                    confidence=(
+                        classification["confidence"] if classification else None
+                    ),
+                    relevancy_score=(
+                        classification["relevancy_score"] if classification else None
+                    ),
+                    keywords=json.dumps(entry.keywords),
+                )
+            )
+            added += 1
+        return added
+
+    def prune(self, session, retention_days: int) -> int:
+        """
+        Delete persisted entries older than retention_days.
+
+        Args:
+            session: Open database session (committed by the caller)
+            retention_days: Age after which entries are dropped
+
+        Returns:
+            Number of deleted rows
+        """
+        cutoff = datetime.utcnow() - timedelta(days=retention_days)
+        result = session.execute(
+            delete(MemoizedClassification).where(
+                MemoizedClassification.created_date < cutoff
+            )
+        )
+        return result.rowcount or 0
+
+    def _remember(self, key: str, entry: MemoEntry):
+        self._lru[key] = entry
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.maxsize:
+            self._lru.popitem(last=False)
+
+    def _load_many(self, keys: List[str]) -> Dict[str, MemoEntry]:
+        """Read entries from the classification_memo table, keyed by memo key."""
+        if not keys:
+            return {}
+        if self._session_factory is None:
+            # Lookups run while the fetch session holds the writer connection
+            self._session_factory = sessionmaker(bind=get_read_engine())
+        session = self._session_factory()
+        rows = []
+        try:
+            for start in range(0, len(keys), PREFETCH_CHUNK_SIZE):
+                rows.extend(
+                    session.execute(
+                        select(MemoizedClassification).where(
+                            MemoizedClassification.content_hash.in_(
+                                keys[start : start + PREFETCH_CHUNK_SIZE]
+                            )
+                        )
+                    ).scalars()
+                )
+        except SQLAlchemyError as e:
+            logger.warning(f"Classification memo lookup failed: {str(e)}")
+            return {}
+        finally:
+            session.close()
+
+        entries = {}
+        for row in rows:
+            keywords = json.loads(row.keywords)
+            classification = None
+            if row.category is not None:
+                classification = {
+                    "category": row.category,
+                    "confidence": row.confidence,
+                    "relevancy_score": row.relevancy_score,
+                    "tags": rank_tags(keywords, row.category),
+                }
+            entries[row.content_hash] = MemoEntry(
+                row.content or "", classification, keywords
+            )
+        return entries
@@ -0,0 +1,220 @@
+"""Precomputed facet counts for the archive filters.
+
+The archive can be narrowed by source, category, tag and month, and shows
+how many articles each option holds. Instead of GROUP BY queries over the
+article/classification/tag join on every request, the facet_counts table
+keeps one row per (facet, value) with its article count. Every writer
+applies deltas as it changes articles:
+
+- store_articles counts new articles' source, month and category;
+- tags.save_article_tags counts tag changes;
+- reclassification counts category changes.
+
+Reading the facets is then one small query, independent of the number of
+articles. rebuild_facets recomputes the table from scratch, e.g. after a
+bulk import or to repair drift.
+"""
+
+import logging
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import bindparam, delete, insert, select, update
+
+from src.database import (
+    get_session,
+    Article,
+    ArticleTag,
+    Classification,
+    FacetCount,
+    Tag,
+)
+
+logger = logging.getLogger(__name__)
+
+FACETS = ("source", "category", "tag", "month")
+
+# Values shown per facet in the archive sidebar
+DEFAULT_FACET_LIMIT = 20
+
+
+def month_key(published_date: Optional[datetime], fetched_date=None) -> str:
+    """Return the "YYYY-MM" month facet value of an article."""
+    date = published_date or fetched_date or datetime.utcnow()
+    return date.strftime("%Y-%m")
+
+
+def parse_month(value: Optional[str]) -> Optional[str]:
+    """
+    Normalize a month filter to its facet value.
+
+    Args:
+        value: Month as given in a URL, e.g. "2026-01" or "2026-1"
+
+    Returns:
+        "YYYY-MM", or None if the value is missing or not a month
+    """
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value.strip(), "%Y-%m").strftime("%Y-%m")
+    except ValueError:
+        return None
+
+
+def article_facets(
+    source: str,
+    published_date: Optional[datetime],
+    fetched_date: Optional[datetime] = None,
+    category: Optional[str] = None,
+) -> Counter:
+    """
+    Facet deltas for adding one article (tags are counted by save_article_tags).
+
+    Args:
+        source: Article source name
+        published_date: Publication date, if known
+        fetched_date: Fetch date, used when there is no publication date
+        category: Classification category, if classified
+
+    Returns:
+        Counter mapping (facet, value) to +1
+    """
+    deltas = Counter()
+    deltas[("source", source)] += 1
+    deltas[("month", month_key(published_date, fetched_date))] += 1
+    if category:
+        deltas[("category", category)] += 1
+    return deltas
+
+
+def bump_facets(session, deltas: Counter):
+    """
+    Add deltas to the stored facet counts.
+
+    Args:
+        session: Open database session (committed by the caller)
+        deltas: Counter mapping (facet, value) to the change in count
+    """
+    deltas = {key: n for key, n in deltas.items() if n}
+    if not deltas:
+        return
+
+    table = FacetCount.__table__
+    existing = set()
+    for facet in {facet for facet, _ in deltas}:
+        values = [value for f, value in deltas if f == facet]
+        existing.update(
+            (facet, value)
+            for value in session.execute(
+                select(FacetCount.value).where(
+                    FacetCount.facet == facet, FacetCount.value.in_(values)
+                )
+            ).scalars()
+        )
+
+    updates = [
+        {"f": facet, "v": value, "n": n}
+        for (facet, value), n in deltas.items()
+        if (facet, value) in existing
+    ]
+    if updates:
+        session.execute(
+            update(table)
+            .where(table.c.facet == bindparam("f"), table.c.value == bindparam("v"))
+            .values(count=table.c.count + bindparam("n")),
+            updates,
+        )
+
+    inserts = [
+        {"facet": facet, "value": value, "count": n}
+        for (facet, value), n in deltas.items()
+        if (facet, value) not in existing and n > 0
+    ]
+    if inserts:
+        session.execute(insert(FacetCount), inserts)
+
+    if any(n < 0 for n in deltas.values()):
+        session.execute(delete(FacetCount).where(FacetCount.count <= 0))
+
+
+def load_facets(
+    session, limit: int = DEFAULT_FACET_LIMIT
+) -> Dict[str, List[Tuple[str, int]]]:
+    """
+    Read the facet counts for the archive sidebar.
+
+    Args:
+        session: Open database session
+        limit: Values per facet (months are the most recent ones, the other
+            facets the largest ones)
+
+    Returns:
+        Dict mapping each facet to a list of (value, count)
+    """
+    facets = {}
+    for facet in FACETS:
+        order = (
+            (FacetCount.value.desc(),)
+            if facet == "month"
+            else (FacetCount.count.desc(), FacetCount.value)
+        )
+        facets[facet] = [
+            (value, count)
+            for value, count in session.execute(
+                select(FacetCount.value, FacetCount.count)
+                .where(FacetCount.facet == facet)
+                .order_by(*order)
+                .limit(limit)
+            )
+        ]
+    return facets
+
+
+def rebuild_facets(batch_size: int = 10000) -> Dict[str, int]:
+    """
+    Recompute all facet counts from the stored articles.
+
+    Args:
+        batch_size: Articles read per batch when counting months
+
+    Returns:
+        Dict mapping each facet to its number of distinct values
+    """
+    session = get_session()
+    try:
+        counts = Counter()
+        rows = session.execute(
+            select(
+                Article.source, Article.published_date, Article.fetched_date
+            ).execution_options(yield_per=batch_size)
+        )
+        for source, published_date, fetched_date in rows:
+            counts.update(article_facets(source, published_date, fetched_date))
+        for (category,) in session.execute(select(Classification.category)):
+            counts[("category", category)] += 1
+        for (name,) in session.execute(
+            select(Tag.name).join(ArticleTag, ArticleTag.tag_id == Tag.id)
+        ):
+            counts[("tag", name)] += 1
+
+        session.execute(delete(FacetCount))
+        if counts:
+            session.execute(
+                insert(FacetCount),
+                [
+                    {"facet": facet, "value": value, "count": n}
+                    for (facet, value), n in counts.items()
+                ],
+            )
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+    stats = Counter(facet for facet, _ in counts)
+    logger.info(f"✓ Rebuilt facet counts: {dict(stats)}")
+    return {facet: stats.get(facet, 0) for facet in FACETS}
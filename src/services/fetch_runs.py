@@ -0,0 +1,169 @@
+"""Persisted history of fetch runs, broken down by pipeline stage.
+
+Every run of the fetch pipeline (scripts/fetch_articles_modular.py) saves a
+FetchRun row and one FetchRunFeed row per configured feed, holding wall and
+CPU time per stage plus byte and entry counts:
+
+- network: downloading the feed body;
+- parse: XML/feedparser parsing, reading entry fields and classification
+  memo lookups;
+- strip_html: cleaning entry content (memo hits skip it);
+- classification: cleaning raw content and classifying new entries;
+- store: duplicate checks, inserts and the commit;
+- archive: pruning the raw feed archive and moving old articles to the
+  cold tier.
+
+network, parse and strip_html are measured per feed and summed for the run.
+Runs started from the command line are recorded too, unlike the in-process
+metrics at /metrics. The admin page (/admin/fetch-runs) flags stages that
+took much longer than their median over the previous runs.
+"""
+
+import logging
+import statistics
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import delete, select
+
+from src.collectors.stage_timer import StageTimer
+from src.database import get_session, FetchRun, FetchRunFeed
+
+logger = logging.getLogger(__name__)
+
+RUN_STAGES = ("network", "parse", "strip_html", "classification", "store", "archive")
+FEED_STAGES = ("network", "parse", "strip_html")
+ENTRY_OUTCOMES = ("new", "duplicate", "filtered", "near_duplicate")
+
+# Previous runs forming the baseline of a regression check
+BASELINE_RUNS = 10
+# A time is flagged when it exceeds its baseline median by this factor...
+REGRESSION_FACTOR = 1.5
+# ...and is at least this long, so jitter in fast stages isn't flagged
+REGRESSION_MIN_SECONDS = 0.5
+
+
+def save_fetch_run(
+    started_at: datetime,
+    wall_seconds: float,
+    cpu_seconds: float,
+    timings: Dict[str, List[float]],
+    feed_stats: Dict[str, Dict],
+    source_counts: Dict[str, Dict[str, int]],
+    error: Optional[str] = None,
+    retention_days: Optional[int] = None,
+) -> Optional[int]:
+    """
+    Store one fetch run and drop runs past the retention period.
+
+    History is best effort: a failure is logged and never fails the fetch.
+
+    Args:
+        started_at: When the run started (UTC)
+        wall_seconds: Wall time of the whole run
+        cpu_seconds: CPU time of the whole run
+        timings: Run-level stages (StageTimer.stages), e.g. classification
+        feed_stats: RSSCollector.feed_stats, including per-feed "timings"
+        source_counts: Per source: "new", "duplicate", "filtered" and
+            "near_duplicate" counts (see store_articles)
+        error: Error message if the run failed
+        retention_days: Delete runs older than this (None or 0 keeps all)
+
+    Returns:
+        ID of the new FetchRun, or None if it could not be saved
+    """
+    totals = stage_totals(timings, feed_stats)
+    feeds = []
+    for name, stats in feed_stats.items():
+        feed_timer = StageTimer()
+        feed_timer.merge(stats.get("timings", {}))
+        counts = source_counts.get(name, {})
+        feeds.append(
+            FetchRunFeed(
+                feed=name,
+                url=stats.get("url"),
+                parser=stats.get("parser"),
+                error=stats.get("error"),
+                oversized=bool(stats.get("oversized")),
+                bytes=stats.get("bytes", 0),
+                entries=stats.get("processed", 0),
+                known=stats.get("known", 0),
+                wall_seconds=stats.get("seconds"),
+                **{outcome: counts.get(outcome, 0) for outcome in ENTRY_OUTCOMES},
+                **_stage_columns(feed_timer, FEED_STAGES),
+            )
+        )
+
+    run = FetchRun(
+        started_at=started_at,
+        finished_at=datetime.utcnow(),
+        status="error" if error else "ok",
+        error=error,
+        feeds=len(feeds),
+        failed_feeds=sum(1 for feed in feeds if feed.error),
+        bytes=sum(feed.bytes for feed in feeds),
+        entries=sum(feed.entries for feed in feeds),
+        known=sum(feed.known for feed in feeds),
+        wall_seconds=wall_seconds,
+        cpu_seconds=cpu_seconds,
+        **{
+            outcome: sum(getattr(feed, outcome) for feed in feeds)
+            for outcome in ENTRY_OUTCOMES
+        },
+        **_stage_columns(totals, RUN_STAGES),
+    )
+    run.feed_results = feeds
+
+    session = get_session()
+    try:
+        session.add(run)
+        if retention_days:
+            cutoff = datetime.utcnow() - timedelta(days=retention_days)
+            old = select(FetchRun.id).where(FetchRun.started_at < cutoff)
+            session.execute(delete(FetchRunFeed).where(FetchRunFeed.run_id.in_(old)))
+            session.execute(delete(FetchRun).where(FetchRun.started_at < cutoff))
+        session.commit()
+        return run.id
+    except Exception as e:
+        session.rollback()
+        logger.warning(f"⚠️ Could not save fetch run history: {e}")
+        return None
+    finally:
+        session.close()
+
+
+def stage_totals(
+    timings: Dict[str, List[float]], feed_stats: Dict[str, Dict]
+) -> StageTimer:
+    """Run-level stages plus the per-feed stages summed over all feeds."""
+    totals = StageTimer()
+    totals.merge(timings)
+    for stats in feed_stats.values():
+        totals.merge(stats.get("timings", {}))
+    return totals
+
+
+def _stage_columns(timer: StageTimer, stages: Sequence[str]) -> Dict[str, float]:
+    """Column values of the *_seconds and *_cpu_seconds pairs of the stages."""
+    columns = {}
+    for stage in stages:
+        columns[f"{stage}_seconds"] = timer.wall(stage)
+        columns[f"{stage}_cpu_seconds"] = timer.cpu(stage)
+    return columns
+
+
+def is_regression(value: Optional[float], baseline: Sequence[float]) -> bool:
+    """
+    Whether a time stands out against earlier measurements of the same thing.
+
+    Args:
+        value: Time of the current run, in seconds
+        baseline: Times of previous runs (missing values already dropped)
+
+    Returns:
+        True if value is at least REGRESSION_MIN_SECONDS and more than
+        REGRESSION_FACTOR times the baseline median
+    """
+    if value is None or not baseline or value < REGRESSION_MIN_SECONDS:
+        return False
+    return value > statistics.median(baseline) * REGRESSION_FACTOR
@@ -0,0 +1,165 @@
+"""Precomputed "Top" ranking key combining relevancy and recency.
+
+Ranking by relevancy decayed by age, relevancy * exp(-age / tau), at query
+time needs the current time, so it cannot use an index and sorts the whole
+table. Taking the logarithm gives the same order:
+
+    log(relevancy) - (now - published) / tau
+        = log(relevancy) + published / tau - now / tau
+
+and now / tau is the same for every article. Articles.hot_score stores
+log10(1 + relevancy) + (published - HOT_EPOCH) / tau, with tau set by
+settings.hot_time_scale_days, and never goes stale as time passes. It only
+changes when an article's relevancy does, so it is written at ingest and by
+reclassification, and update_hot_scores recomputes it in bulk (backfills,
+or after changing HOT_EPOCH or the time scale). The digest's Top sort then
+reads the hot_score index in order.
+
+The time scale sets the trade-off between relevancy and recency. Since
+log10(1 + relevancy) lies between 0 and ~2, the most relevant article can
+only outrank irrelevant ones published up to ~2 time scales later. With
+the default of a week, a strong story competes with the next two weeks of
+news; a day would let it hold its place for barely two days.
+"""
+
+import logging
+import math
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+
+from sqlalchemy import func, select, update
+
+from src.config import settings
+from src.database import get_session, Article, Classification
+
+logger = logging.getLogger(__name__)
+
+# Fixed origin of the time term; changing it shifts all scores equally
+HOT_EPOCH = datetime(2024, 1, 1)
+
+
+def hot_time_scale() -> float:
+    """Seconds of recency worth one order of magnitude of relevancy."""
+    return settings.hot_time_scale_days * 86400
+
+
+def hot_score(
+    relevancy: Optional[float],
+    published_date: Optional[datetime],
+    fetched_date: Optional[datetime] = None,
+) -> float:
+    """
+    Compute the ranking key of an article.
+
+    Args:
+        relevancy: Classification relevancy score (0-100), None if unclassified
+        published_date: Publication date, if known
+        fetched_date: Fetch date, used when there is no publication date
+
+    Returns:
+        Score; higher ranks first
+    """
+    date = published_date or fetched_date or datetime.utcnow()
+    if date.tzinfo is not None:
+        date = date.astimezone(timezone.utc).replace(tzinfo=None)
+    recency = (date - HOT_EPOCH).total_seconds() / hot_time_scale()
+    return math.log10(1 + max(relevancy or 0.0, 0.0)) + recency
+
+
+def refresh_hot_scores(session, article_ids: Iterable[int]) -> int:
+    """
+    Recompute the hot_score of the given articles from the database.
+
+    Args:
+        session: Open database session (committed by the caller)
+        article_ids: Articles whose relevancy may have changed
+
+    Returns:
+        Number of articles updated
+    """
+    article_ids = list(article_ids)
+    if not article_ids:
+        return 0
+
+    rows = session.execute(
+        select(
+            Article.id,
+            Article.published_date,
+            Article.fetched_date,
+            func.max(Classification.relevancy_score),
+        )
+        .outerjoin(Classification, Classification.article_id == Article.id)
+        .where(Article.id.in_(article_ids))
+        .group_by(Article.id, Article.published_date, Article.fetched_date)
+    ).all()
+    session.execute(
+        update(Article),
+        [
+            {"id": article_id, "hot_score": hot_score(relevancy, published, fetched)}
+            for article_id, published, fetched, relevancy in rows
+        ],
+    )
+    return len(rows)
+
+
+def hot_scores_stale() -> bool:
+    """
+    Whether stored scores were computed with another HOT_EPOCH or time scale.
+
+    Recomputes the score of the newest scored article and compares; scores
+    are kept current otherwise, so a mismatch means the constants changed.
+    """
+    session = get_session()
+    try:
+        row = session.execute(
+            select(
+                Article.hot_score,
+                Article.published_date,
+                Article.fetched_date,
+                select(func.max(Classification.relevancy_score))
+                .where(Classification.article_id == Article.id)
+                .scalar_subquery(),
+            )
+            .where(Article.hot_score.is_not(None))
+            .order_by(Article.id.desc())
+            .limit(1)
+        ).first()
+    finally:
+        session.close()
+    if row is None:
+        return False
+    stored, published, fetched, relevancy = row
+    return not math.isclose(
+        stored, hot_score(relevancy, published, fetched), abs_tol=1e-6
+    )
+
+
+def update_hot_scores(batch_size: int = 5000, full: bool = False) -> int:
+    """
+    Bulk-compute hot scores.
+
+    Args:
+        batch_size: Articles updated per transaction
+        full: Recompute every article instead of only those without a score
+
+    Returns:
+        Number of articles updated
+    """
+    session = get_session()
+    count = 0
+    try:
+        query = select(Article.id).order_by(Article.id)
+        if not full:
+            query = query.where(Article.hot_score.is_(None))
+        ids = list(session.execute(query).scalars())
+        for start in range(0, len(ids), batch_size):
+            count += refresh_hot_scores(session, ids[start : start + batch_size])
+            session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+    logger.info(f"✓ Updated hot scores of {count} articles")
+    return count
@@ -0,0 +1,343 @@
+"""In-process metrics in the Prometheus text exposition format.
+
+A deliberately small registry instead of a client library dependency:
+counters, gauges and histograms with labels, rendered by GET /metrics.
+Recording is a dict lookup plus a short lock, so it stays on in the hot
+path (every request and every SQL statement). Values that are cheaper to
+read than to track, such as connection pool sizes, are filled in at scrape
+time by callbacks registered with on_collect.
+
+Metrics live in the web process: fetch runs started by the in-process
+scheduler are visible here, runs from the command line are not (see the
+persisted fetch-run history for those).
+"""
+
+import bisect
+import math
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Request/query latency buckets in seconds
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+_metrics: Dict[str, "_Metric"] = {}
+_collectors: List[Callable[[], None]] = []
+_lock = threading.Lock()
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._values: Dict[Tuple, object] = {}
+        with _lock:
+            if name in _metrics:
+                raise ValueError(f"Metric {name} is already registered")
+            _metrics[name] = self
+
+    def _key(self, labels: Dict) -> Tuple:
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    def clear(self):
+        """Drop every label set, e.g. feeds that are no longer configured."""
+        with _lock:
+            self._values.clear()
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with _lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+            for key, value in sorted(self._values.items())
+        ]
+
+
+class Gauge(Counter):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with _lock:
+            self._values[key] = float(value)
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with _lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket counts (last one is +Inf), sum, count
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def samples(self) -> List[str]:
+        lines = []
+        for key, (counts, total, count) in sorted(self._values.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.label_names, key, le)} {cumulative}"
+                )
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+def on_collect(callback: Callable[[], None]):
+    """Register a function that updates gauges right before each scrape."""
+    _collectors.append(callback)
+    return callback
+
+
+def render() -> str:
+    """All metrics in the Prometheus text format (version 0.0.4)."""
+    for callback in _collectors:
+        callback()
+    with _lock:
+        text = "\n".join(metric.render() for metric in _metrics.values())
+    return text + "\n"
+
+
+# Web requests (recorded by MetricsMiddleware)
+HTTP_REQUESTS = Counter(
+    "greenai_http_requests_total",
+    "HTTP requests by route template, method and status code.",
+    ("route", "method", "status"),
+)
+HTTP_LATENCY = Histogram(
+    "greenai_http_request_duration_seconds",
+    "HTTP request latency by route template and method.",
+    ("route", "method"),
+)
+
+# Database (recorded by src/services/query_stats.py and at scrape time)
+DB_QUERY_LATENCY = Histogram(
+    "greenai_db_query_duration_seconds",
+    "SQL statement execution time.",
+)
+DB_POOL = Gauge(
+    "greenai_db_pool_connections",
+    "Connections per engine pool: size, checked_in, checked_out, overflow.",
+    ("engine", "state"),
+)
+
+# Caches
+CACHE_REQUESTS = Counter(
+    "greenai_cache_requests_total",
+    "Cache lookups by cache and result (hit or miss).",
+    ("cache", "result"),
+)
+CACHE_HIT_RATIO = Gauge(
+    "greenai_cache_hit_ratio",
+    "Share of cache lookups that hit, since the process started.",
+    ("cache",),
+)
+
+# Last fetch run (recorded by scripts/fetch_articles_modular.py)
+FETCH_RUNS = Counter(
+    "greenai_fetch_runs_total",
+    "Fetch runs by outcome (ok or error).",
+    ("status",),
+)
+FETCH_LAST_RUN_TIME = Gauge(
+    "greenai_fetch_last_run_timestamp_seconds",
+    "Unix time the last fetch run finished.",
+)
+FETCH_LAST_RUN_SECONDS = Gauge(
+    "greenai_fetch_last_run_duration_seconds",
+    "Wall time of the last fetch run.",
+)
+FETCH_CLASSIFICATION_SECONDS = Gauge(
+    "greenai_fetch_last_run_classification_seconds",
+    "Time the last fetch run spent cleaning and classifying new entries.",
+)
+FETCH_FEED_SECONDS = Gauge(
+    "greenai_fetch_feed_duration_seconds",
+    "Download and parse time of each feed in the last fetch run.",
+    ("feed",),
+)
+FETCH_FEED_BYTES = Gauge(
+    "greenai_fetch_feed_bytes",
+    "Body size of each feed in the last fetch run.",
+    ("feed",),
+)
+FETCH_FEED_ENTRIES = Gauge(
+    "greenai_fetch_feed_entries",
+    "Entries of each feed in the last fetch run by outcome: parsed, known "
+    "(skipped by the high-water mark), new, duplicate, filtered, near_duplicate.",
+    ("feed", "outcome"),
+)
+FETCH_FEED_ERRORS = Gauge(
+    "greenai_fetch_feed_error",
+    "1 for feeds that failed in the last fetch run.",
+    ("feed",),
+)
+
+
+def record_fetch_run(
+    feed_stats: Dict[str, Dict],
+    source_counts: Dict[str, Dict[str, int]],
+    seconds: float,
+    classification_seconds: Optional[float] = None,
+    ok: bool = True,
+):
+    """
+    Publish the per-feed numbers of a finished fetch run.
+
+    Args:
+        feed_stats: RSSCollector.feed_stats of the run
+        source_counts: Per source: "new", "duplicate", "filtered" and
+            "near_duplicate" counts (see store_articles)
+        seconds: Wall time of the whole run
+        classification_seconds: Time spent cleaning and classifying
+        ok: Whether the run completed
+    """
+    FETCH_RUNS.inc(status="ok" if ok else "error")
+    FETCH_LAST_RUN_TIME.set(time.time())
+    FETCH_LAST_RUN_SECONDS.set(seconds)
+    if classification_seconds is not None:
+        FETCH_CLASSIFICATION_SECONDS.set(classification_seconds)
+
+    # Replace the previous run's label sets, so removed feeds disappear
+    for gauge in (FETCH_FEED_SECONDS, FETCH_FEED_BYTES, FETCH_FEED_ENTRIES):
+        gauge.clear()
+    FETCH_FEED_ERRORS.clear()
+    for feed, stats in feed_stats.items():
+        if "seconds" in stats:
+            FETCH_FEED_SECONDS.set(stats["seconds"], feed=feed)
+        if "bytes" in stats:
+            FETCH_FEED_BYTES.set(stats["bytes"], feed=feed)
+        FETCH_FEED_ERRORS.set(1 if "error" in stats else 0, feed=feed)
+        FETCH_FEED_ENTRIES.set(stats.get("processed", 0), feed=feed, outcome="parsed")
+        FETCH_FEED_ENTRIES.set(stats.get("known", 0), feed=feed, outcome="known")
+        counts = source_counts.get(feed, {})
+        for outcome in ("new", "duplicate", "filtered", "near_duplicate"):
+            FETCH_FEED_ENTRIES.set(counts.get(outcome, 0), feed=feed, outcome=outcome)
+
+
+def record_cache(cache: str, hit: bool):
+    """Count one cache lookup."""
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+@on_collect
+def _update_hit_ratios():
+    caches = {key[0] for key in list(CACHE_REQUESTS._values)}
+    for cache in caches:
+        hits = CACHE_REQUESTS.value(cache=cache, result="hit")
+        total = hits + CACHE_REQUESTS.value(cache=cache, result="miss")
+        if total:
+            CACHE_HIT_RATIO.set(hits / total, cache=cache)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request counts and latency per route."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = [500]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # Route templates keep label cardinality bounded; unmatched
+            # paths (404s) share one label
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            method = scope.get("method", "")
+            HTTP_REQUESTS.inc(route=route, method=method, status=status[0])
+            HTTP_LATENCY.observe(
+                time.perf_counter() - start, route=route, method=method
+            )
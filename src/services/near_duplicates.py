@@ -0,0 +1,313 @@
+"""Near-duplicate story detection with MinHash and banded LSH.
+
+The same press release reaches several feeds under different URLs. Each
+article gets a MinHash signature of its word 3-shingles (title + content):
+the share of equal signature values estimates the Jaccard similarity of two
+articles' shingle sets.
+
+The signature is cut into LSH_BANDS bands of LSH_ROWS values, and every band
+is hashed into a bucket stored in the indexed article_buckets table.
+Articles with Jaccard similarity above ~0.7 share at least one bucket with
+high probability, so candidates are found with indexed equality lookups and
+only those few are compared. There are no pairwise comparisons over the
+corpus.
+
+A near-duplicate stores the ID of the first article of its group in
+duplicate_of; the digest shows only the first one. Rows without a url_hash
+were linked by backfill_url_hashes as another spelling of an article's URL:
+that link is kept as is.
+"""
+
+import hashlib
+import logging
+import re
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from sqlalchemy import delete, insert, select, update
+
+from src.database import get_session, Article, ArticleBucket
+
+logger = logging.getLogger(__name__)
+
+SHINGLE_SIZE = 3
+LSH_BANDS = 16
+LSH_ROWS = 4
+NUM_PERMUTATIONS = LSH_BANDS * LSH_ROWS
+# Estimated Jaccard similarity at which an article counts as a near-duplicate
+MIN_SIMILARITY = 0.7
+# Values per candidate query, to stay under bound-parameter limits
+LOOKUP_CHUNK_SIZE = 2000
+
+_WORD_RE = re.compile(r"\w+")
+
+# Universal hashing (a * x + b) mod p; the seed must never change, or
+# stored signatures stop matching new ones
+_PRIME = (1 << 31) - 1
+_random = np.random.RandomState(20240601)
+_A = _random.randint(1, _PRIME, size=NUM_PERMUTATIONS).astype(np.uint64)
+_B = _random.randint(0, _PRIME, size=NUM_PERMUTATIONS).astype(np.uint64)
+
+
+def shingles(text: str) -> List[str]:
+    """Return the lower-cased word shingles of text (the words if it is shorter)."""
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < SHINGLE_SIZE:
+        return words
+    return [
+        " ".join(words[i : i + SHINGLE_SIZE])
+        for i in range(len(words) - SHINGLE_SIZE + 1)
+    ]
+
+
+def minhash(text: str) -> Optional[bytes]:
+    """
+    Compute the MinHash signature of a text.
+
+    Args:
+        text: Article title and content
+
+    Returns:
+        NUM_PERMUTATIONS uint32 values as bytes, or None for a text without words
+    """
+    features = set(shingles(text))
+    if not features:
+        return None
+
+    digests = b"".join(
+        hashlib.blake2b(feature.encode("utf-8"), digest_size=4).digest()
+        for feature in features
+    )
+    values = np.frombuffer(digests, dtype="<u4").astype(np.uint64) % _PRIME
+    hashed = (_A[:, None] * values[None, :] + _B[:, None]) % _PRIME
+    return hashed.min(axis=1).astype("<u4").tobytes()
+
+
+def similarity(a: bytes, b: bytes) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return float(
+        np.mean(np.frombuffer(a, dtype="<u4") == np.frombuffer(b, dtype="<u4"))
+    )
+
+
+def buckets(signature: bytes) -> List[int]:
+    """Hash each band of a signature into a signed 64-bit bucket ID."""
+    band_bytes = LSH_ROWS * 4
+    return [
+        int.from_bytes(
+            hashlib.blake2b(
+                bytes([band]) + signature[band * band_bytes : (band + 1) * band_bytes],
+                digest_size=8,
+            ).digest(),
+            "big",
+            signed=True,
+        )
+        for band in range(LSH_BANDS)
+    ]
+
+
+class NearDuplicateIndex:
+    """In-memory LSH index over a candidate set of articles."""
+
+    def __init__(self):
+        self._buckets: Dict[int, List[int]] = {}
+        self._signatures: Dict[int, bytes] = {}
+        self._groups: Dict[int, int] = {}
+
+    def add(self, article_id: int, group_id: int, signature: bytes):
+        """
+        Index an article.
+
+        Args:
+            article_id: Article ID
+            group_id: ID of the first article of the article's group
+            signature: Signature from minhash()
+        """
+        self._signatures[article_id] = signature
+        self._groups[article_id] = group_id
+        for bucket in buckets(signature):
+            self._buckets.setdefault(bucket, []).append(article_id)
+
+    def find(self, signature: bytes) -> Optional[int]:
+        """Return the group ID of the most similar indexed near-duplicate, if any."""
+        candidates = {
+            article_id
+            for bucket in buckets(signature)
+            for article_id in self._buckets.get(bucket, [])
+        }
+        best = None
+        for article_id in candidates:
+            score = similarity(signature, self._signatures[article_id])
+            group_id = self._groups[article_id]
+            if score >= MIN_SIMILARITY and (best is None or (-score, group_id) < best):
+                best = (-score, group_id)
+        return best[1] if best else None
+
+
+def load_index(session, signatures: Iterable[Optional[bytes]]) -> NearDuplicateIndex:
+    """
+    Build an index of stored articles sharing a bucket with any of signatures.
+
+    Args:
+        session: Open database session
+        signatures: Signatures about to be looked up
+
+    Returns:
+        NearDuplicateIndex of the candidate articles
+    """
+    wanted = sorted(
+        {bucket for s in signatures if s is not None for bucket in buckets(s)}
+    )
+    candidate_ids = set()
+    for start in range(0, len(wanted), LOOKUP_CHUNK_SIZE):
+        candidate_ids.update(
+            session.execute(
+                select(ArticleBucket.article_id).where(
+                    ArticleBucket.bucket.in_(wanted[start : start + LOOKUP_CHUNK_SIZE])
+                )
+            ).scalars()
+        )
+
+    index = NearDuplicateIndex()
+    candidate_ids = sorted(candidate_ids)
+    for start in range(0, len(candidate_ids), LOOKUP_CHUNK_SIZE):
+        rows = session.execute(
+            select(Article.id, Article.minhash, Article.duplicate_of).where(
+                Article.id.in_(candidate_ids[start : start + LOOKUP_CHUNK_SIZE])
+            )
+        )
+        for article_id, signature, duplicate_of in rows:
+            if signature is not None:
+                index.add(article_id, duplicate_of or article_id, signature)
+    return index
+
+
+def save_buckets(session, signatures_by_article: Dict[int, Optional[bytes]]):
+    """
+    Replace the LSH bucket rows of the given articles.
+
+    Args:
+        session: Open database session (committed by the caller)
+        signatures_by_article: Mapping of article ID to its signature
+    """
+    if not signatures_by_article:
+        return
+    session.execute(
+        delete(ArticleBucket).where(
+            ArticleBucket.article_id.in_(list(signatures_by_article))
+        )
+    )
+    rows = [
+        {"article_id": article_id, "bucket": bucket}
+        for article_id, signature in signatures_by_article.items()
+        if signature is not None
+        for bucket in buckets(signature)
+    ]
+    if rows:
+        session.execute(insert(ArticleBucket), rows)
+
+
+def detect_near_duplicates(batch_size: int = 1000, rebuild: bool = False) -> Dict:
+    """
+    Compute signatures and near-duplicate groups for stored articles.
+
+    Articles are processed in ID order, so the oldest article of a group
+    becomes the one the others point to.
+
+    Args:
+        batch_size: Articles signed and committed per batch
+        rebuild: Recompute every article instead of only unsigned ones
+
+    Returns:
+        Dict with the number of "articles" processed and "near_duplicate" found
+    """
+    stats = {"articles": 0, "near_duplicate": 0}
+    session = get_session()
+    try:
+        if rebuild:
+            session.execute(delete(ArticleBucket))
+            session.execute(
+                update(Article)
+                .where(Article.archived_date.is_(None))
+                .values(minhash=None)
+            )
+            # URL-spelling links (url_hash IS NULL) don't come from MinHash
+            session.execute(
+                update(Article)
+                .where(Article.archived_date.is_(None), Article.url_hash.isnot(None))
+                .values(duplicate_of=None)
+            )
+            session.commit()
+
+        ids = list(
+            session.execute(
+                select(Article.id)
+                .where(Article.minhash.is_(None), Article.archived_date.is_(None))
+                .order_by(Article.id)
+            ).scalars()
+        )
+        for start in range(0, len(ids), batch_size):
+            rows = session.execute(
+                select(
+                    Article.id,
+                    Article.title,
+                    Article.content,
+                    Article.url_hash,
+                    Article.duplicate_of,
+                )
+                .where(Article.id.in_(ids[start : start + batch_size]))
+                .order_by(Article.id)
+            ).all()
+            signatures = {
+                article_id: minhash(f"{title or ''} {content or ''}")
+                for article_id, title, content, _, _ in rows
+            }
+            url_links = {
+                article_id: duplicate_of
+                for article_id, _, _, hashed, duplicate_of in rows
+                if hashed is None and duplicate_of
+            }
+            similar = load_index(session, signatures.values())
+
+            values = []
+            for article_id, signature in signatures.items():
+                if article_id in url_links:
+                    duplicate_of = url_links[article_id]
+                    if signature is not None:
+                        similar.add(article_id, duplicate_of, signature)
+                    values.append(
+                        {
+                            "id": article_id,
+                            "minhash": signature,
+                            "duplicate_of": duplicate_of,
+                        }
+                    )
+                    continue
+                duplicate_of = None
+                if signature is not None:
+                    duplicate_of = similar.find(signature)
+                    similar.add(article_id, duplicate_of or article_id, signature)
+                if duplicate_of:
+                    stats["near_duplicate"] += 1
+                values.append(
+                    {
+                        "id": article_id,
+                        "minhash": signature,
+                        "duplicate_of": duplicate_of,
+                    }
+                )
+
+            session.execute(update(Article), values)
+            save_buckets(session, signatures)
+            session.commit()
+            stats["articles"] += len(rows)
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+    logger.info(
+        f"✓ Signed {stats['articles']} articles, {stats['near_duplicate']} near-duplicates"
+    )
+    return stats
@@ -0,0 +1,338 @@
+"""Queries behind the web pages.
+
+Each function loads everything one page renders, through an ordinary
+Session, and returns plain data plus fully loaded Article objects
+(classifications included), so rendering never goes back to the database.
+The routes in main.py run them on an AsyncSession with run_sync (see
+async_read_session), and scripts or tests can call them with a
+regular session: both paths share these query definitions.
+"""
+
+import logging
+import statistics
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import selectinload
+
+from src.database import (
+    Article,
+    Classification,
+    FacetCount,
+    FetchRun,
+    FetchRunFeed,
+    UserPreference,
+)
+from src.services.facets import load_facets, parse_month
+from src.services.fetch_runs import BASELINE_RUNS, RUN_STAGES, is_regression
+from src.services.personalization import personalized_ranking
+from src.services.tags import load_article_tags, tagged_article_ids
+
+DIGEST_PAGE_SIZE = 10
+ARCHIVE_PAGE_SIZE = 20
+FETCH_RUNS_PAGE_SIZE = 30
+
+logger = logging.getLogger(__name__)
+
+
+def _load_articles(session, query):
+    """Run an Article select, loading classifications in one extra query."""
+    return list(
+        session.execute(query.options(selectinload(Article.classifications))).scalars()
+    )
+
+
+def _count(session, query) -> int:
+    """COUNT(*) of a select's rows."""
+    return session.execute(
+        query.with_only_columns(func.count(), maintain_column_froms=True).order_by(None)
+    ).scalar()
+
+
+def digest_page(
+    session,
+    category: Optional[str] = None,
+    offset: int = 0,
+    sort: Optional[str] = None,
+    tag: Optional[str] = None,
+    per_page: int = DIGEST_PAGE_SIZE,
+) -> Dict:
+    """
+    Load one page of the daily digest.
+
+    Args:
+        session: Open database session
+        category: Category filter ("All" or None for every category)
+        offset: Index of the first article
+        sort: None for latest, "top" or "for-you"
+        tag: Tag filter
+        per_page: Articles per page
+
+    Returns:
+        Dict with "articles", "total", "sort" (None when falling back to
+        latest), "also_covered_by" (article ID -> sources of its hidden
+        near-duplicates), "tags" (article ID -> tags) and "has_preferences"
+    """
+    if category == "All":
+        category = None
+
+    # Get all articles with their classifications, ordered by latest first
+    query = (
+        select(Article)
+        .join(Classification)
+        .where(Article.duplicate_of.is_(None))  # one card per story
+    )
+
+    # Apply category filter if specified
+    if category:
+        query = query.where(Classification.category == category)
+
+    # Tag filter: indexed article_tags lookup
+    if tag:
+        query = query.where(Article.id.in_(tagged_article_ids(tag)))
+
+    # "For you" order from UserPreference keyword weights (empty without preferences)
+    ranking = personalized_ranking(session, category) if sort == "for-you" else []
+
+    if ranking and tag:
+        tagged = set(session.execute(tagged_article_ids(tag)).scalars())
+        ranking = [article_id for article_id in ranking if article_id in tagged]
+
+    if sort == "top":
+        # Precomputed relevancy/recency key, read in ix_articles_hot_top
+        # order: articles drive the query and classifications are only
+        # probed. Archived articles are not ranked.
+        classified = select(Classification.article_id)
+        if category:
+            classified = classified.where(Classification.category == category)
+        top = select(Article).where(
+            Article.duplicate_of.is_(None),
+            Article.archived_date.is_(None),
+            Article.id.in_(classified),
+        )
+        if tag:
+            top = top.where(Article.id.in_(tagged_article_ids(tag)))
+        articles = _load_articles(
+            session,
+            top.order_by(Article.hot_score.desc().nullslast(), Article.id.desc())
+            .offset(offset)
+            .limit(per_page),
+        )
+        total = _count(session, query.where(Article.archived_date.is_(None)))
+    elif ranking:
+        page_ids = ranking[offset : offset + per_page]
+        by_id = {
+            article.id: article
+            for article in _load_articles(
+                session, select(Article).where(Article.id.in_(page_ids))
+            )
+        }
+        articles = [by_id[i] for i in page_ids if i in by_id]
+        total = len(ranking)
+    else:
+        sort = None
+        articles = _load_articles(
+            session,
+            query.order_by(Article.published_date.desc())
+            .offset(offset)
+            .limit(per_page),
+        )
+        total = _count(session, query)
+
+    # Sources of the hidden near-duplicates of each shown article
+    article_ids = [article.id for article in articles]
+    also_covered_by = {}
+    if article_ids:
+        for group_id, source in session.execute(
+            select(Article.duplicate_of, Article.source).where(
+                Article.duplicate_of.in_(article_ids)
+            )
+        ):
+            sources = also_covered_by.setdefault(group_id, [])
+            if source not in sources:
+                sources.append(source)
+
+    return {
+        "articles": articles,
+        "total": total,
+        "sort": sort,
+        "also_covered_by": also_covered_by,
+        "tags": load_article_tags(session, article_ids),
+        # For you is only offered once preferences exist
+        "has_preferences": session.execute(select(UserPreference.id).limit(1)).first()
+        is not None,
+    }
+
+
+def archive_page(
+    session,
+    filters: Dict[str, Optional[str]],
+    offset: int = 0,
+    per_page: int = ARCHIVE_PAGE_SIZE,
+) -> Dict:
+    """
+    Load one page of the faceted archive.
+
+    Args:
+        session: Open database session
+        filters: Facet name -> selected value (None when unfiltered); an
+            invalid month is ignored
+        offset: Index of the first article
+        per_page: Articles per page
+
+    Returns:
+        Dict with "facets" (see load_facets), "articles", "total" and
+        "tags" (article ID -> tags)
+    """
+    # Normalize the month before it is used for the facet-count shortcut
+    filters = {**filters, "month": parse_month(filters.get("month"))}
+    source, category, tag, month = (
+        filters.get("source"),
+        filters.get("category"),
+        filters.get("tag"),
+        filters.get("month"),
+    )
+    active = {facet: value for facet, value in filters.items() if value}
+
+    # Sidebar counts come from the facet_counts rollup, not from GROUP BYs
+    facets = load_facets(session)
+
+    query = select(Article)
+    if source:
+        query = query.where(Article.source == source)
+    if category:
+        query = query.where(
+            Article.id.in_(
+                select(Classification.article_id).where(
+                    Classification.category == category
+                )
+            )
+        )
+    if tag:
+        query = query.where(Article.id.in_(tagged_article_ids(tag)))
+    if month:
+        start = datetime.strptime(month, "%Y-%m")
+        end = start.replace(
+            year=start.year + start.month // 12, month=start.month % 12 + 1
+        )
+        date = func.coalesce(Article.published_date, Article.fetched_date)
+        query = query.where(date >= start, date < end)
+
+    articles = _load_articles(
+        session,
+        query.order_by(Article.published_date.desc()).offset(offset).limit(per_page),
+    )
+
+    total = None
+    if len(active) <= 1:
+        # One filter (or none): the total is a stored facet count
+        facet, value = next(iter(active.items()), ("source", None))
+        totals = select(func.coalesce(func.sum(FacetCount.count), 0)).where(
+            FacetCount.facet == facet
+        )
+        if value:
+            totals = totals.where(FacetCount.value == value)
+        total = session.execute(totals).scalar()
+
+        # The page itself bounds the total: a rollup that contradicts it is
+        # missing or stale (e.g. rows written without bump_facets)
+        shown = offset + len(articles)
+        last_page = len(articles) < per_page and (articles or not offset)
+        if total < shown or (last_page and total != shown):
+            logger.warning(
+                f"⚠️ facet_counts disagree with the archive ({facet}={value}); "
+                "counting rows instead, run scripts/rebuild_facets.py to repair them"
+            )
+            total = None
+    if total is None:
+        total = _count(session, query)
+    return {
+        "facets": facets,
+        "articles": articles,
+        "total": total,
+        "tags": load_article_tags(session, [article.id for article in articles]),
+    }
+
+
+def fetch_runs_page(session, limit: int = FETCH_RUNS_PAGE_SIZE) -> Dict:
+    """
+    Load the fetch-run history with regressions flagged.
+
+    Each time is compared with the same time in the BASELINE_RUNS successful
+    runs before it (see fetch_runs.is_regression).
+
+    Args:
+        session: Open database session
+        limit: Runs shown
+
+    Returns:
+        Dict with "runs" (newest first; dicts with "run", a FetchRun, and
+        "slow", the set of regressed stages, "wall" for the total) and
+        "feeds" (the latest run's feeds, slowest first; dicts with "feed",
+        a FetchRunFeed, "median" wall seconds of earlier runs, "history"
+        of wall seconds per shown run, oldest first, "errors" in the shown
+        runs and "slow")
+    """
+    runs = list(
+        session.execute(
+            select(FetchRun)
+            .order_by(FetchRun.started_at.desc())
+            .limit(limit + BASELINE_RUNS)
+        ).scalars()
+    )
+
+    def baseline_of(index, seconds):
+        earlier = runs[index + 1 : index + 1 + BASELINE_RUNS]
+        values = [seconds(run) for run in earlier if run.status == "ok"]
+        return [value for value in values if value is not None]
+
+    rows = []
+    for index, run in enumerate(runs[:limit]):
+        slow = set()
+        for stage in ("wall",) + RUN_STAGES:
+            column = f"{stage}_seconds"
+            baseline = baseline_of(index, lambda r: getattr(r, column))
+            if is_regression(getattr(run, column), baseline):
+                slow.add(stage)
+        rows.append({"run": run, "slow": slow})
+
+    feeds = []
+    if runs:
+        by_feed = defaultdict(dict)
+        for feed in session.execute(
+            select(FetchRunFeed).where(FetchRunFeed.run_id.in_([r.id for r in runs]))
+        ).scalars():
+            by_feed[feed.feed][feed.run_id] = feed
+
+        shown = runs[:limit]
+        for name, results in by_feed.items():
+            latest = results.get(runs[0].id)
+            if latest is None:
+                continue  # no longer configured
+            baseline = baseline_of(
+                0,
+                lambda r: (
+                    results[r.id].wall_seconds
+                    if r.id in results and not results[r.id].error
+                    else None
+                ),
+            )
+            feeds.append(
+                {
+                    "feed": latest,
+                    "median": statistics.median(baseline) if baseline else None,
+                    "history": [
+                        results[r.id].wall_seconds if r.id in results else None
+                        for r in reversed(shown)
+                    ],
+                    "errors": sum(
+                        1 for r in shown if r.id in results and results[r.id].error
+                    ),
+                    "slow": is_regression(latest.wall_seconds, baseline),
+                }
+            )
+        feeds.sort(key=lambda row: row["feed"].wall_seconds or 0, reverse=True)
+
+    return {"runs": rows, "feeds": feeds}
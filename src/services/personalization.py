@@ -0,0 +1,253 @@
+"""Preference-weighted ranking from precomputed keyword vectors.
+
+At classification time every article gets a keyword_vector: a bitset of the
+relevance keywords it contains. Bit positions come from the append-only
+keyword_vocabulary table, so vectors stay valid when keywords are added or
+removed (reclassification rewrites the vectors of affected articles).
+
+At query time the UserPreference rows are turned into a weight per bit, and
+an article's preference score is the dot product of its bits with those
+weights. Ranking is then a matter of unpacking bits with NumPy; no text is
+matched per request. Only the settings.for_you_candidates best unarchived
+articles by hot_score are ranked, read in ix_articles_hot_top order, so a
+request costs the same however large the archive grows. Rankings are cached per preference
+set and category until classifications change.
+"""
+
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from sqlalchemy import func, select
+
+from src.collectors.relevance_filter import CATEGORY_KEYWORDS
+from src.config import settings
+from src.database import Article, Classification, KeywordVocabulary, UserPreference
+from src.services.metrics import record_cache
+
+logger = logging.getLogger(__name__)
+
+# Cached rankings: (preference signature, category, data generation) -> IDs
+RANKING_CACHE_SIZE = 32
+RANKING_CACHE_TTL = 300  # seconds
+
+_rankings: "OrderedDict[tuple, tuple]" = OrderedDict()
+
+
+def load_keyword_bits(session) -> Dict[str, int]:
+    """Return the keyword_vocabulary as a dict mapping keyword to bit position."""
+    rows = session.execute(select(KeywordVocabulary.keyword, KeywordVocabulary.bit))
+    return {keyword: bit for keyword, bit in rows}
+
+
+def keyword_bits(session, keywords: Iterable[str]) -> Dict[str, int]:
+    """
+    Return the bit position of every vocabulary keyword, adding new ones.
+
+    Args:
+        session: Open database session (committed by the caller)
+        keywords: Keywords that need a bit position
+
+    Returns:
+        Dict mapping keyword to bit position
+    """
+    bits = load_keyword_bits(session)
+    missing = [keyword for keyword in dict.fromkeys(keywords) if keyword not in bits]
+    next_bit = max(bits.values(), default=-1) + 1
+    for keyword in missing:
+        session.add(KeywordVocabulary(keyword=keyword, bit=next_bit))
+        bits[keyword] = next_bit
+        next_bit += 1
+    if missing:
+        session.flush()
+    return bits
+
+
+def encode_keyword_vector(keywords: Iterable[str], bits: Dict[str, int]) -> bytes:
+    """Pack keywords into a little-endian bitset (empty bytes for no keywords)."""
+    value = 0
+    for keyword in keywords:
+        value |= 1 << bits[keyword]
+    return value.to_bytes((value.bit_length() + 7) // 8, "little")
+
+
+def preference_terms(preference) -> List[str]:
+    """
+    Return the normalized keywords a preference asks for.
+
+    Uses the comma-separated keywords; a preference without keywords whose
+    topic names a category stands for that category's keywords, otherwise
+    for the topic itself.
+    """
+    terms = [t.strip().lower() for t in (preference.keywords or "").split(",")]
+    terms = [t for t in terms if t]
+    if terms:
+        return terms
+    if preference.topic in CATEGORY_KEYWORDS:
+        return [kw.strip() for kw in CATEGORY_KEYWORDS[preference.topic]]
+    return [preference.topic.strip().lower()]
+
+
+def preference_weights(preferences, bits: Dict[str, int]) -> Dict[int, float]:
+    """
+    Turn preferences into a weight per keyword bit.
+
+    Args:
+        preferences: UserPreference rows
+        bits: Keyword vocabulary from keyword_bits
+
+    Returns:
+        Dict mapping bit position to summed preference weight
+    """
+    by_term: Dict[str, List[int]] = {}
+    for keyword, bit in bits.items():
+        by_term.setdefault(keyword.strip(), []).append(bit)
+
+    weights: Dict[int, float] = {}
+    for preference in preferences:
+        weight = preference.weight if preference.weight is not None else 1.0
+        for term in set(preference_terms(preference)):
+            for bit in by_term.get(term, []):
+                weights[bit] = weights.get(bit, 0.0) + weight
+    return weights
+
+
+def preference_signature(preferences) -> str:
+    """Hash of a preference set, used as the ranking cache key."""
+    data = sorted((p.topic, p.weight, p.keywords or "") for p in preferences)
+    return hashlib.blake2b(repr(data).encode(), digest_size=8).hexdigest()
+
+
+def score_vectors(vectors: List[Optional[bytes]], weights: Dict[int, float]):
+    """
+    Compute the preference score of each keyword vector.
+
+    Args:
+        vectors: Keyword bitsets (None for articles without one)
+        weights: Weight per bit from preference_weights
+
+    Returns:
+        NumPy array with one dot product per vector
+    """
+    scores = np.zeros(len(vectors), dtype=np.float64)
+    width = max((len(v) for v in vectors if v), default=0)
+    columns = [bit for bit in weights if bit < width * 8]
+    if not columns:
+        return scores
+
+    packed = np.frombuffer(
+        b"".join((v or b"").ljust(width, b"\x00") for v in vectors), dtype=np.uint8
+    ).reshape(len(vectors), width)
+    hits = np.unpackbits(packed, axis=1, bitorder="little")[:, columns]
+    return hits @ np.array([weights[bit] for bit in columns], dtype=np.float64)
+
+
+def _generation(session):
+    """
+    Cheap marker that changes whenever classifications are added or rescored.
+
+    Both maxima are read from an index (separate subqueries, since SQLite
+    only optimizes a lone min/max). Deleted classifications don't change
+    it; their articles drop out of the page query and the cache TTL.
+    """
+    return tuple(
+        session.execute(
+            select(
+                select(func.max(Classification.id)).scalar_subquery(),
+                select(func.max(Classification.classified_date)).scalar_subquery(),
+            )
+        ).one()
+    )
+
+
+def personalized_ranking(session, category: Optional[str] = None) -> List[int]:
+    """
+    Rank the best classified articles by preference score.
+
+    The score is the dot product of the article's keyword vector with the
+    preference weights plus relevancy_score / 100, so articles matching no
+    preference keep their relevancy order. Ties go to the newest article.
+    Candidates are the settings.for_you_candidates articles with the highest
+    hot_score.
+
+    Args:
+        session: Open database session
+        category: Only rank this category (None for all)
+
+    Returns:
+        Article IDs, best first; empty if there are no preferences
+    """
+    preferences = session.query(UserPreference).all()
+    if not preferences:
+        return []
+
+    key = (preference_signature(preferences), category, _generation(session))
+    cached = _rankings.get(key)
+    if cached is not None and time.monotonic() - cached[0] < RANKING_CACHE_TTL:
+        _rankings.move_to_end(key)
+        record_cache("personalized_ranking", True)
+        return cached[1]
+    record_cache("personalized_ranking", False)
+
+    start = time.perf_counter()
+    weights = preference_weights(
+        preferences,
+        load_keyword_bits(session),
+    )
+
+    # Candidates in ix_articles_hot_top order, as for the Top sort (archived
+    # articles are not ranked); near-duplicates are only shown through their
+    # first article
+    classified = select(Classification.article_id)
+    if category:
+        classified = classified.where(Classification.category == category)
+    candidates = (
+        select(Article.id)
+        .where(
+            Article.duplicate_of.is_(None),
+            Article.archived_date.is_(None),
+            Article.id.in_(classified),
+        )
+        .order_by(Article.hot_score.desc().nullslast(), Article.id.desc())
+        .limit(settings.for_you_candidates)
+    )
+    query = (
+        select(
+            Article.id,
+            Article.keyword_vector,
+            Classification.relevancy_score,
+            Article.published_date,
+        )
+        .join(Classification)
+        .where(Article.id.in_(candidates))
+    )
+    if category:
+        query = query.where(Classification.category == category)
+
+    ids, vectors, relevancy, dates, seen = [], [], [], [], set()
+    for article_id, vector, relevancy_score, published in session.execute(query):
+        if article_id in seen:
+            continue
+        seen.add(article_id)
+        ids.append(article_id)
+        vectors.append(vector)
+        relevancy.append(relevancy_score or 0.0)
+        dates.append(published.timestamp() if published else float("-inf"))
+
+    scores = score_vectors(vectors, weights) + np.array(relevancy) / 100
+    order = np.lexsort((-np.array(dates), -scores))
+    ranking = [ids[i] for i in order]
+
+    _rankings[key] = (time.monotonic(), ranking)
+    _rankings.move_to_end(key)
+    while len(_rankings) > RANKING_CACHE_SIZE:
+        _rankings.popitem(last=False)
+
+    logger.info(
+        f"Ranked {len(ranking)} articles for {len(preferences)} preferences "
+        f"in {(time.perf_counter() - start) * 1000:.0f}ms"
+    )
+    return ranking
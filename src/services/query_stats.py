@@ -0,0 +1,177 @@
+"""SQL statement timing, per-request query counts and the slow-query log.
+
+install() hooks every SQLAlchemy engine (sync and async, primary and
+replica) once. Each statement is timed with perf_counter between the
+before/after_cursor_execute events, and:
+
+- statements slower than settings.slow_query_ms are logged with their
+  SQL and the types of their parameters, never the values;
+- the time is added to the QueryStats of the current request or job, if
+  one is being tracked (track_queries). The QueryStats object is held in
+  a ContextVar, which reaches thread pool handlers and AsyncSession
+  run_sync calls of the same request.
+
+QueryStatsMiddleware tracks every HTTP request and, with settings.debug,
+reports the numbers in a Server-Timing header (shown by browser dev
+tools) and X-DB-Queries.
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.config import settings
+from src.services.metrics import DB_QUERY_LATENCY
+
+logger = logging.getLogger(__name__)
+
+# Longest statement text written to the slow-query log
+MAX_LOGGED_SQL = 2000
+
+_current: ContextVar[Optional["QueryStats"]] = ContextVar("query_stats", default=None)
+_installed = False
+
+
+class QueryStats:
+    """Query count and database time of one request or job."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.slowest = 0.0
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.seconds += seconds
+        self.slowest = max(self.slowest, seconds)
+
+    def server_timing(self) -> str:
+        """Value for a Server-Timing response header."""
+        return f'db;dur={self.seconds * 1000:.1f};desc="{self.count} queries"'
+
+    def __str__(self):
+        return (
+            f"{self.count} queries in {self.seconds * 1000:.1f}ms "
+            f"(slowest {self.slowest * 1000:.1f}ms)"
+        )
+
+
+def current_stats() -> Optional[QueryStats]:
+    """QueryStats of the request or job being tracked, if any."""
+    return _current.get()
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """
+    Count the statements run inside the block.
+
+    Usage:
+        with track_queries() as stats:
+            ...
+        logger.info(f"DB: {stats}")
+    """
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def redact_parameters(parameters) -> str:
+    """Describe statement parameters by type only, e.g. "(str, int)"."""
+    if (
+        isinstance(parameters, (list, tuple))
+        and parameters
+        and (isinstance(parameters[0], (list, tuple, dict)))
+    ):
+        # executemany: describe the first row
+        return f"{redact_parameters(parameters[0])} x {len(parameters)} rows"
+    if isinstance(parameters, dict):
+        values = parameters.values()
+    elif isinstance(parameters, (list, tuple)):
+        values = parameters
+    else:
+        return "()"
+    return "(" + ", ".join(type(value).__name__ for value in values) + ")"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("query_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    DB_QUERY_LATENCY.observe(elapsed)
+
+    stats = _current.get()
+    if stats is not None:
+        stats.add(elapsed)
+
+    if settings.slow_query_ms and elapsed * 1000 >= settings.slow_query_ms:
+        sql = " ".join(statement.split())
+        if len(sql) > MAX_LOGGED_SQL:
+            sql = sql[:MAX_LOGGED_SQL] + "..."
+        logger.warning(
+            f"🐢 Slow query ({elapsed * 1000:.1f}ms): {sql} "
+            f"params={redact_parameters(parameters)}"
+        )
+
+
+def _handle_error(context):
+    # The after event never fires for a failed statement
+    starts = context.connection.info.get("query_start") if context.connection else None
+    if starts:
+        starts.pop()
+
+
+def install():
+    """Hook statement timing into all engines (idempotent)."""
+    global _installed
+    if _installed:
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Engine, "handle_error", _handle_error)
+    _installed = True
+
+
+class QueryStatsMiddleware:
+    """ASGI middleware tracking the queries of each HTTP request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        with track_queries() as stats:
+
+            async def send_with_stats(message):
+                if message["type"] == "http.response.start" and settings.debug:
+                    headers = list(message.get("headers", []))
+                    headers += [
+                        (b"server-timing", stats.server_timing().encode("latin-1")),
+                        (b"x-db-queries", str(stats.count).encode("latin-1")),
+                    ]
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_with_stats)
+
+        logger.debug(
+            f"{scope.get('method')} {scope.get('path')}: {stats}, "
+            f"{(time.perf_counter() - start) * 1000:.1f}ms total"
+        )
@@ -0,0 +1,445 @@
+"""Keyword-set versioning and incremental reclassification of stored articles.
+
+Every Classification records the keyword_version of the relevance keyword
+sets that produced it, and a snapshot of each version's sets is kept in
+keyword_sets. The article_keywords table is an inverted index of the
+keywords found in each article.
+
+When the keyword sets change, only some articles can get a different
+result:
+- articles containing a keyword of a category whose list changed, since the
+  category's percentage depends on its list length;
+- articles containing a global keyword that was added or removed.
+
+Keywords that already existed in the old sets are looked up in the inverted
+index. Brand-new keywords cannot be in the index, so articles are scanned for
+them with the batch matcher. Only the resulting candidates are rescored.
+
+Archived articles (src/services/tiering.py) are skipped and keep the
+keyword_version of their last result, along with its snapshot; they are
+rescored by rescore_articles when restored.
+"""
+
+import json
+import logging
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import delete, insert, or_, select, update
+
+from src.collectors.parallel_classify import classify_parallel
+from src.collectors.relevance_batch import contains_any
+from src.collectors.relevance_filter import (
+    GLOBAL_KEYWORD_GROUP,
+    get_keyword_sets,
+    keyword_version,
+    rank_tags,
+)
+from src.services.facets import bump_facets
+from src.services.hot_ranking import refresh_hot_scores
+from src.services.personalization import encode_keyword_vector, keyword_bits
+from src.services.tags import save_article_tags
+from src.database import (
+    get_session,
+    Article,
+    ArticleKeyword,
+    Classification,
+    KeywordSet,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def save_keyword_set(session, keyword_sets: Optional[Dict[str, List[str]]] = None):
+    """
+    Make sure a snapshot of the keyword sets exists.
+
+    Args:
+        session: Open database session (committed by the caller)
+        keyword_sets: Keyword sets to store (default: the current ones)
+
+    Returns:
+        The keyword_version of the sets
+    """
+    if keyword_sets is None:
+        keyword_sets = get_keyword_sets()
+    version = keyword_version(keyword_sets)
+
+    exists = session.execute(
+        select(KeywordSet.id).where(KeywordSet.version == version)
+    ).first()
+    if not exists:
+        session.add(KeywordSet(version=version, keywords=json.dumps(keyword_sets)))
+    return version
+
+
+def index_article_keywords(session, keywords_by_article: Dict[int, List[str]]):
+    """
+    Replace the inverted index entries and keyword vectors of the given articles.
+
+    Args:
+        session: Open database session (committed by the caller)
+        keywords_by_article: Mapping of article ID to the keywords it contains
+    """
+    if not keywords_by_article:
+        return
+
+    session.execute(
+        delete(ArticleKeyword).where(
+            ArticleKeyword.article_id.in_(list(keywords_by_article))
+        )
+    )
+    rows = [
+        {"article_id": article_id, "keyword": keyword}
+        for article_id, keywords in keywords_by_article.items()
+        for keyword in keywords
+    ]
+    if rows:
+        session.execute(insert(ArticleKeyword), rows)
+
+    # Compact copy of the same data for preference scoring
+    bits = keyword_bits(session, {row["keyword"] for row in rows})
+    session.execute(
+        update(Article),
+        [
+            {"id": article_id, "keyword_vector": encode_keyword_vector(keywords, bits)}
+            for article_id, keywords in keywords_by_article.items()
+        ],
+    )
+
+
+def diff_keyword_sets(
+    old_sets: Dict[str, List[str]], new_sets: Dict[str, List[str]]
+) -> Tuple[Set[str], Set[str]]:
+    """
+    Work out which keywords identify articles whose result may change.
+
+    Args:
+        old_sets: Keyword sets the stored results were computed with
+        new_sets: Current keyword sets
+
+    Returns:
+        Tuple of (keywords to look up in the inverted index, new keywords
+        that need a text scan)
+    """
+    old_keywords = {kw for kws in old_sets.values() for kw in kws}
+
+    # Category order decides ties, so reordering affects every category
+    old_order = [c for c in old_sets if c != GLOBAL_KEYWORD_GROUP and c in new_sets]
+    new_order = [c for c in new_sets if c != GLOBAL_KEYWORD_GROUP and c in old_sets]
+    reordered = old_order != new_order
+
+    lookup, scan = set(), set()
+    for group in dict.fromkeys(list(old_sets) + list(new_sets)):
+        old, new = old_sets.get(group, []), new_sets.get(group, [])
+        if group == GLOBAL_KEYWORD_GROUP:
+            # Only membership matters for the "any AI keyword" check
+            changed = set(old) ^ set(new)
+        elif old != new or reordered:
+            # Every percentage in the category depends on its list
+            changed = set(old) | set(new)
+        else:
+            continue
+
+        for keyword in changed:
+            (lookup if keyword in old_keywords else scan).add(keyword)
+
+    return lookup, scan
+
+
+def _rescore(
+    session,
+    batch: List[Tuple[int, str, str]],
+    version: str,
+    stats: Dict,
+    workers: Optional[int] = 1,
+):
+    """Rescore a batch of (article ID, title, content) rows and write the results."""
+    ids = [article_id for article_id, _, _ in batch]
+    outcomes = classify_parallel(
+        [(title, content) for _, title, content in batch], workers
+    )
+
+    existing: Dict[int, list] = {}
+    for row in session.execute(
+        select(
+            Classification.id,
+            Classification.article_id,
+            Classification.category,
+            Classification.confidence,
+            Classification.relevancy_score,
+        ).where(Classification.article_id.in_(ids))
+    ):
+        existing.setdefault(row.article_id, []).append(row)
+
+    now = datetime.utcnow()
+    updates, inserts, deletes = [], [], []
+    category_deltas = Counter()
+    for article_id, (result, _) in zip(ids, outcomes):
+        rows = existing.get(article_id, [])
+        category_deltas.subtract(("category", row.category) for row in rows)
+        if result is None:
+            deletes.extend(row.id for row in rows)
+            continue
+        category_deltas[("category", result["category"])] += max(len(rows), 1)
+
+        values = {
+            "category": result["category"],
+            "confidence": result["confidence"],
+            "relevancy_score": result["relevancy_score"],
+            "keyword_version": version,
+            "classified_date": now,
+        }
+        if not rows:
+            inserts.append({"article_id": article_id, **values})
+        for row in rows:
+            if (row.category, row.confidence, row.relevancy_score) != (
+                result["category"],
+                result["confidence"],
+                result["relevancy_score"],
+            ):
+                updates.append({"id": row.id, **values})
+
+    if updates:
+        session.execute(update(Classification), updates)
+    if inserts:
+        session.execute(insert(Classification), inserts)
+    if deletes:
+        session.execute(delete(Classification).where(Classification.id.in_(deletes)))
+    bump_facets(session, category_deltas)
+    refresh_hot_scores(session, ids)
+
+    index_article_keywords(
+        session,
+        {article_id: keywords for article_id, (_, keywords) in zip(ids, outcomes)},
+    )
+    save_article_tags(
+        session,
+        {
+            article_id: result["tags"] if result else rank_tags(keywords)
+            for article_id, (result, keywords) in zip(ids, outcomes)
+        },
+    )
+
+    stats["candidates"] += len(batch)
+    stats["changed"] += len(updates)
+    stats["added"] += len(inserts)
+    stats["removed"] += len(deletes)
+
+
+def rescore_articles(
+    session,
+    article_ids: Iterable[int],
+    batch_size: int = 1000,
+    workers: Optional[int] = 1,
+) -> Dict:
+    """
+    Rescore specific articles with the current keyword sets.
+
+    Args:
+        session: Open database session (committed by the caller)
+        article_ids: Articles to rescore, e.g. ones just restored from the
+            cold archive
+        batch_size: Articles rescored per batch
+        workers: Processes used to rescore each batch
+
+    Returns:
+        Dict with counts of "candidates" rescored, classifications
+        "changed", "added" and "removed"
+    """
+    current = save_keyword_set(session)
+    stats = {"candidates": 0, "changed": 0, "added": 0, "removed": 0}
+    ids = sorted(set(article_ids))
+    for start in range(0, len(ids), batch_size):
+        chunk = ids[start : start + batch_size]
+        rows = session.execute(
+            select(Article.id, Article.title, Article.content)
+            .where(Article.id.in_(chunk))
+            .order_by(Article.id)
+        ).all()
+        _rescore(
+            session,
+            [
+                (article_id, title or "", content or "")
+                for article_id, title, content in rows
+            ],
+            current,
+            stats,
+            workers,
+        )
+        # _rescore only rewrites results that changed
+        session.execute(
+            update(Classification)
+            .where(Classification.article_id.in_(chunk))
+            .values(keyword_version=current)
+        )
+    return stats
+
+
+def _stream(session, query, batch_size: int) -> Iterable[List[Tuple[int, str, str]]]:
+    """Yield (article ID, title, content) batches from a streamed query."""
+    result = session.execute(query.execution_options(yield_per=batch_size))
+    for partition in result.partitions():
+        yield [(row[0], row[1] or "", row[2] or "") for row in partition]
+
+
+def reclassify_articles(
+    full: bool = False,
+    batch_size: int = 1000,
+    dry_run: bool = False,
+    workers: Optional[int] = 1,
+) -> Dict:
+    """
+    Bring stored classifications up to date with the current keyword sets.
+
+    Args:
+        full: Rescore every article instead of only the affected ones
+        batch_size: Articles streamed and rescored per batch
+        dry_run: Compute everything but roll back instead of committing
+        workers: Processes used to rescore each batch (0 for one per core);
+            only batches of at least MIN_PARALLEL_ARTICLES are split up
+
+    Returns:
+        Dict with the current "version", whether a "full" pass ran, and
+        counts of "candidates" rescored, classifications "changed", "added"
+        and "removed"
+    """
+    current_sets = get_keyword_sets()
+    current = keyword_version(current_sets)
+    stats = {
+        "version": current,
+        "full": full,
+        "candidates": 0,
+        "changed": 0,
+        "added": 0,
+        "removed": 0,
+    }
+
+    session = get_session()
+    try:
+        snapshots = {
+            row.version: json.loads(row.keywords) for row in session.query(KeywordSet)
+        }
+        # Archived articles (src/services/tiering.py) keep their results
+        hot = select(Article.id).where(Article.archived_date.is_(None))
+        versions = set(
+            session.execute(
+                select(Classification.keyword_version)
+                .where(Classification.article_id.in_(hot))
+                .distinct()
+            ).scalars()
+        )
+        # Snapshots kept only for archived results don't need a diff
+        archived_only = (
+            set(
+                session.execute(
+                    select(Classification.keyword_version)
+                    .where(Classification.article_id.not_in(hot))
+                    .distinct()
+                ).scalars()
+            )
+            - versions
+        )
+        stale = (versions | set(snapshots)) - archived_only - {current}
+
+        # Without a snapshot to diff against, everything has to be rescored.
+        # No snapshot at all also means the inverted index was never built.
+        if not snapshots or any(v is None or v not in snapshots for v in stale):
+            full = True
+        stats["full"] = full
+
+        lookup, scan = set(), set()
+        if not full and stale:
+            for version in stale:
+                version_lookup, version_scan = diff_keyword_sets(
+                    snapshots[version], current_sets
+                )
+                lookup |= version_lookup
+                scan |= version_scan
+            logger.info(
+                f"Keyword sets changed since {sorted(stale)}: "
+                f"{len(lookup)} indexed keywords, {len(scan)} new keywords"
+            )
+
+        query = (
+            select(Article.id, Article.title, Article.content)
+            .where(Article.archived_date.is_(None))
+            .order_by(Article.id)
+        )
+        indexed = select(ArticleKeyword.article_id).where(
+            ArticleKeyword.keyword.in_(sorted(lookup))
+        )
+
+        if full:
+            batches = _stream(session, query, batch_size)
+        elif scan:
+            # New keywords aren't in the index: stream everything and scan for them
+            lookup_ids = (
+                set(session.execute(indexed.distinct()).scalars()) if lookup else set()
+            )
+
+            def scanned():
+                for batch in _stream(session, query, batch_size):
+                    found = contains_any(
+                        [(title, content) for _, title, content in batch],
+                        sorted(scan),
+                    )
+                    yield [
+                        row
+                        for row, hit in zip(batch, found)
+                        if hit or row[0] in lookup_ids
+                    ]
+
+            batches = scanned()
+        elif lookup:
+            # The IN subquery is evaluated before the first rescored batch
+            # rewrites article_keywords
+            batches = _stream(session, query.where(Article.id.in_(indexed)), batch_size)
+        else:
+            batches = []
+
+        for batch in batches:
+            if batch:
+                _rescore(session, batch, current, stats, workers)
+
+        # Everything not rescored is unaffected by the change; archived
+        # articles weren't looked at and keep their version
+        session.execute(
+            update(Classification)
+            .where(
+                or_(
+                    Classification.keyword_version.is_(None),
+                    Classification.keyword_version != current,
+                ),
+                Classification.article_id.in_(hot),
+            )
+            .values(keyword_version=current)
+        )
+        # Keep the snapshots archived results still refer to
+        referenced = select(Classification.keyword_version).where(
+            Classification.keyword_version.is_not(None)
+        )
+        session.execute(
+            delete(KeywordSet).where(
+                KeywordSet.version != current, KeywordSet.version.not_in(referenced)
+            )
+        )
+        save_keyword_set(session, current_sets)
+
+        if dry_run:
+            session.rollback()
+        else:
+            session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+    logger.info(
+        f"✓ Reclassified {stats['candidates']} articles ({'full' if full else 'incremental'}): "
+        f"{stats['changed']} changed, {stats['added']} newly classified, "
+        f"{stats['removed']} no longer relevant"
+    )
+    return stats
@@ -0,0 +1,280 @@
+"""Compact database snapshots for cloning production into dev or staging.
+
+A snapshot is one gzip-compressed JSON-lines file:
+
+    {"format": "greenai-snapshot", "version": 1, "created": "...", "tables": [...]}
+    {"table": "articles", "columns": ["id", "title", ...]}
+    [1, "Title", ...]
+    [2, "Another title", ...]
+    {"table": "classifications", "columns": [...]}
+    ...
+
+Rows are JSON arrays in the order of their table's column list, so column
+names are not repeated per row. Binary columns are base64 and dates ISO
+8601 strings. Both directions stream in chunks (src/services/bulk_io.py),
+and restores bulk-load into tables whose secondary indexes are dropped
+first and built once at the end, also when the load fails.
+
+Replacing a subset of tables also empties the tables that reference them
+(e.g. replacing articles clears classifications and article_tags), and
+facet counts are recomputed after every import.
+"""
+
+import base64
+import gzip
+import json
+import logging
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import Date, DateTime, LargeBinary, Table, delete
+
+from src.database import Base, get_engine
+from src.services.bulk_io import (
+    DEFAULT_CHUNK_SIZE,
+    Throughput,
+    bulk_insert,
+    create_indexes,
+    drop_indexes,
+    existing_columns,
+    max_id,
+    reset_sequence,
+    stream_rows,
+    table_order,
+)
+from src.services.facets import rebuild_facets
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = "greenai-snapshot"
+SNAPSHOT_VERSION = 1
+
+
+def _encoder(column):
+    """Return a function turning a column value into a JSON value."""
+    if isinstance(column.type, LargeBinary):
+        return lambda v: None if v is None else base64.b64encode(v).decode("ascii")
+    if isinstance(column.type, (DateTime, Date)):
+        return lambda v: None if v is None else v.isoformat()
+    return lambda v: v
+
+
+def _decoder(column):
+    """Return a function turning a JSON value back into a column value."""
+    if isinstance(column.type, LargeBinary):
+        return lambda v: None if v is None else base64.b64decode(v)
+    if isinstance(column.type, DateTime):
+        return lambda v: None if v is None else datetime.fromisoformat(v)
+    if isinstance(column.type, Date):
+        return lambda v: None if v is None else date.fromisoformat(v)
+    return lambda v: v
+
+
+def dependent_tables(metadata, tables: List[Table]) -> List[Table]:
+    """
+    Tables referencing any of tables through a foreign key, transitively.
+
+    Args:
+        metadata: MetaData holding the models
+        tables: Referenced tables
+
+    Returns:
+        The referencing tables not in tables, parents before children
+    """
+    found = {table.name for table in tables}
+    changed = True
+    while changed:
+        changed = False
+        for table in metadata.sorted_tables:
+            if table.name not in found and any(
+                key.column.table.name in found for key in table.foreign_keys
+            ):
+                found.add(table.name)
+                changed = True
+    selected = {table.name for table in tables}
+    return [
+        table
+        for table in metadata.sorted_tables
+        if table.name in found and table.name not in selected
+    ]
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def export_snapshot(
+    path: str,
+    tables: Optional[List[str]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Dict[str, int]:
+    """
+    Write the current database to a snapshot file.
+
+    Args:
+        path: Output file (conventionally *.jsonl.gz)
+        tables: Table names to export (default: all)
+        chunk_size: Rows read per query
+
+    Returns:
+        Dict mapping table name to rows exported
+    """
+    engine = get_engine()
+    selected = table_order(Base.metadata, tables)
+    counts = {}
+    total = Throughput()
+
+    with engine.connect() as conn, gzip.open(path, "wt", encoding="utf-8") as out:
+        out.write(
+            _dumps(
+                {
+                    "format": SNAPSHOT_FORMAT,
+                    "version": SNAPSHOT_VERSION,
+                    "created": datetime.utcnow().isoformat(),
+                    "tables": [table.name for table in selected],
+                }
+            )
+            + "\n"
+        )
+        for table in selected:
+            columns = existing_columns(conn, table)
+            if not columns:
+                continue
+            encoders = [_encoder(table.c[name]) for name in columns]
+            out.write(_dumps({"table": table.name, "columns": columns}) + "\n")
+
+            counts[table.name] = 0
+            for rows in stream_rows(conn, table, columns, chunk_size):
+                out.write(
+                    "".join(
+                        _dumps(
+                            [
+                                encode(row[name])
+                                for encode, name in zip(encoders, columns)
+                            ]
+                        )
+                        + "\n"
+                        for row in rows
+                    )
+                )
+                counts[table.name] += len(rows)
+                total.add(len(rows))
+            logger.info(f"  ✓ {table.name}: {counts[table.name]:,} rows")
+
+    logger.info(f"✅ Exported {total} to {path}")
+    return counts
+
+
+def import_snapshot(
+    path: str, chunk_size: int = DEFAULT_CHUNK_SIZE, replace: bool = False
+) -> Dict[str, int]:
+    """
+    Restore a snapshot file into the current database.
+
+    Args:
+        path: Snapshot file from export_snapshot
+        chunk_size: Rows inserted per batch
+        replace: Delete existing rows of the snapshot's tables, and of the
+            tables referencing them, first (otherwise the snapshot's tables
+            must be empty)
+
+    Returns:
+        Dict mapping table name to rows imported
+    """
+    engine = get_engine()
+    Base.metadata.create_all(bind=engine)
+
+    with gzip.open(path, "rt", encoding="utf-8") as snapshot:
+        header = json.loads(snapshot.readline())
+        if header.get("format") != SNAPSHOT_FORMAT:
+            raise ValueError(f"{path} is not a snapshot file")
+        if header.get("version", 0) > SNAPSHOT_VERSION:
+            raise ValueError(
+                f"{path} has snapshot version {header['version']}; "
+                f"this version reads up to {SNAPSHOT_VERSION}"
+            )
+        known = {table.name for table in Base.metadata.sorted_tables}
+        selected = table_order(
+            Base.metadata, [name for name in header["tables"] if name in known]
+        )
+
+        with engine.begin() as conn:
+            if replace:
+                dependents = dependent_tables(Base.metadata, selected)
+                if dependents:
+                    logger.warning(
+                        "⚠️ Also clearing tables that reference the snapshot's: "
+                        f"{', '.join(table.name for table in dependents)}"
+                    )
+                for table in reversed(
+                    table_order(
+                        Base.metadata, [table.name for table in selected + dependents]
+                    )
+                ):
+                    conn.execute(delete(table))
+            occupied = [table.name for table in selected if max_id(conn, table)]
+        if occupied:
+            raise ValueError(
+                f"Tables are not empty: {', '.join(occupied)} (use replace to overwrite)"
+            )
+
+        drop_indexes(engine, selected)
+        try:
+            counts, total = _load_rows(snapshot, engine, chunk_size)
+            with engine.begin() as conn:
+                for table in selected:
+                    reset_sequence(conn, table)
+        finally:
+            # Also after a failed load, so the unique url_hash index is back
+            logger.info("📇 Building indexes...")
+            create_indexes(engine, selected)
+
+    rebuild_facets()
+    logger.info(f"✅ Imported {total} from {path}")
+    return counts
+
+
+def _load_rows(snapshot, engine, chunk_size: int):
+    """Insert the table records following a snapshot header; returns counts."""
+    counts = {}
+    total = Throughput()
+    table = None
+    batch: List[Dict] = []
+
+    def flush():
+        if batch:
+            with engine.begin() as conn:
+                bulk_insert(conn, table, batch)
+            counts[table.name] += len(batch)
+            total.add(len(batch))
+            batch.clear()
+
+    for line in snapshot:
+        record = json.loads(line)
+        if isinstance(record, dict):
+            if table is not None:
+                flush()
+                logger.info(f"  ✓ {table.name}: {counts[table.name]:,} rows")
+            table = Base.metadata.tables.get(record["table"])
+            if table is None:
+                logger.warning(f"Skipping unknown table {record['table']}")
+                continue
+            columns = record["columns"]
+            keep = [
+                (i, name, _decoder(table.c[name]))
+                for i, name in enumerate(columns)
+                if name in table.c
+            ]
+            counts[table.name] = 0
+            continue
+        if table is None:
+            continue
+
+        batch.append({name: decode(record[i]) for i, name, decode in keep})
+        if len(batch) >= chunk_size:
+            flush()
+
+    if table is not None:
+        flush()
+        logger.info(f"  ✓ {table.name}: {counts[table.name]:,} rows")
+    return counts, total
@@ -0,0 +1,195 @@
+"""Normalized article tags.
+
+Tags are the category keywords the relevance filter found in an article,
+ranked by relevance_filter.rank_tags. They come out of the classification
+pass itself, so tagging never scans article text again. Each tag name is
+stored once in the tags table and linked to articles through the indexed
+article_tags table, so filtering by tag is an index lookup instead of a
+LIKE scan over comma-separated strings.
+"""
+
+import logging
+from collections import Counter
+from typing import Dict, Iterable, List
+
+from sqlalchemy import delete, func, insert, select
+
+from src.collectors.relevance_batch import classify_and_match
+from src.collectors.relevance_filter import rank_tags
+from src.database import (
+    get_session,
+    Article,
+    ArchivedArticle,
+    ArticleKeyword,
+    ArticleTag,
+    Classification,
+    Tag,
+)
+from src.services.facets import bump_facets
+
+logger = logging.getLogger(__name__)
+
+
+def tag_ids(session, names: Iterable[str]) -> Dict[str, int]:
+    """
+    Return the ID of every given tag name, adding new ones.
+
+    Args:
+        session: Open database session (committed by the caller)
+        names: Tag names that need an ID
+
+    Returns:
+        Dict mapping tag name to tag ID
+    """
+    names = list(dict.fromkeys(names))
+    if not names:
+        return {}
+
+    ids = dict(
+        session.execute(select(Tag.name, Tag.id).where(Tag.name.in_(names))).all()
+    )
+    added = [Tag(name=name) for name in names if name not in ids]
+    if added:
+        session.add_all(added)
+        session.flush()
+        ids.update((tag.name, tag.id) for tag in added)
+    return ids
+
+
+def save_article_tags(session, tags_by_article: Dict[int, List[str]]):
+    """
+    Replace the tags of the given articles, keeping the tag facet counts current.
+
+    Args:
+        session: Open database session (committed by the caller)
+        tags_by_article: Mapping of article ID to its tags, best first
+    """
+    if not tags_by_article:
+        return
+
+    deltas = Counter()
+    for tags in load_article_tags(session, tags_by_article).values():
+        deltas.subtract(("tag", tag) for tag in tags)
+    for tags in tags_by_article.values():
+        deltas.update(("tag", tag) for tag in tags)
+
+    session.execute(
+        delete(ArticleTag).where(ArticleTag.article_id.in_(list(tags_by_article)))
+    )
+    ids = tag_ids(session, (tag for tags in tags_by_article.values() for tag in tags))
+    rows = [
+        {"article_id": article_id, "tag_id": ids[tag], "rank": rank}
+        for article_id, tags in tags_by_article.items()
+        for rank, tag in enumerate(tags)
+    ]
+    if rows:
+        session.execute(insert(ArticleTag), rows)
+    bump_facets(session, deltas)
+
+
+def load_article_tags(session, article_ids: Iterable[int]) -> Dict[int, List[str]]:
+    """
+    Return the tags of the given articles.
+
+    Args:
+        session: Open database session
+        article_ids: Articles to look up
+
+    Returns:
+        Dict mapping article ID to its tags, best first (articles without
+        tags are left out)
+    """
+    rows = session.execute(
+        select(ArticleTag.article_id, Tag.name)
+        .join(Tag, Tag.id == ArticleTag.tag_id)
+        .where(ArticleTag.article_id.in_(list(article_ids)))
+        .order_by(ArticleTag.article_id, ArticleTag.rank)
+    )
+    tags: Dict[int, List[str]] = {}
+    for article_id, name in rows:
+        tags.setdefault(article_id, []).append(name)
+    return tags
+
+
+def tagged_article_ids(tag: str):
+    """Select statement for the IDs of the articles carrying a tag."""
+    return (
+        select(ArticleTag.article_id)
+        .join(Tag, Tag.id == ArticleTag.tag_id)
+        .where(Tag.name == tag)
+    )
+
+
+def rebuild_tags(batch_size: int = 1000) -> int:
+    """
+    Recompute the tags of every stored article from the keyword index.
+
+    Uses the article_keywords inverted index and the stored category.
+    Articles without index rows (e.g. stored before the index existed, until
+    reclassify_articles.py --full builds it) are matched from their text,
+    read from the cold archive if needed.
+
+    Args:
+        batch_size: Articles written per transaction
+
+    Returns:
+        Number of articles processed
+    """
+    session = get_session()
+    count = 0
+    try:
+        ids = list(session.execute(select(Article.id).order_by(Article.id)).scalars())
+        for start in range(0, len(ids), batch_size):
+            batch = ids[start : start + batch_size]
+            keywords: Dict[int, List[str]] = {article_id: [] for article_id in batch}
+            for article_id, keyword in session.execute(
+                select(ArticleKeyword.article_id, ArticleKeyword.keyword).where(
+                    ArticleKeyword.article_id.in_(batch)
+                )
+            ):
+                keywords[article_id].append(keyword)
+            unindexed = [
+                article_id for article_id, found in keywords.items() if not found
+            ]
+            if unindexed:
+                rows = session.execute(
+                    select(
+                        Article.id,
+                        Article.title,
+                        func.coalesce(Article.content, ArchivedArticle.content),
+                    )
+                    .outerjoin(
+                        ArchivedArticle, ArchivedArticle.article_id == Article.id
+                    )
+                    .where(Article.id.in_(unindexed))
+                ).all()
+                matches = classify_and_match(
+                    (title or "", content or "") for _, title, content in rows
+                )
+                for (article_id, _, _), (_, found) in zip(rows, matches):
+                    keywords[article_id] = found
+            categories = dict(
+                session.execute(
+                    select(Classification.article_id, Classification.category).where(
+                        Classification.article_id.in_(batch)
+                    )
+                ).all()
+            )
+
+            save_article_tags(
+                session,
+                {
+                    article_id: rank_tags(found, categories.get(article_id))
+                    for article_id, found in keywords.items()
+                },
+            )
+            session.commit()
+            count += len(batch)
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+    logger.info(f"✓ Rebuilt tags of {count} articles")
+    return count
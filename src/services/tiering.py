@@ -0,0 +1,188 @@
+"""Hot/cold tiering of stored articles.
+
+The digest only shows recent articles, but every article ever fetched
+stays in the articles table. Articles older than settings.article_hot_days
+are archived: their content (by far the largest column) and MinHash
+signature move into the article_archive table, stored compressed. Their LSH
+bucket rows are deleted, since near-duplicates are only looked for among
+recent stories.
+
+The row left in articles is a slim stub: title, URL and URL hash, source,
+dates, snippet, summary, classification, tags and keyword vector stay, so
+links, duplicate checks and the archive filters keep working. The Top and
+For You rankings skip archived articles, and their index is partial on
+archived_date IS NULL, so it only grows with the hot tier; the url_hash
+index stays complete, since a re-fetched old URL must still be caught.
+Full content is read back on demand with archived_content, or moved back
+with restore_articles. Archived articles are skipped by reclassification
+and near-duplicate detection and keep their last results; restoring
+rescores them with the current keyword sets.
+
+On SQLite the database file only shrinks after a VACUUM.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from sqlalchemy import delete, func, insert, select, update
+
+from src.database import get_session, Article, ArchivedArticle, ArticleBucket
+from src.services.near_duplicates import save_buckets
+from src.services.reclassification import rescore_articles
+
+logger = logging.getLogger(__name__)
+
+
+def archive_old_articles(days: int, batch_size: int = 1000) -> int:
+    """
+    Move the content of articles older than days into the cold archive.
+
+    Age is measured from the publication date, or the fetch date for
+    articles without one.
+
+    Args:
+        days: Articles older than this are archived
+        batch_size: Articles moved per transaction
+
+    Returns:
+        Number of articles archived
+    """
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    session = get_session()
+    count = 0
+    try:
+        ids = list(
+            session.execute(
+                select(Article.id)
+                .where(
+                    Article.archived_date.is_(None),
+                    func.coalesce(Article.published_date, Article.fetched_date)
+                    < cutoff,
+                )
+                .order_by(Article.id)
+            ).scalars()
+        )
+        for start in range(0, len(ids), batch_size):
+            batch = ids[start : start + batch_size]
+            now = datetime.utcnow()
+            rows = session.execute(
+                select(Article.id, Article.content, Article.minhash).where(
+                    Article.id.in_(batch)
+                )
+            ).all()
+            session.execute(
+                insert(ArchivedArticle),
+                [
+                    {
+                        "article_id": article_id,
+                        "content": content,
+                        "minhash": minhash,
+                        "archived_date": now,
+                    }
+                    for article_id, content, minhash in rows
+                ],
+            )
+            session.execute(
+                update(Article),
+                [
+                    {
+                        "id": article_id,
+                        "content": None,
+                        "minhash": None,
+                        "archived_date": now,
+                    }
+                    for article_id, _, _ in rows
+                ],
+            )
+            session.execute(
+                delete(ArticleBucket).where(ArticleBucket.article_id.in_(batch))
+            )
+            session.commit()
+            count += len(rows)
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+    if count:
+        logger.info(f"🧊 Archived {count} articles older than {days} days")
+    return count
+
+
+def archived_content(session, article_id: int) -> Optional[str]:
+    """
+    Return the full content of an article, reading the cold archive if needed.
+
+    Args:
+        session: Open database session
+        article_id: Article ID
+
+    Returns:
+        Content, or None if the article has none or doesn't exist
+    """
+    row = session.execute(
+        select(Article.content, Article.archived_date).where(Article.id == article_id)
+    ).first()
+    if row is None:
+        return None
+    content, archived = row
+    if archived is None:
+        return content
+    return session.execute(
+        select(ArchivedArticle.content).where(ArchivedArticle.article_id == article_id)
+    ).scalar()
+
+
+def restore_articles(article_ids: Iterable[int]) -> int:
+    """
+    Move archived articles back into the hot table and rescore them.
+
+    Args:
+        article_ids: Articles to restore (ones that are not archived are ignored)
+
+    Returns:
+        Number of articles restored
+    """
+    session = get_session()
+    try:
+        rows = session.execute(
+            select(
+                ArchivedArticle.article_id,
+                ArchivedArticle.content,
+                ArchivedArticle.minhash,
+            ).where(ArchivedArticle.article_id.in_(list(article_ids)))
+        ).all()
+        if rows:
+            session.execute(
+                update(Article),
+                [
+                    {
+                        "id": article_id,
+                        "content": content,
+                        "minhash": minhash,
+                        "archived_date": None,
+                    }
+                    for article_id, content, minhash in rows
+                ],
+            )
+            save_buckets(
+                session, {article_id: minhash for article_id, _, minhash in rows}
+            )
+            # Reclassification skipped them while they were archived
+            rescore_articles(session, [row[0] for row in rows])
+            session.execute(
+                delete(ArchivedArticle).where(
+                    ArchivedArticle.article_id.in_([row[0] for row in rows])
+                )
+            )
+            session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+    logger.info(f"✓ Restored {len(rows)} archived articles")
+    return len(rows)
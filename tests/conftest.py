@@ -0,0 +1,26 @@
+"""Shared pytest fixtures."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src import database  # noqa: E402
+from src.config import settings  # noqa: E402
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """A fresh SQLite database file, used by get_engine/get_session."""
+    url = f"sqlite:///{tmp_path / 'test.db'}"
+    monkeypatch.setattr(settings, "database_url", url)
+    monkeypatch.setattr(settings, "database_read_url", None)
+    monkeypatch.setattr(settings, "feed_archive_enabled", False)
+    database.init_db()
+    yield url
+    for key in [key for key in database._engines if url in key]:
+        database._engines.pop(key).dispose()
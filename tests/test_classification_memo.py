@@ -0,0 +1,63 @@
+"""Classification memo (src/services/classification_memo.py)."""
+
+from sqlalchemy import event
+
+from src.database import get_read_engine, get_session
+from src.services.classification_memo import ClassificationMemo
+
+RESULT = {"category": "Green AI", "confidence": 0.8, "relevancy_score": 40.0}
+
+
+def test_prefetch_reads_a_batch_in_one_query(db):
+    memo = ClassificationMemo()
+    keys = [memo.key(f"Title {i}", f"<p>Content {i}</p>") for i in range(3)]
+    session = get_session()
+    for i, key in enumerate(keys[:2]):
+        memo.put(session, key, f"Content {i}", RESULT if i else None, ["energy"])
+    memo.flush(session)
+    session.commit()
+    session.close()
+
+    statements = []
+    engine = get_read_engine()
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        fresh = ClassificationMemo()
+        fresh.prefetch(keys)
+        entries = [fresh.get(key) for key in keys]
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert len(statements) == 1
+    assert entries[0].classification is None
+    assert entries[1].content == "Content 1"
+    assert entries[1].classification["category"] == "Green AI"
+    assert entries[2] is None
+    assert (fresh.hits, fresh.misses) == (2, 1)
+
+
+def test_flush_checks_stored_keys_in_one_query(db):
+    memo = ClassificationMemo()
+    keys = [memo.key(f"Title {i}", f"<p>Content {i}</p>") for i in range(5)]
+    session = get_session()
+    memo.put(session, keys[0], "Content 0", RESULT, ["energy"])
+    memo.flush(session)
+    session.commit()
+
+    statements = []
+    engine = session.get_bind()
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        for i, key in enumerate(keys):
+            memo.put(session, key, f"Content {i}", RESULT, ["energy"])
+        added = memo.flush(session)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    session.commit()
+    session.close()
+
+    # Only the existence check: the new rows are written on commit
+    assert len(statements) == 1
+    assert added == 4
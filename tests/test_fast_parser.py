@@ -0,0 +1,70 @@
+"""Fast feed parser (src/collectors/fast_parser.py) against feedparser."""
+
+import feedparser
+import pytest
+
+from src.collectors.fast_parser import FastParseError, parse_feed
+from src.collectors.rss_collector import RSSCollector
+from tests.conftest import FIXTURES
+
+FEED_URL = "https://example.org/feed"
+# Fields RSSCollector reads directly; summaries are compared after strip_html
+# since feedparser rewrites the markup (e.g. resolves relative src attributes)
+FIELDS = ("title", "link", "id", "published_parsed", "author", "feedburner_origlink")
+
+
+def _parse_both(name):
+    data = (FIXTURES / name).read_bytes()
+    fast = parse_feed(data, base_url=FEED_URL)
+    headers = {"content-location": FEED_URL, "content-type": "application/xml"}
+    slow = feedparser.parse(data, response_headers=headers)
+    assert not slow.bozo
+    assert len(fast) == len(slow.entries) > 0
+    return zip(fast, slow.entries)
+
+
+@pytest.mark.parametrize("name", ["rss.xml", "atom.xml", "rdf.xml"])
+def test_entry_fields_match_feedparser(name):
+    for fast, slow in _parse_both(name):
+        for field in FIELDS:
+            assert fast.get(field) == slow.get(field), field
+        assert [a.get("name") for a in fast.get("authors", [])] == [
+            a.get("name") for a in slow.get("authors", [])
+        ]
+        assert RSSCollector._entry_date(fast) == RSSCollector._entry_date(slow)
+
+
+@pytest.mark.parametrize("name", ["rss.xml", "atom.xml", "rdf.xml"])
+def test_articles_match_feedparser(name):
+    collector = RSSCollector()
+    for fast, slow in _parse_both(name):
+        assert collector._parse_entry(fast, "Fixture") == collector._parse_entry(
+            slow, "Fixture"
+        )
+
+
+def test_limit_stops_early():
+    data = (FIXTURES / "rss.xml").read_bytes()
+    assert [e.title for e in parse_feed(data, limit=2)] == [
+        e.title for e in parse_feed(data)[:2]
+    ]
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"<rss><channel><item><title>Broken</title></channel></rss>",
+        b"<html><body>Not a feed</body></html>",
+        b'<feed xmlns="http://www.w3.org/2005/Atom"><entry><title type="xhtml">'
+        b'<div xmlns="http://www.w3.org/1999/xhtml">x</div></title></entry></feed>',
+        b"<rss><channel><item><title>T</title><pubDate>someday</pubDate></item>"
+        b"</channel></rss>",
+        b"<rss><channel><item><title>T</title><description>&lt;script&gt;x()"
+        b"&lt;/script&gt;</description></item></channel></rss>",
+    ],
+)
+def test_falls_back_to_feedparser(data):
+    with pytest.raises(FastParseError):
+        parse_feed(data)
+    _, parser = RSSCollector.parse_entries(data, FEED_URL, "Fixture")
+    assert parser == "feedparser"
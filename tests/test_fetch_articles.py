@@ -0,0 +1,55 @@
+"""Legacy fetch script (scripts/fetch_articles.py)."""
+
+import pytest
+
+import scripts.fetch_articles as legacy
+import scripts.fetch_articles_modular as fetch
+from src.database import get_session, Article, ArticleTag, FacetCount, FetchRun
+from tests.conftest import FIXTURES
+
+
+@pytest.fixture
+def always_included_feed(monkeypatch):
+    feeds = [((FIXTURES / "rss.xml").as_uri(), "Fixture Feed", True)]
+    monkeypatch.setattr(fetch, "get_all_feeds", lambda: feeds)
+    monkeypatch.setattr(fetch.settings, "article_hot_days", 0)
+
+
+def test_unclassified_articles_are_dropped_even_when_always_included(
+    db, always_included_feed
+):
+    result = legacy.fetch_and_store_articles(max_per_feed=10)
+    assert (result["new"], result["filtered"]) == (2, 1)
+
+    session = get_session()
+    try:
+        titles = {title for (title,) in session.query(Article.title)}
+        assert "Untitled fashion news" not in titles
+        assert len(titles) == 2
+    finally:
+        session.close()
+
+
+def test_stores_derived_data(db, always_included_feed):
+    legacy.fetch_and_store_articles(max_per_feed=10)
+
+    session = get_session()
+    try:
+        articles = session.query(Article).all()
+        assert all(a.hot_score is not None and a.minhash for a in articles)
+        assert session.query(ArticleTag).count() > 0
+        facets = {(f.facet, f.value): f.count for f in session.query(FacetCount)}
+        assert facets[("source", "Fixture Feed")] == len(articles)
+        assert session.query(FetchRun).count() == 1
+    finally:
+        session.close()
+
+
+def test_modular_pipeline_keeps_unclassified_always_included(db, always_included_feed):
+    assert fetch.fetch_and_store_articles(max_per_feed=10)["new"] == 3
+
+
+def test_second_run_stops_at_high_water_marks(db, always_included_feed):
+    legacy.fetch_and_store_articles(max_per_feed=10)
+    result = legacy.fetch_and_store_articles(max_per_feed=10)
+    assert result["known"] == 3 and result["new"] == 0
@@ -0,0 +1,49 @@
+"""Fetch-run history (src/services/fetch_runs.py)."""
+
+import pytest
+
+import scripts.fetch_articles_modular as fetch
+from src.database import get_session, Article, FetchRun, FetchRunFeed
+from tests.conftest import FIXTURES
+
+
+@pytest.fixture
+def one_feed(monkeypatch):
+    feeds = [((FIXTURES / "rss.xml").as_uri(), "Fixture Feed", False)]
+    monkeypatch.setattr(fetch, "get_all_feeds", lambda: feeds)
+
+
+def test_successful_run_is_saved(db, one_feed):
+    result = fetch.fetch_and_store_articles(max_per_feed=10)
+
+    session = get_session()
+    try:
+        run = session.query(FetchRun).one()
+        assert run.status == "ok"
+        assert run.new == result["new"] > 0
+        assert run.entries == 3
+        assert run.parse_seconds > 0
+        feed = session.query(FetchRunFeed).one()
+        assert (feed.feed, feed.bytes > 0, feed.error) == ("Fixture Feed", True, None)
+    finally:
+        session.close()
+
+
+def test_failed_store_stage_is_saved_as_error(db, one_feed, monkeypatch):
+    def fail(session, marks):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(fetch, "save_high_water_marks", fail)
+
+    with pytest.raises(RuntimeError):
+        fetch.fetch_and_store_articles(max_per_feed=10)
+
+    session = get_session()
+    try:
+        run = session.query(FetchRun).one()
+        assert (run.status, run.error) == ("error", "disk full")
+        assert session.query(FetchRunFeed).count() == 1
+        # The failed store transaction was rolled back
+        assert session.query(Article).count() == 0
+    finally:
+        session.close()
@@ -0,0 +1,80 @@
+"""Top sort key (src/services/hot_ranking.py)."""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+import scripts.fetch_articles_modular as fetch
+from src.config import settings
+from src.database import get_session, Article
+from src.services.hot_ranking import hot_score, hot_scores_stale, update_hot_scores
+from src.services.pages import digest_page
+from tests.conftest import FIXTURES
+
+PUBLISHED = datetime(2025, 6, 1)
+
+
+def test_relevancy_outweighs_days_of_recency():
+    strong = hot_score(100, PUBLISHED)
+    # Within the default week-long scale a strong story beats newer weak ones
+    assert strong > hot_score(5, PUBLISHED + timedelta(days=5))
+    assert strong < hot_score(5, PUBLISHED + timedelta(days=14))
+
+
+def test_time_scale_setting(monkeypatch):
+    monkeypatch.setattr(settings, "hot_time_scale_days", 1.0)
+    assert hot_score(100, PUBLISHED) < hot_score(5, PUBLISHED + timedelta(days=5))
+    assert hot_score(0, PUBLISHED + timedelta(days=1)) - hot_score(0, PUBLISHED) == 1.0
+
+
+def test_scale_change_marks_scores_stale(db, monkeypatch):
+    feeds = [((FIXTURES / "rss.xml").as_uri(), "Fixture Feed", True)]
+    monkeypatch.setattr(fetch, "get_all_feeds", lambda: feeds)
+    fetch.fetch_and_store_articles(max_per_feed=10)
+    assert not hot_scores_stale()
+
+    monkeypatch.setattr(settings, "hot_time_scale_days", 1.0)
+    assert hot_scores_stale()
+    update_hot_scores(full=True)
+    assert not hot_scores_stale()
+
+
+def test_unscored_articles_rank_last(db, monkeypatch):
+    feeds = [((FIXTURES / "rss.xml").as_uri(), "Fixture Feed", True)]
+    monkeypatch.setattr(fetch, "get_all_feeds", lambda: feeds)
+    monkeypatch.setattr(fetch.settings, "article_hot_days", 0)
+    fetch.fetch_and_store_articles(max_per_feed=10)
+    session = get_session()
+    try:
+        session.execute(
+            update(Article)
+            .where(Article.id == select(func.min(Article.id)).scalar_subquery())
+            .values(hot_score=None)
+        )
+        page = digest_page(session, sort="top")
+        assert page["articles"][-1].hot_score is None
+    finally:
+        session.close()
+
+    # PostgreSQL sorts NULLs first in descending order unless told otherwise
+    ddl = [
+        str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+        for index in Article.__table__.indexes
+        if index.name == "ix_articles_hot_top_desc"
+    ]
+    assert ddl and ddl[0].endswith(
+        "(duplicate_of, hot_score DESC NULLS LAST) WHERE archived_date IS NULL"
+    )
+
+
+def test_fetch_run_recomputes_stale_scores(db, monkeypatch):
+    feeds = [((FIXTURES / "rss.xml").as_uri(), "Fixture Feed", True)]
+    monkeypatch.setattr(fetch, "get_all_feeds", lambda: feeds)
+    fetch.fetch_and_store_articles(max_per_feed=10)
+
+    monkeypatch.setattr(settings, "hot_time_scale_days", 1.0)
+    assert hot_scores_stale()
+    fetch.fetch_and_store_articles(max_per_feed=10)
+    assert not hot_scores_stale()
@@ -0,0 +1,104 @@
+"""Near-duplicate grouping (src/services/near_duplicates.py)."""
+
+from sqlalchemy import insert
+
+from src.database import get_session, Article
+from src.services.near_duplicates import (
+    NearDuplicateIndex,
+    detect_near_duplicates,
+    minhash,
+    similarity,
+)
+
+STORY = (
+    "Researchers at the national laboratory trained a neural network that "
+    "predicts solar power output for the regional grid up to two days ahead, "
+    "cutting the reserve capacity operators must keep running by a fifth and "
+    "lowering emissions from gas peaker plants during cloudy winter weeks"
+)
+REWRITE = STORY + " according to the team at the laboratory"
+OTHER = (
+    "A startup released an open dataset of hospital chest x-rays labelled by "
+    "radiologists so that diagnostic models can be validated across countries"
+)
+
+
+def test_similarity_separates_rewrites_from_other_stories():
+    story, rewrite, other = minhash(STORY), minhash(REWRITE), minhash(OTHER)
+    assert similarity(story, story) == 1.0
+    assert similarity(story, rewrite) > 0.7 > similarity(story, other)
+    assert minhash(" -- ") is None
+
+
+def test_index_returns_group_of_most_similar():
+    index = NearDuplicateIndex()
+    index.add(1, 1, minhash(STORY))
+    index.add(2, 2, minhash(OTHER))
+    assert index.find(minhash(REWRITE)) == 1
+    assert index.find(minhash(OTHER + " today")) == 2
+    assert index.find(minhash("an entirely unrelated text about cooking pasta")) is None
+
+
+def test_detect_groups_under_the_oldest_article(db):
+    session = get_session()
+    texts = [STORY, OTHER, REWRITE, STORY.replace("two days", "48 hours")]
+    for i, text in enumerate(texts):
+        session.add(
+            Article(
+                title="Neural network forecasts solar output",
+                url=f"https://example.org/{i}",
+                source="Fixture",
+                content=text,
+            )
+        )
+    session.commit()
+    session.close()
+
+    assert detect_near_duplicates(batch_size=2) == {
+        "articles": 4,
+        "near_duplicate": 2,
+    }
+
+    session = get_session()
+    try:
+        groups = dict(
+            session.query(Article.id, Article.duplicate_of).order_by(Article.id)
+        )
+    finally:
+        session.close()
+    first, other, rewrite, copy = sorted(groups)
+    assert groups == {first: None, other: None, rewrite: first, copy: first}
+
+
+def test_rebuild_keeps_url_spelling_links(db):
+    session = get_session()
+    first = Article(
+        title="Solar forecasts",
+        url="https://example.org/story",
+        source="Fixture",
+        content=STORY,
+    )
+    session.add(first)
+    session.flush()
+    # As left by backfill_url_hashes for another spelling of the same URL
+    session.execute(
+        insert(Article).values(
+            title="Solar forecasts",
+            url="http://www.example.org/story/",
+            url_hash=None,
+            source="Other",
+            content=OTHER,
+            duplicate_of=first.id,
+        )
+    )
+    session.commit()
+    spelling = session.query(Article).filter(Article.url_hash.is_(None)).one()
+    first_id, spelling_id = first.id, spelling.id
+    session.close()
+
+    for rebuild in (False, True):
+        detect_near_duplicates(rebuild=rebuild)
+        session = get_session()
+        assert session.get(Article, spelling_id).duplicate_of == first_id
+        assert session.get(Article, first_id).duplicate_of is None
+        session.close()
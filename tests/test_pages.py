@@ -0,0 +1,59 @@
+"""Page queries (src/services/pages.py)."""
+
+import pytest
+from sqlalchemy import delete, update
+
+import scripts.fetch_articles_modular as fetch
+from src.database import get_session, FacetCount
+from src.services.facets import parse_month
+from src.services.pages import archive_page
+from tests.conftest import FIXTURES
+
+
+@pytest.fixture
+def session(db, monkeypatch):
+    feeds = [((FIXTURES / "rss.xml").as_uri(), "Fixture Feed", True)]
+    monkeypatch.setattr(fetch, "get_all_feeds", lambda: feeds)
+    fetch.fetch_and_store_articles(max_per_feed=10)
+    session = get_session()
+    yield session
+    session.close()
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [("2025-01", "2025-01"), ("2025-1", "2025-01"), ("bad", None), ("", None)],
+)
+def test_parse_month(value, expected):
+    assert parse_month(value) == expected
+
+
+def test_archive_month_total_matches_articles(session):
+    everything = archive_page(session, {})
+    assert everything["total"] == len(everything["articles"]) == 3
+
+    for month in ("2025-01", "2025-1"):
+        page = archive_page(session, {"month": month})
+        assert page["total"] == len(page["articles"]) == 3
+
+    page = archive_page(session, {"month": "2024-12"})
+    assert page["total"] == len(page["articles"]) == 0
+
+
+def test_archive_ignores_invalid_month(session):
+    page = archive_page(session, {"month": "bad"})
+    assert page["total"] == len(page["articles"]) == 3
+
+
+@pytest.mark.parametrize("change", [0, 5])
+def test_archive_total_survives_stale_facet_counts(session, change):
+    # Rollup missing (rows written without bump_facets) or over-counting
+    if change:
+        session.execute(update(FacetCount).values(count=FacetCount.count + change))
+    else:
+        session.execute(delete(FacetCount))
+    session.commit()
+
+    for filters in ({}, {"source": "Fixture Feed"}, {"month": "2025-01"}):
+        page = archive_page(session, filters)
+        assert page["total"] == len(page["articles"]) == 3
@@ -0,0 +1,54 @@
+"""For You ranking (src/services/personalization.py)."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+import scripts.fetch_articles_modular as fetch
+from src.config import settings
+from src.database import get_session, Article, Classification, UserPreference
+from src.services import personalization
+from tests.conftest import FIXTURES
+
+
+@pytest.fixture
+def session(db, monkeypatch):
+    feeds = [((FIXTURES / "rss.xml").as_uri(), "Fixture Feed", True)]
+    monkeypatch.setattr(fetch, "get_all_feeds", lambda: feeds)
+    monkeypatch.setattr(fetch.settings, "article_hot_days", 0)
+    fetch.fetch_and_store_articles(max_per_feed=10)
+    personalization._rankings.clear()
+    session = get_session()
+    session.add(UserPreference(topic="climate", weight=2.0, keywords="climate"))
+    session.commit()
+    yield session
+    session.close()
+
+
+def test_ranking_is_limited_to_best_candidates(session, monkeypatch):
+    assert len(personalization.personalized_ranking(session)) == 2
+
+    personalization._rankings.clear()
+    monkeypatch.setattr(settings, "for_you_candidates", 1)
+    best = [
+        article_id
+        for (article_id,) in session.query(Article.id)
+        .join(Classification)
+        .order_by(Article.hot_score.desc(), Article.id.desc())
+        .limit(1)
+    ]
+    assert sorted(personalization.personalized_ranking(session)) == sorted(best)
+
+
+def test_rescoring_invalidates_cached_ranking(session):
+    before = personalization._generation(session)
+    personalization.personalized_ranking(session)
+    assert len(personalization._rankings) == 1
+
+    classification = session.query(Classification).first()
+    classification.classified_date = datetime.utcnow() + timedelta(seconds=1)
+    session.commit()
+
+    assert personalization._generation(session) != before
+    personalization.personalized_ranking(session)
+    assert len(personalization._rankings) == 2
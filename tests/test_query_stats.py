@@ -0,0 +1,48 @@
+"""Statement timing and the slow-query log (src/services/query_stats.py)."""
+
+import logging
+
+from sqlalchemy import select
+
+from src.config import settings
+from src.database import get_session, Article
+from src.services.query_stats import redact_parameters, track_queries
+
+SECRET = "hunter2-private-value"
+
+
+def test_redact_parameters_keeps_types_only():
+    assert redact_parameters((SECRET, 3, None)) == "(str, int, NoneType)"
+    assert redact_parameters({"title": SECRET, "id": 1}) == "(str, int)"
+    assert redact_parameters([(SECRET, 1), (SECRET, 2)]) == "(str, int) x 2 rows"
+    assert redact_parameters([{"url": SECRET}]) == "(str) x 1 rows"
+    assert redact_parameters(()) == "()"
+    assert redact_parameters(None) == "()"
+
+
+def test_slow_query_log_has_no_parameter_values(db, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "slow_query_ms", 1e-9)
+    session = get_session()
+    try:
+        with caplog.at_level(logging.WARNING, logger="src.services.query_stats"):
+            with track_queries() as stats:
+                session.execute(select(Article.id).where(Article.title == SECRET))
+    finally:
+        session.close()
+
+    assert stats.count >= 1
+    slow = [record.getMessage() for record in caplog.records]
+    assert any("FROM articles" in message for message in slow)
+    assert all(SECRET not in message for message in slow)
+    assert any("params=(str" in message for message in slow)
+
+
+def test_slow_query_log_off(db, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "slow_query_ms", 0)
+    session = get_session()
+    try:
+        with caplog.at_level(logging.WARNING, logger="src.services.query_stats"):
+            session.execute(select(Article.id))
+    finally:
+        session.close()
+    assert not caplog.records
@@ -0,0 +1,54 @@
+"""Reclassification of stored articles (src/services/reclassification.py)."""
+
+import pytest
+
+import scripts.fetch_articles_modular as fetch
+import src.services.reclassification as reclassification
+from src.collectors.relevance_filter import (
+    GLOBAL_KEYWORD_GROUP,
+    get_keyword_sets,
+    keyword_version,
+)
+from src.database import get_session, Classification
+from src.services.tiering import archive_old_articles, restore_articles
+from tests.conftest import FIXTURES
+
+
+@pytest.fixture
+def changed_keywords(db, monkeypatch):
+    feeds = [((FIXTURES / "rss.xml").as_uri(), "Fixture Feed", True)]
+    monkeypatch.setattr(fetch, "get_all_feeds", lambda: feeds)
+    monkeypatch.setattr(fetch.settings, "article_hot_days", 0)
+    fetch.fetch_and_store_articles(max_per_feed=10)
+    old = keyword_version(get_keyword_sets())
+
+    sets = get_keyword_sets()
+    sets[GLOBAL_KEYWORD_GROUP] = sets[GLOBAL_KEYWORD_GROUP] + ["fusion reactor"]
+    monkeypatch.setattr(reclassification, "get_keyword_sets", lambda: sets)
+    return old, keyword_version(sets)
+
+
+def _versions():
+    session = get_session()
+    try:
+        return {row.keyword_version for row in session.query(Classification)}
+    finally:
+        session.close()
+
+
+def test_archived_articles_keep_version_until_restored(changed_keywords):
+    old, new = changed_keywords
+    # The fixture articles are from January 2025
+    archived = archive_old_articles(days=30)
+    assert archived
+
+    reclassification.reclassify_articles()
+    assert _versions() == {old}
+    # The next run has nothing to diff for the archived results
+    assert reclassification.reclassify_articles()["candidates"] == 0
+
+    session = get_session()
+    ids = [row.article_id for row in session.query(Classification)]
+    session.close()
+    restore_articles(ids)
+    assert _versions() == {new}
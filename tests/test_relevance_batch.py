@@ -0,0 +1,75 @@
+"""relevance_batch (src/collectors/relevance_batch.py) against calculate_relevance."""
+
+import random
+
+import feedparser
+import pytest
+
+from src.collectors.relevance_batch import (
+    calculate_relevance_batch,
+    classify_and_match,
+    contains_any,
+)
+from src.collectors.relevance_filter import (
+    CATEGORY_KEYWORDS,
+    GLOBAL_KEYWORDS,
+    calculate_relevance,
+)
+from tests.conftest import FIXTURES
+
+KEYWORDS = list(
+    dict.fromkeys(
+        GLOBAL_KEYWORDS + [kw for kws in CATEGORY_KEYWORDS.values() for kw in kws]
+    )
+)
+
+
+def matched(title, content):
+    text = " " + (title + " " + content).lower() + " "
+    return {keyword for keyword in KEYWORDS if keyword in text}
+
+
+def random_articles(count, seed=20250107):
+    """Titles and contents mixing keywords, their fragments and filler."""
+    fragments = KEYWORDS + [kw[: len(kw) // 2] for kw in KEYWORDS]
+    fragments += ["the", "grid", "ünïcödé", "🌍", "\x00", "-", ",", "AI", "ML"]
+    rng = random.Random(seed)
+
+    def text(k):
+        return " ".join(rng.choices(fragments, k=rng.randint(0, k)))
+
+    return [(text(6), text(40)) for _ in range(count)]
+
+
+def fixture_articles():
+    articles = []
+    for name in ("rss.xml", "atom.xml", "rdf.xml"):
+        for entry in feedparser.parse(str(FIXTURES / name)).entries:
+            articles.append((entry.get("title", ""), entry.get("summary", "")))
+    return articles
+
+
+@pytest.mark.parametrize("batch_size", [7, 10_000])
+def test_matches_calculate_relevance(batch_size):
+    articles = random_articles(2000) + fixture_articles()
+    expected = [calculate_relevance(title, content) for title, content in articles]
+    assert any(expected) and not all(expected)
+    assert calculate_relevance_batch(articles, batch_size=batch_size) == expected
+
+
+def test_keywords_match_substring_search():
+    articles = random_articles(500, seed=7) + fixture_articles()
+    for (title, content), (result, keywords) in zip(
+        articles, classify_and_match(articles, batch_size=64)
+    ):
+        assert result == calculate_relevance(title, content)
+        assert set(keywords) == matched(title, content)
+
+
+def test_contains_any():
+    articles = random_articles(300, seed=11)
+    wanted = CATEGORY_KEYWORDS[next(iter(CATEGORY_KEYWORDS))][:3]
+    assert contains_any(articles, wanted, batch_size=50) == [
+        bool(matched(title, content) & set(wanted)) for title, content in articles
+    ]
+    assert contains_any(articles, []) == [False] * len(articles)
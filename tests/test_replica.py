@@ -0,0 +1,98 @@
+"""Read replica routing and fallback (src/database.py)."""
+
+import asyncio
+import sqlite3
+
+import pytest
+from sqlalchemy import select
+
+from src import database
+from src.config import settings
+from src.database import get_session, Article
+
+
+@pytest.fixture
+def replica(db, tmp_path, monkeypatch):
+    """A read-only stand-in copy of db, not created yet."""
+    path = tmp_path / "replica.db"
+    url = f"sqlite:///file:{path}?mode=ro&uri=true"
+    monkeypatch.setattr(settings, "database_read_url", url)
+    monkeypatch.setattr(settings, "replica_check_seconds", 0)
+    monkeypatch.setattr(database, "_replica_state", {"healthy": True, "checked": None})
+
+    session = get_session()
+    session.add(Article(title="Primary", url="https://example.org/a", source="X"))
+    session.commit()
+    session.close()
+
+    yield path
+    for key in [key for key in database._engines if url in key]:
+        database._engines.pop(key).dispose()
+
+
+def copy_database(url, path):
+    """Snapshot the primary, WAL contents included."""
+    source = sqlite3.connect(url.removeprefix("sqlite:///"))
+    target = sqlite3.connect(path)
+    try:
+        source.backup(target)
+    finally:
+        source.close()
+        target.close()
+
+
+def titles(engine):
+    with engine.connect() as conn:
+        return list(conn.execute(select(Article.title)).scalars())
+
+
+def test_reads_fall_back_to_the_primary_while_replica_is_down(replica, db):
+    # Missing file: the replica doesn't answer
+    assert database.replica_status() is False
+    assert database.get_read_engine() is database.get_engine()
+
+    # The copy lags behind the primary, so reads show which one served them
+    copy_database(db, replica)
+    session = get_session()
+    session.add(
+        Article(title="Not replicated", url="https://example.org/b", source="X")
+    )
+    session.commit()
+    session.close()
+
+    assert database.replica_status() is True
+    engine = database.get_read_engine()
+    assert engine is not database.get_engine()
+    assert titles(engine) == ["Primary"]
+
+
+def test_async_reads_follow_replica_health(replica, db):
+    async def read():
+        async with database.async_read_session() as session:
+            return list((await session.execute(select(Article.title))).scalars())
+
+    async def scenario():
+        assert await database.async_replica_status(force=True) is False
+        assert len(await read()) == 1
+
+        copy_database(db, replica)
+        session = get_session()
+        session.add(
+            Article(title="Not replicated", url="https://example.org/b", source="X")
+        )
+        session.commit()
+        session.close()
+
+        assert await database.async_replica_status(force=True) is True
+        assert await read() == ["Primary"]
+
+        # Async engines belong to this event loop
+        for key in [key for key in database._engines if key[0] == "async"]:
+            await database._engines.pop(key).dispose()
+
+    asyncio.run(scenario())
+
+
+def test_no_replica_configured(db):
+    assert database.replica_status() is None
+    assert asyncio.run(database.async_replica_status()) is None
@@ -0,0 +1,63 @@
+"""Database snapshots (src/services/snapshot.py)."""
+
+import gzip
+
+import pytest
+from sqlalchemy import inspect
+
+import scripts.fetch_articles_modular as fetch
+from src.database import get_engine, get_session, Article, Classification, FacetCount
+from src.services.snapshot import export_snapshot, import_snapshot
+from tests.conftest import FIXTURES
+
+
+@pytest.fixture
+def stored(db, monkeypatch):
+    feeds = [((FIXTURES / "rss.xml").as_uri(), "Fixture Feed", True)]
+    monkeypatch.setattr(fetch, "get_all_feeds", lambda: feeds)
+    fetch.fetch_and_store_articles(max_per_feed=10)
+
+
+def _facets():
+    session = get_session()
+    try:
+        return {(row.facet, row.value): row.count for row in session.query(FacetCount)}
+    finally:
+        session.close()
+
+
+def test_subset_replace_clears_dependent_tables(stored, tmp_path):
+    path = str(tmp_path / "articles.jsonl.gz")
+    export_snapshot(path, tables=["articles"])
+    assert any(facet == "category" for facet, _ in _facets())
+
+    counts = import_snapshot(path, replace=True)
+
+    session = get_session()
+    try:
+        assert counts == {"articles": session.query(Article).count()}
+        assert session.query(Classification).count() == 0
+    finally:
+        session.close()
+    facets = _facets()
+    assert not any(facet == "category" for facet, _ in facets)
+    assert facets[("source", "Fixture Feed")] == counts["articles"]
+
+
+def test_failed_import_restores_indexes(stored, tmp_path):
+    path = str(tmp_path / "articles.jsonl.gz")
+    export_snapshot(path, tables=["articles"])
+    with gzip.open(path, "rt", encoding="utf-8") as snapshot:
+        lines = snapshot.readlines()
+    with gzip.open(path, "wt", encoding="utf-8") as snapshot:
+        snapshot.writelines(lines[:3] + ["not json\n"])
+
+    expected = {
+        index["name"] for index in inspect(get_engine()).get_indexes("articles")
+    }
+    with pytest.raises(ValueError):
+        import_snapshot(path, replace=True)
+
+    indexes = inspect(get_engine()).get_indexes("articles")
+    assert {index["name"] for index in indexes} == expected
+    assert any(index["unique"] for index in indexes)
@@ -0,0 +1,118 @@
+"""strip_html (src/collectors/rss_collector.py) against the original version."""
+
+import random
+import re
+from html import unescape
+from html.parser import HTMLParser
+
+import pytest
+
+from src.collectors.rss_collector import strip_html
+
+
+class _ReferenceStripper(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.reset()
+        self.strict = False
+        self.convert_charrefs = True
+        self.text = []
+
+    def handle_data(self, data):
+        self.text.append(data)
+
+    def get_data(self):
+        return "".join(self.text).strip()
+
+
+def reference_strip_html(html_content: str) -> str:
+    """strip_html as it was before the tokenizer fast path."""
+    if not html_content:
+        return ""
+    html_content = re.sub(r"<img[^>]*>", "", html_content, flags=re.IGNORECASE)
+    stripper = _ReferenceStripper()
+    try:
+        stripper.feed(html_content)
+        text = stripper.get_data()
+    except Exception:
+        text = re.sub(r"<[^>]+>", "", html_content)
+    text = unescape(text)
+    text = re.sub(r"\s+", " ", text)
+    return text.strip()
+
+
+CASES = [
+    "",
+    "plain text",
+    "  lots \n\t of   whitespace  ",
+    "<p>Machine learning <b>reduces</b> energy.</p>",
+    "<P CLASS='x'>Upper case</P>",
+    '<a href="https://example.org/?a=1&amp;b=2" title="x > y">link</a> text',
+    "Fish &amp; chips &amp;amp; more",
+    "&lt;p&gt;escaped markup&lt;/p&gt;",
+    "caf&eacute; &#8217;quoted&#x2019; &nbsp;space",
+    "trailing entity &amp",
+    "cut off &#82",
+    "a < b and c > d",
+    "ends with <",
+    "<p>unterminated <b",
+    "<img src='x.png'>before<IMG SRC=\"y.png\" />after",
+    '<img alt="a > b" src="x.png">caption',
+    "text<img src=x.png>joined",
+    "<!-- comment -->visible",
+    "<!DOCTYPE html><p>doc</p>",
+    "<?xml version='1.0'?>processing",
+    "<script>var x = '<p>';</script>after script",
+    "<style>p { color: red }</style>styled",
+    "<br/>line<br />break<hr>",
+    "<p>nested <span><em>tags</em></span></p>",
+    "<![CDATA[cdata text]]>",
+    "</p>closing only",
+    "<p>non breaking em space\x1cseparator</p>",
+    "<p>emoji 🌍 and ünïcödé</p>",
+    "<a href='x'>one</a><a href='y'>two</a>",
+    "x<1 and y>2",
+    "<3 hearts",
+    "<<double>>",
+    "&#0; &#xD800; &#1114112; null refs",
+]
+
+
+@pytest.mark.parametrize("html_content", CASES)
+def test_matches_reference(html_content):
+    assert strip_html(html_content) == reference_strip_html(html_content)
+
+
+def test_matches_reference_on_random_markup():
+    fragments = [
+        "<p>",
+        "</p>",
+        "<b>",
+        "</b>",
+        "<img src='x.png'>",
+        "<br/>",
+        "<a href='u'>",
+        "</a>",
+        "&amp;",
+        "&lt;",
+        "&#169;",
+        "&",
+        "<",
+        ">",
+        " ",
+        "\n",
+        "text",
+        "é",
+        "<!-- c -->",
+        "<script>",
+        "</script>",
+        "&nbsp;",
+        '<div class="d">',
+        "=",
+    ]
+    rng = random.Random(20250106)
+    for _ in range(3000):
+        html_content = "".join(rng.choices(fragments, k=rng.randint(1, 12)))
+        assert strip_html(html_content) == reference_strip_html(
+            html_content
+        ), html_content
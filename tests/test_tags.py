@@ -0,0 +1,35 @@
+"""Article tags (src/services/tags.py)."""
+
+from sqlalchemy import delete
+
+import scripts.fetch_articles_modular as fetch
+from src.database import get_session, Article, ArticleKeyword, ArticleTag
+from src.services.tags import load_article_tags, rebuild_tags
+from tests.conftest import FIXTURES
+
+
+def _tags():
+    session = get_session()
+    try:
+        ids = [article_id for (article_id,) in session.query(Article.id)]
+        return load_article_tags(session, ids)
+    finally:
+        session.close()
+
+
+def test_rebuild_without_keyword_index(db, monkeypatch):
+    feeds = [((FIXTURES / "rss.xml").as_uri(), "Fixture Feed", True)]
+    monkeypatch.setattr(fetch, "get_all_feeds", lambda: feeds)
+    fetch.fetch_and_store_articles(max_per_feed=10)
+    expected = _tags()
+    assert any(expected.values())
+
+    # As for articles stored before the keyword index existed
+    session = get_session()
+    session.execute(delete(ArticleTag))
+    session.execute(delete(ArticleKeyword))
+    session.commit()
+    session.close()
+
+    assert rebuild_tags() == 3
+    assert _tags() == expected
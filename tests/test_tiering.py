@@ -0,0 +1,89 @@
+"""Hot/cold article tiering (src/services/tiering.py)."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+
+import scripts.fetch_articles_modular as fetch
+from src.database import get_session, Article
+from src.services.pages import digest_page
+from src.services.tiering import (
+    archive_old_articles,
+    archived_content,
+    restore_articles,
+)
+from tests.conftest import FIXTURES
+
+
+@pytest.fixture
+def articles(db, monkeypatch):
+    feeds = [((FIXTURES / "rss.xml").as_uri(), "Fixture Feed", True)]
+    monkeypatch.setattr(fetch, "get_all_feeds", lambda: feeds)
+    monkeypatch.setattr(fetch.settings, "article_hot_days", 0)
+    fetch.fetch_and_store_articles(max_per_feed=10)
+    session = get_session()
+    contents = {article.id: article.content for article in session.query(Article)}
+    session.close()
+    return contents
+
+
+def test_archived_content_round_trip(articles):
+    # The fixture articles are from January 2025
+    assert archive_old_articles(days=30) == len(articles)
+
+    session = get_session()
+    try:
+        for article_id, content in articles.items():
+            assert session.get(Article, article_id).content is None
+            assert archived_content(session, article_id) == content
+        assert archived_content(session, 10**6) is None
+    finally:
+        session.close()
+
+    assert restore_articles(articles) == len(articles)
+    session = get_session()
+    try:
+        for article_id, content in articles.items():
+            assert session.get(Article, article_id).content == content
+    finally:
+        session.close()
+
+
+def test_show_flag_prints_archived_content(articles, db):
+    archive_old_articles(days=30)
+    article_id, content = next(iter(articles.items()))
+    script = Path(__file__).parent.parent / "scripts" / "archive_articles.py"
+    result = subprocess.run(
+        [sys.executable, str(script), "--show", str(article_id)],
+        capture_output=True,
+        text=True,
+        env={"DATABASE_URL": db, "PATH": ""},
+        check=True,
+    )
+    assert result.stdout.strip() == content
+
+
+def test_archived_articles_leave_the_top_index(articles):
+    archive_old_articles(days=30)
+    session = get_session()
+    try:
+        assert digest_page(session, sort="top")["articles"] == []
+        assert digest_page(session)["articles"]
+
+        (sql,) = session.execute(
+            text("SELECT sql FROM sqlite_master WHERE name = 'ix_articles_hot_top'")
+        ).one()
+        assert sql.endswith("WHERE archived_date IS NULL")
+        plan = session.execute(
+            text(
+                "EXPLAIN QUERY PLAN SELECT id FROM articles"
+                " WHERE duplicate_of IS NULL AND archived_date IS NULL"
+                " ORDER BY hot_score DESC"
+            )
+        ).all()
+        assert any("ix_articles_hot_top" in row[-1] for row in plan)
+    finally:
+        session.close()
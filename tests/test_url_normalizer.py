@@ -0,0 +1,78 @@
+"""URL canonicalization (src/collectors/url_normalizer.py)."""
+
+import pytest
+
+from src.collectors.rss_collector import RSSCollector
+from src.collectors.url_normalizer import clean_url, url_hash, url_key
+
+
+@pytest.mark.parametrize(
+    "url, cleaned",
+    [
+        (
+            "https://example.org/a?utm_source=rss&utm_medium=feed&id=7",
+            "https://example.org/a?id=7",
+        ),
+        (
+            "https://example.org/a?id=7&fbclid=abc&UTM_Campaign=x",
+            "https://example.org/a?id=7",
+        ),
+        ("https://example.org/a?gclid=1#comments", "https://example.org/a"),
+        (
+            "  HTTPS://Example.ORG/Path/Case?b=2&a=1  ",
+            "https://example.org/Path/Case?b=2&a=1",
+        ),
+        ("https://example.org:8443/a", "https://example.org:8443/a"),
+        ("https://example.org/a?q=&utm_=x&flag", "https://example.org/a?q=&flag"),
+        ("/relative/path?utm_source=rss", "/relative/path?utm_source=rss"),
+        ("mailto:editor@example.org", "mailto:editor@example.org"),
+        ("", ""),
+    ],
+)
+def test_clean_url(url, cleaned):
+    assert clean_url(url) == cleaned
+
+
+@pytest.mark.parametrize(
+    "spelling",
+    [
+        "http://example.org/news/story",
+        "https://www.example.org/news/story/",
+        "https://EXAMPLE.org:443/news/story",
+        "http://example.org:80/news/story#top",
+        "https://example.org/news/story?utm_source=twitter",
+    ],
+)
+def test_spellings_share_a_key(spelling):
+    assert url_key(spelling) == "https://example.org/news/story"
+    assert url_hash(spelling) == url_hash("https://example.org/news/story")
+
+
+def test_key_keeps_what_identifies_a_page():
+    assert url_key("https://example.org/a?b=2&a=1") == url_key(
+        "https://example.org/a?a=1&b=2"
+    )
+    assert url_key("https://example.org:8080/a") == "https://example.org:8080/a"
+    assert url_key("https://example.org/") == url_key("https://example.org")
+    assert url_key("https://example.org/A") != url_key("https://example.org/a")
+    assert url_hash("https://example.org/a?id=1") != url_hash(
+        "https://example.org/a?id=2"
+    )
+    assert len(url_hash("https://example.org/a")) == 32
+
+
+@pytest.mark.parametrize("url", ["http://x.com:abc/", "https://x.com:99999/a"])
+def test_invalid_port_falls_back_to_the_cleaned_url(url):
+    assert url_key(url) == clean_url(url)
+    assert len(url_hash(url)) == 32
+
+
+def test_feedburner_origlink_wins():
+    entry = {
+        "title": "Story",
+        "link": "https://feeds.feedburner.com/~r/example/~3/abc/",
+        "feedburner_origlink": "https://www.example.org/story?utm_source=feedburner",
+    }
+    article = RSSCollector()._parse_entry(entry, "Fixture")
+    assert article["url"] == "https://www.example.org/story"
+    assert article["url_hash"] == url_hash("https://example.org/story")